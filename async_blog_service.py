@@ -0,0 +1,150 @@
+import asyncio
+import calendar
+import contextvars
+import heapq
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import blog_service
+from utils import singleflight
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Upper bound on DynamoDB calls in flight for a single container
+ASYNC_MAX_WORKERS = int(os.environ.get('ASYNC_MAX_WORKERS', 8))
+
+# Segments used to parallelise listings that cannot be served by an index query
+PARALLEL_SCAN_SEGMENTS = int(os.environ.get('PARALLEL_SCAN_SEGMENTS', 4))
+
+_executor = ThreadPoolExecutor(max_workers=ASYNC_MAX_WORKERS, thread_name_prefix='bloggs-io')
+
+# One event loop per calling thread, reused across warm invocations
+_local = threading.local()
+
+
+def run(coroutine):
+    """
+    Run a coroutine to completion on this thread's long-lived event loop
+    """
+    loop = getattr(_local, 'loop', None)
+    if loop is None or loop.is_closed():
+        loop = asyncio.new_event_loop()
+        _local.loop = loop
+    return loop.run_until_complete(coroutine)
+
+
+def _month_range(month):
+    """
+    Convert 'YYYY-MM' into inclusive start and end dates
+    """
+    year, month_number = (int(part) for part in month.split('-'))
+    last_day = calendar.monthrange(year, month_number)[1]
+    return f"{year:04d}-{month_number:02d}-01", f"{year:04d}-{month_number:02d}-{last_day:02d}"
+
+
+def expand_filters(filters):
+    """
+    Split multi-value listing filters into independent single-value filters
+
+    Args:
+        filters (dict): Listing filters where journeys and months may hold lists
+                        - journeys (list): Journeys to include
+                        - months (list): Months ('YYYY-MM') to include
+                        - start, end (str): A single date range, used when no months are given
+                        - tags (str): Comma separated tags, applied to every sub-query
+                        - fields (str): Comma separated attributes to return
+
+    Returns:
+        list: Filter dicts accepted by blog_service.build_listing_request
+    """
+    journeys = filters.get('journeys') or [None]
+    if filters.get('months'):
+        date_ranges = [_month_range(month) for month in sorted(set(filters['months']))]
+    else:
+        date_ranges = [(filters.get('start'), filters.get('end'))]
+
+    expanded = []
+    for journey in sorted(set(journeys), key=str):
+        for start, end in date_ranges:
+            sub_filters = {}
+            if journey:
+                sub_filters['journey'] = journey
+            if start:
+                sub_filters['start'] = start
+            if end:
+                sub_filters['end'] = end
+            if filters.get('tags'):
+                sub_filters['tags'] = filters['tags']
+            if filters.get('fields'):
+                # The merge needs every partial result to carry its sort and identity keys
+                sub_filters['fields'] = f"{filters['fields']},id,createdAt"
+            expanded.append(sub_filters)
+    return expanded
+
+
+def _created_at(item):
+    return item.get('createdAt', 0)
+
+
+def _sorted(items):
+    # Results from the singleflight layer are shared, so sort a copy
+    return sorted(items, key=_created_at, reverse=True)
+
+
+def _list_sorted(sub_filters):
+    return _sorted(blog_service.filter_blogs(sub_filters))
+
+
+def _scan_segment_sorted(key, operation, params):
+    items = singleflight.get_group('filter_blogs_segment').do(key, blog_service.fetch_all, operation, params)
+    return _sorted(items)
+
+
+def _submit(loop, func, *args):
+    # Executor threads do not inherit context variables such as the request ID
+    return loop.run_in_executor(_executor, contextvars.copy_context().run, func, *args)
+
+
+async def filter_blogs(filters):
+    """
+    Retrieve blog posts for multi-value filters with concurrent DynamoDB calls
+
+    Each journey and month becomes its own index query, all issued concurrently
+    through the same singleflight layer as blog_service.filter_blogs. Listings
+    with no journey and no date range are split into parallel scan segments.
+    The sorted partial results are combined with a k-way merge, newest first.
+
+    Returns:
+        list: Matching blog posts ordered by createdAt, newest first
+    """
+    loop = asyncio.get_running_loop()
+    parallel_scans = isinstance(blog_service.get_backend(), blog_service.DynamoDBBackend)
+    calls = []
+    for sub_filters in expand_filters(filters):
+        operation, params = blog_service.build_listing_request(sub_filters)
+        if parallel_scans and operation == 'scan' and PARALLEL_SCAN_SEGMENTS > 1:
+            filters_key = tuple(sorted(sub_filters.items()))
+            for segment in range(PARALLEL_SCAN_SEGMENTS):
+                segment_params = {**params, 'Segment': segment, 'TotalSegments': PARALLEL_SCAN_SEGMENTS}
+                key = (filters_key, segment, PARALLEL_SCAN_SEGMENTS)
+                calls.append(_submit(loop, _scan_segment_sorted, key, operation, segment_params))
+        else:
+            calls.append(_submit(loop, _list_sorted, sub_filters))
+
+    partials = await asyncio.gather(*calls)
+
+    seen = set()
+    merged = []
+    # Overlapping months or duplicate journeys must not repeat a post
+    for item in heapq.merge(*partials, key=_created_at, reverse=True):
+        if item['id'] not in seen:
+            seen.add(item['id'])
+            merged.append(item)
+
+    if filters.get('fields'):
+        requested = blog_service.parse_fields(filters['fields'], blog_service.LISTING_FIELDS)
+        merged = [{key: item[key] for key in requested if key in item} for item in merged]
+
+    logger.info("Found %d blogs across %d concurrent calls", len(merged), len(calls))
+    return merged
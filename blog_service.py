@@ -1,52 +1,275 @@
+import base64
+import json
 import uuid
-import boto3
 import os
+from abc import ABC, abstractmethod
+import stats_service
+from utils import body_store, singleflight
+from utils.dynamodb import get_table, build_projection, META_ID_PREFIX, META_ENTITY
+from utils.logger import get_logger
+from utils.markdown_render import render_markdown
+from utils.timestamps import now_ms, parse_date_bound
 
-def get_blog_by_id(blog_id):
+logger = get_logger(__name__)
+
+# Attributes returned by listing queries - the body is excluded for performance
+LISTING_FIELDS = ['id', 'title', 'description', 'journey', 'tags', 'image', 'createdAt', 'username']
+
+# Attributes that may be requested for a single blog post
+BLOG_FIELDS = LISTING_FIELDS + ['body']
+
+# Bookkeeping attributes kept on blog items but never returned with a post
+INTERNAL_FIELDS = ('entity', 'updatedAt', 'related')
+
+# Representations a single blog body can be returned in
+BODY_FORMATS = ('markdown', 'html')
+
+# Blog items carry entity = 'blog' so the sparse changes index holds only blogs
+BLOG_ENTITY = 'blog'
+
+# GSI ordering blogs by last modification (hash entity, range updatedAt)
+CHANGES_INDEX = 'updatedAt'
+
+# GSIs ordering blogs by creation time, so date ranges are key conditions:
+# journey -> hash journey, range createdAt; all blogs -> hash entity, range createdAt
+JOURNEY_INDEX = 'journey-createdAt'
+CREATED_INDEX = 'createdAt'
+
+# Where blogs are read from: 'dynamodb', or 'sqlite' for the read-only offline
+# copy at SQLITE_PATH (see sqlite_backend.py)
+STORAGE_BACKEND_DEFAULT = 'dynamodb'
+
+# Default and maximum number of changes returned per sync request
+CHANGES_PAGE_SIZE = int(os.environ.get('CHANGES_PAGE_SIZE', 100))
+CHANGES_MAX_PAGE_SIZE = 1000
+
+def parse_fields(fields, allowed):
+    """
+    Validate a comma separated sparse fieldset against an allow-list
+
+    Args:
+        fields (str): Requested attributes, e.g. 'id,title,createdAt'
+        allowed (list): Attributes that may be requested
+
+    Returns:
+        list: The requested attributes without duplicates, in request order
+
+    Raises:
+        ValueError: If the fieldset is empty or names an attribute that is not allowed
+    """
+    requested = list(dict.fromkeys(field.strip() for field in fields.split(',') if field.strip()))
+    if not requested:
+        raise ValueError("fields must name at least one attribute")
+
+    unknown = [field for field in requested if field not in allowed]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}. Allowed: {', '.join(allowed)}")
+    return requested
+
+def _query_blog(table, blog_id, projected_fields):
+    """
+    Fetch the attributes of a single blog item (all of them when projected_fields
+    is None), or None if it does not exist
+    """
+    params = {}
+    if projected_fields is not None:
+        projection, names = build_projection(projected_fields)
+        params = {'ProjectionExpression': projection, 'ExpressionAttributeNames': names}
+    # First, we need to find the item's createdAt value
+    # Since we can't query directly by just the partition key,
+    # we'll use a query operation to find the matching item
+    query_response = table.query(
+        KeyConditionExpression='id = :id',
+        ExpressionAttributeValues={
+            ':id': blog_id
+        },
+        **params
+    )
+    
+    # If we found a matching item
+    if query_response['Count'] > 0:
+        # Return the first (should be only) item
+        return query_response['Items'][0]
+    return None
+
+def _fieldset_key(fields):
+    # Order and repeats do not change what a fieldset returns
+    if not fields:
+        return None
+    return tuple(sorted({field.strip() for field in fields.split(',') if field.strip()}))
+
+def get_blog_by_id(blog_id, fields=None, body_format='markdown'):
     """
     Retrieve a single blog post by its ID from DynamoDB
+
+    Concurrent identical requests in this container share one DynamoDB call
+    (see utils/singleflight.py), so the result must not be modified.
     
     Args:
         blog_id (str): The unique identifier of the blog post to retrieve
+        fields (str): Optional comma separated attributes to return (see BLOG_FIELDS)
+        body_format (str): 'markdown' for the source body, or 'html' for the
+                           version rendered when the blog was posted
         
     Returns:
         dict: The blog post data or None if not found
     """
-    table_name = os.environ.get('DYNAMODB_TABLE_NAME')
-    if not table_name:
-        raise ValueError("DYNAMODB_TABLE_NAME environment variable must be set")
+    key = (str(blog_id), _fieldset_key(fields), body_format)
+    return singleflight.get_group('get_blog_by_id').do(key, _get_blog_by_id, blog_id, fields, body_format)
+
+def _get_blog_by_id(blog_id, fields, body_format):
+    if body_format not in BODY_FORMATS:
+        raise ValueError(f"Unknown format: {body_format}. Allowed: {', '.join(BODY_FORMATS)}")
     
-    dynamodb = boto3.resource('dynamodb')
-    table = dynamodb.Table(table_name)
+    backend = get_backend()
+    requested = parse_fields(fields, BLOG_FIELDS) if fields else None
+    wants_html = body_format == 'html' and (requested is None or 'body' in requested)
     
-    print(f"Fetching blog with ID: '{blog_id}', Type: {type(blog_id)}")
-    print(f"Using table: {table_name}")
+    # Compressed or offloaded bodies live in other attributes
+    body_attribute = 'bodyHtml' if wants_html else 'body'
+    unused_attribute = 'body' if wants_html else 'bodyHtml'
+    if requested is None:
+        # Without a fieldset the whole item is returned, as posted
+        projected = None
+    else:
+        projected = [field for field in requested if field != 'body']
+        if 'body' in requested:
+            projected += [body_attribute] + body_store.storage_fields(body_attribute)
+    
+    logger.debug("Fetching blog with ID %r from %s", blog_id, backend.name)
     
     # Ensure blog_id is a string
     blog_id_str = str(blog_id)
+    if blog_id_str.startswith(META_ID_PREFIX):
+        return None
     
     try:
-        # First, we need to find the item's createdAt value
-        # Since we can't query directly by just the partition key,
-        # we'll use a query operation to find the matching item
-        query_response = table.query(
-            KeyConditionExpression='id = :id',
-            ExpressionAttributeValues={
-                ':id': blog_id_str
-            }
-        )
-        
-        # If we found a matching item
-        if query_response['Count'] > 0:
-            # Return the first (should be only) item
-            return query_response['Items'][0]
-        else:
+        item = backend.get_blog(blog_id_str, projected)
+        if item is None:
             return None
+        
+        source = {}
+        if requested is None:
+            # Only one representation of the body is returned
+            unused = [unused_attribute] + body_store.storage_fields(unused_attribute)
+            source = {field: item.pop(field) for field in unused if field in item}
+            for field in INTERNAL_FIELDS:
+                item.pop(field, None)
+        
+        if not wants_html:
+            return body_store.unpack_body(item)
+        
+        html = body_store.unpack_body(item, 'bodyHtml').pop('bodyHtml', None)
+        if html is None:
+            # Posted before render-on-write (and not yet backfilled)
+            logger.info("Rendering HTML on read for blog %s", blog_id_str)
+            if not source:
+                source = backend.get_blog(blog_id_str, ['body'] + body_store.STORAGE_FIELDS) or {}
+            html = render_markdown(body_store.unpack_body(source).get('body', ''))
+        item['body'] = html
+        return item
             
     except Exception as e:
-        print(f"DynamoDB Error: {str(e)}")
+        logger.exception("Error fetching blog %s from %s", blog_id_str, backend.name)
         raise
 
+def build_listing_request(filters):
+    """
+    Translate listing filters into a DynamoDB query or scan request
+
+    Args:
+        filters (dict): Listing filters, see filter_blogs
+
+    Returns:
+        tuple: ('query' or 'scan', keyword arguments for that table operation)
+    """
+    expression_values = {}
+    filter_expressions = []
+    key_conditions = []
+
+    try:
+        if 'start' in filters:
+            expression_values[':start'] = parse_date_bound(filters['start'])
+        if 'end' in filters:
+            expression_values[':end'] = parse_date_bound(filters['end'], end_of_day=True)
+    except ValueError:
+        raise ValueError("start and end must be ISO dates, e.g. 2024-06-01")
+    if expression_values.get(':start', 0) > expression_values.get(':end', float('inf')):
+        # DynamoDB rejects a BETWEEN whose lower bound exceeds the upper one
+        raise ValueError("start must not be after end")
+    logger.debug("Date bounds: %s", expression_values)
+
+    # Both indexes are sorted by createdAt, so the range is part of the key condition
+    if ':start' in expression_values and ':end' in expression_values:
+        key_conditions.append('createdAt BETWEEN :start AND :end')
+    elif ':start' in expression_values:
+        key_conditions.append('createdAt >= :start')
+    elif ':end' in expression_values:
+        key_conditions.append('createdAt <= :end')
+
+    if filters.get('tags'):
+        # A post matches if it has any of the requested tags
+        tags = [tag for tag in filters['tags'].split(',') if tag]
+        tag_expressions = []
+        for i, tag in enumerate(tags):
+            tag_expressions.append(f"contains(tags, :tag{i})")
+            expression_values[f":tag{i}"] = tag
+        filter_expressions.append(f"({' OR '.join(tag_expressions)})")
+
+    fields = parse_fields(filters['fields'], LISTING_FIELDS) if filters.get('fields') else LISTING_FIELDS
+    projection, names = build_projection(fields)
+    params = {'ProjectionExpression': projection, 'ExpressionAttributeNames': names}
+
+    if 'journey' in filters:
+        params['IndexName'] = JOURNEY_INDEX
+        key_conditions.insert(0, 'journey = :journey_val')
+        expression_values[':journey_val'] = filters['journey']
+        operation = 'query'
+    elif key_conditions:
+        # The sparse index holds only blogs, never bookkeeping items
+        params['IndexName'] = CREATED_INDEX
+        key_conditions.insert(0, 'entity = :blog_entity')
+        expression_values[':blog_entity'] = BLOG_ENTITY
+        operation = 'query'
+    else:
+        # Bookkeeping items share the table but are not blogs
+        filter_expressions.append('(attribute_not_exists(entity) OR entity <> :meta_entity)')
+        expression_values[':meta_entity'] = META_ENTITY
+        operation = 'scan'
+
+    if operation == 'query':
+        params['KeyConditionExpression'] = ' AND '.join(key_conditions)
+        # Newest first
+        params['ScanIndexForward'] = False
+
+    if filter_expressions:
+        params['FilterExpression'] = ' AND '.join(filter_expressions)
+
+    if expression_values:
+        params['ExpressionAttributeValues'] = expression_values
+
+    return operation, params
+
+def fetch_all(operation, params, table=None):
+    """
+    Run a query or scan, following pagination until every page is read
+
+    Returns:
+        list: All items returned by the operation
+    """
+    table = table or get_table()
+    method = table.query if operation == 'query' else table.scan
+    params = dict(params)
+    items = []
+
+    logger.debug("Executing %s with params: %s", operation, params)
+    while True:
+        response = method(**params)
+        items.extend(response.get('Items', []))
+        if 'LastEvaluatedKey' not in response:
+            return items
+        params['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
 def filter_blogs(filters=None):
     """
     Flexible function to retrieve blog posts based on different filters
@@ -57,106 +280,256 @@ def filter_blogs(filters=None):
                         - journey (str): Filter by journey
                         - start (str): Filter by start date (ISO format)
                         - end (str): Filter by end date (ISO format)
+                        - tags (str): Comma separated tags, matching posts with any of them
+                        - fields (str): Comma separated attributes to return (see LISTING_FIELDS)
                         
     Returns:
         list: A list of blog posts matching the filters
+
+    Concurrent identical listings in this container share one set of DynamoDB
+    calls (see utils/singleflight.py), so the result must not be modified.
     """
-    import datetime
-    
-    table_name = os.environ.get('DYNAMODB_TABLE_NAME')
-    if not table_name:
-        raise ValueError("DYNAMODB_TABLE_NAME environment variable must be set")
-    
-    dynamodb = boto3.resource('dynamodb')
-    table = dynamodb.Table(table_name)
-    
     if filters is None:
         filters = {}
-    
-    def to_timestamp(date_str):
-        if 'T' in date_str:
-            dt = datetime.datetime.fromisoformat(date_str.replace('Z', '+00:00'))
-        else:
-            dt = datetime.datetime.fromisoformat(f"{date_str}T00:00:00+00:00")
-        return int(dt.timestamp() * 1000)  # Convert to milliseconds
-        
+
+    key = tuple(sorted(
+        (name, _fieldset_key(value) if name in ('fields', 'tags') else str(value))
+        for name, value in filters.items()
+    ))
+    return singleflight.get_group('filter_blogs').do(key, _filter_blogs, filters)
+
+def _filter_blogs(filters):
     try:
-        expression_values = {}
-        filter_expressions = []
+        items = get_backend().list_blogs(filters)
         
-        if 'start' in filters:
-            start_timestamp = to_timestamp(filters['start'])
-            print(f"Converted {filters['start']} to {start_timestamp}")
-            filter_expressions.append('createdAt >= :start')
-            expression_values[':start'] = start_timestamp
-            
-        if 'end' in filters:
-            end_str = filters['end'] 
-            end_timestamp = to_timestamp(end_str) if 'T' in end_str else to_timestamp(f"{end_str}T23:59:59")
-            print(f"Converted {filters['end']} to {end_timestamp}")
-            filter_expressions.append('createdAt <= :end')
-            expression_values[':end'] = end_timestamp
-        
-        # Define projection expression to exclude body field
-        projection_expression = 'id, title, description, journey, tags, image, createdAt, username'
-        
-        if 'journey' in filters:
-            query_params = {
-                'IndexName': 'journey',
-                'KeyConditionExpression': 'journey = :journey_val',
-                'ProjectionExpression': projection_expression,
-                'ExpressionAttributeValues': {
-                    ':journey_val': filters['journey'],
-                    **expression_values
-                }
-            }
-            
-            if filter_expressions:
-                query_params['FilterExpression'] = ' AND '.join(filter_expressions)
-                
-            print(f"Executing query with params: {query_params}")
-            response = table.query(**query_params)
-            
-        elif filter_expressions:
-            scan_params = {
-                'FilterExpression': ' AND '.join(filter_expressions),
-                'ProjectionExpression': projection_expression,
-                'ExpressionAttributeValues': expression_values
-            }
-            
-            print(f"Executing scan with params: {scan_params}")
-            response = table.scan(**scan_params)
-            
-        else:
-            print("No filters specified, returning all items")
-            response = table.scan(ProjectionExpression=projection_expression)
-        
-        print(f"Found {response['Count']} blogs matching filters")
-        return response.get('Items', [])
+        logger.info("Found %d blogs matching filters", len(items),
+                    extra={'filters': sorted(filters)})
+        return items
             
     except Exception as e:
-        print(f"Error in filter_blogs: {str(e)}")
+        logger.exception("Error in filter_blogs")
         raise
 
+def encode_cursor(updated_at, ids):
+    """
+    Build an opaque sync cursor
+
+    Args:
+        updated_at (int): The newest updatedAt the client has seen
+        ids (list): IDs already returned with exactly that updatedAt
+
+    Returns:
+        str: URL safe cursor
+    """
+    payload = json.dumps({'u': int(updated_at), 'ids': sorted(ids)}, separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+def decode_cursor(cursor):
+    """
+    Read a cursor built by encode_cursor
+
+    Returns:
+        tuple: (updatedAt watermark, set of IDs seen at the watermark)
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        return int(payload['u']), set(payload.get('ids', []))
+    except (ValueError, TypeError, KeyError, AttributeError):
+        raise ValueError("Invalid since cursor")
+
+def get_changes(since=None, limit=None, fields=None):
+    """
+    Return blogs created or modified after a sync cursor, oldest change first
+
+    Reads the sparse updatedAt index, so the cost scales with the number of
+    changes rather than the size of the table.
+
+    Args:
+        since (str): Cursor from a previous call, or None for a full initial sync
+        limit (int or str): Maximum number of changes to return (see CHANGES_PAGE_SIZE)
+        fields (str): Comma separated attributes to return (see LISTING_FIELDS);
+                      id and updatedAt are always included
+
+    Returns:
+        dict: {'changes': [...], 'cursor': str, 'hasMore': bool}
+
+    Raises:
+        ValueError: If the cursor, limit or fields are invalid
+    """
+    try:
+        limit = int(limit) if limit is not None else CHANGES_PAGE_SIZE
+    except ValueError:
+        raise ValueError("limit must be an integer")
+    if not 1 <= limit <= CHANGES_MAX_PAGE_SIZE:
+        raise ValueError(f"limit must be between 1 and {CHANGES_MAX_PAGE_SIZE}")
+
+    watermark, seen = decode_cursor(since) if since else (0, set())
+    requested = parse_fields(fields, LISTING_FIELDS) if fields else LISTING_FIELDS
+    projected = list(dict.fromkeys(['id', 'updatedAt'] + requested))
+
+    # One extra change tells us whether there are more
+    changes = get_backend().list_changes(watermark, seen, limit + 1, projected)
+
+    has_more = len(changes) > limit
+    changes = changes[:limit]
+
+    if changes:
+        newest = changes[-1]['updatedAt']
+        ids = {change['id'] for change in changes if change['updatedAt'] == newest}
+        if newest == watermark:
+            ids |= seen
+        cursor = encode_cursor(newest, ids)
+    else:
+        cursor = since or encode_cursor(watermark, seen)
+
+    logger.info("Found %d changes since %s", len(changes), watermark, extra={'has_more': has_more})
+    return {'changes': changes, 'cursor': cursor, 'hasMore': has_more}
+
+class ReadOnlyBackendError(RuntimeError):
+    """
+    Raised for writes while blogs are served from a read-only backend
+    """
+
+class BlogBackend(ABC):
+    """
+    Where blog_service reads blogs from
+
+    Implementations return plain item dicts with the requested attributes, in
+    the same order DynamoDB would: listings newest first, changes oldest first.
+    """
+    name = None
+    read_only = True
+
+    @abstractmethod
+    def get_blog(self, blog_id, fields):
+        """
+        Return the given attributes of one blog (the whole item when fields is
+        None), or None if it does not exist
+        """
+
+    @abstractmethod
+    def list_blogs(self, filters):
+        """
+        Return every blog matching listing filters (see filter_blogs)
+        """
+
+    @abstractmethod
+    def list_changes(self, watermark, seen, limit, fields):
+        """
+        Return up to limit blogs with updatedAt >= watermark, oldest first,
+        leaving out those at exactly the watermark whose IDs are in seen
+        """
+
+class DynamoDBBackend(BlogBackend):
+    """
+    Reads blogs from the DynamoDB table and its indexes
+    """
+    name = 'dynamodb'
+    read_only = False
+
+    def get_blog(self, blog_id, fields):
+        return _query_blog(get_table(), blog_id, fields)
+
+    def list_blogs(self, filters):
+        operation, params = build_listing_request(filters)
+        return fetch_all(operation, params)
+
+    def list_changes(self, watermark, seen, limit, fields):
+        projection, names = build_projection(fields)
+        names.update({'#entity': 'entity', '#updatedAt': 'updatedAt'})
+        table = get_table()
+        params = {
+            'IndexName': CHANGES_INDEX,
+            'KeyConditionExpression': '#entity = :entity AND #updatedAt >= :since',
+            'ExpressionAttributeNames': names,
+            'ExpressionAttributeValues': {':entity': BLOG_ENTITY, ':since': watermark},
+            'ProjectionExpression': projection,
+            'Limit': limit + len(seen)
+        }
+
+        changes = []
+        while len(changes) < limit:
+            response = table.query(**params)
+            # Items at the watermark itself were returned last time
+            changes.extend(item for item in response.get('Items', [])
+                           if not (item['updatedAt'] == watermark and item['id'] in seen))
+            if 'LastEvaluatedKey' not in response:
+                break
+            params['ExclusiveStartKey'] = response['LastEvaluatedKey']
+        return changes[:limit]
+
+# Backends created in this container, by (name, SQLite path)
+_backends = {}
+
+def get_backend():
+    """
+    Return the backend selected by STORAGE_BACKEND ('dynamodb' or 'sqlite')
+
+    Raises:
+        ValueError: If the backend is unknown or SQLITE_PATH is missing for sqlite
+    """
+    name = os.environ.get('STORAGE_BACKEND', STORAGE_BACKEND_DEFAULT)
+    path = os.environ.get('SQLITE_PATH') if name == 'sqlite' else None
+    key = (name, path)
+    if key not in _backends:
+        if name == 'dynamodb':
+            _backends[key] = DynamoDBBackend()
+        elif name == 'sqlite':
+            if not path:
+                raise ValueError("SQLITE_PATH environment variable must be set for the sqlite backend")
+            # Imported here as sqlite_backend builds on this module
+            import sqlite_backend
+            _backends[key] = sqlite_backend.SQLiteBackend(path)
+        else:
+            raise ValueError(f"Unknown STORAGE_BACKEND: {name}. Allowed: dynamodb, sqlite")
+    return _backends[key]
+
 def post_blog(blog, token):
-    import datetime
-    import uuid
-    from utils.auth import CognitoAuth
+    import latest_service
+    from utils.auth import get_auth
     
-    auth = CognitoAuth(user_pool_id="eu-west-2_hidczk")
+    auth = get_auth()
     user_payload = auth.verify_token(token)
     
     if not user_payload:
+        logger.warning("Rejected blog post with invalid token")
         raise ValueError("Invalid or missing authentication token")
 
-    table_name = os.environ.get('DYNAMODB_TABLE_NAME')
-    if not table_name:
-        raise ValueError("DYNAMODB_TABLE_NAME environment variable must be set")
-    
-    dynamodb = boto3.resource('dynamodb')
-    table = dynamodb.Table(table_name)
+    if get_backend().read_only:
+        raise ReadOnlyBackendError(f"The {get_backend().name} storage backend is read-only")
+
+    table = get_table()
+
+    # Storage attributes are managed here, never taken from the request
+    for field in body_store.STORAGE_FIELDS + ['bodyHtml'] + body_store.storage_fields('bodyHtml') + ['entity', 'updatedAt']:
+        blog.pop(field, None)
 
     blog['id'] = str(uuid.uuid4())
-    blog['createdAt'] = int(datetime.datetime.now().timestamp())
+    blog['createdAt'] = now_ms()
+    # Indexed by the sparse createdAt and changes indexes
+    blog['entity'] = BLOG_ENTITY
+    blog['updatedAt'] = blog['createdAt']
+    if isinstance(blog.get('body'), str):
+        # Render once per write so readers never pay for it
+        html = render_markdown(blog['body'])
+        blog.update(body_store.pack_body(blog['id'], html, attribute='bodyHtml'))
+        blog.update(body_store.pack_body(blog['id'], blog.pop('body')))
+
+    table.put_item(Item=blog)
+    logger.info("Created blog %s", blog['id'], extra={'journey': blog.get('journey')})
 
-    table.put_item(Item=blog)
\ No newline at end of file
+    try:
+        stats_service.record_blog(blog, table)
+    except Exception:
+        # The post exists; scripts/rebuild_stats.py corrects any missed count
+        logger.exception("Failed to update archive stats for blog %s", blog['id'])
+    try:
+        latest_service.record_blog(blog, table)
+    except Exception:
+        # Reads fall back to the createdAt index; scripts/rebuild_latest.py restores the item
+        logger.exception("Failed to update the latest posts item for blog %s", blog['id'])
+    return blog
@@ -0,0 +1,359 @@
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+import xml.etree.ElementTree as ET
+from email.utils import format_datetime
+from urllib.parse import quote
+from botocore.exceptions import ClientError
+import blog_service
+from utils.logger import get_logger
+from utils.s3 import get_s3_client, put_object_conditionally, is_precondition_failed
+from utils.timestamps import to_datetime
+
+logger = get_logger(__name__)
+
+# Public site the feed and sitemap link to
+SITE_URL = os.environ.get('SITE_URL', '').rstrip('/')
+
+# Link to a single post on the site
+POST_URL_TEMPLATE = os.environ.get('POST_URL_TEMPLATE', '{site_url}/blogs/{id}')
+
+# Number of most recent posts included in a feed
+FEED_SIZE = int(os.environ.get('FEED_SIZE', 50))
+
+# Seconds a container trusts its in-memory copy before checking S3 again
+FEED_CACHE_TTL = int(os.environ.get('FEED_CACHE_TTL', 300))
+
+FEED_S3_PREFIX = os.environ.get('FEED_S3_PREFIX', 'feeds')
+
+# Attributes kept for each feed / sitemap entry
+ENTRY_FIELDS = ['id', 'title', 'description', 'journey', 'tags', 'createdAt', 'username']
+
+# Attempts at the conditional S3 writes before giving up to concurrent writers
+FEED_WRITE_ATTEMPTS = 5
+
+# Most documents a container keeps cached; the least recently loaded is dropped first
+FEED_CACHE_MAX_ENTRIES = int(os.environ.get('FEED_CACHE_MAX_ENTRIES', 100))
+
+# Generated documents cached per container: name -> {'xml', 'etag', 'loaded_at'}
+_cache = {}
+_cache_lock = threading.Lock()
+
+
+def _document_name(kind, journey=None):
+    if kind == 'feed' and journey:
+        # Percent-encoding keeps distinct journeys apart, e.g. 'south america' and 'south-america'
+        return f"feed-{quote(journey, safe='')}"
+    return kind
+
+
+def _bucket():
+    return os.environ.get('FEED_S3_BUCKET') or os.environ.get('S3_BUCKET_NAME')
+
+
+def _post_url(entry):
+    return POST_URL_TEMPLATE.format(site_url=SITE_URL, id=entry['id'])
+
+
+def render_feed(entries, journey=None):
+    """
+    Render feed entries (newest first) as an RSS 2.0 document
+    """
+    rss = ET.Element('rss', version='2.0')
+    channel = ET.SubElement(rss, 'channel')
+    ET.SubElement(channel, 'title').text = f"Bloggs - {journey}" if journey else 'Bloggs'
+    ET.SubElement(channel, 'link').text = SITE_URL or '/'
+    ET.SubElement(channel, 'description').text = 'Latest posts'
+    if entries:
+        ET.SubElement(channel, 'lastBuildDate').text = format_datetime(to_datetime(entries[0]['createdAt']))
+
+    for entry in entries:
+        item = ET.SubElement(channel, 'item')
+        ET.SubElement(item, 'title').text = entry.get('title', '')
+        ET.SubElement(item, 'link').text = _post_url(entry)
+        ET.SubElement(item, 'guid', isPermaLink='false').text = entry['id']
+        ET.SubElement(item, 'description').text = entry.get('description', '')
+        ET.SubElement(item, 'pubDate').text = format_datetime(to_datetime(entry['createdAt']))
+        if entry.get('username'):
+            ET.SubElement(item, 'author').text = entry['username']
+        for tag in entry.get('tags') or []:
+            ET.SubElement(item, 'category').text = tag
+
+    return '<?xml version="1.0" encoding="UTF-8"?>\n' + ET.tostring(rss, encoding='unicode')
+
+
+def render_sitemap(entries):
+    """
+    Render sitemap entries as a sitemaps.org urlset document
+    """
+    urlset = ET.Element('urlset', xmlns='http://www.sitemaps.org/schemas/sitemap/0.9')
+    for entry in entries:
+        url = ET.SubElement(urlset, 'url')
+        ET.SubElement(url, 'loc').text = _post_url(entry)
+        ET.SubElement(url, 'lastmod').text = to_datetime(entry['createdAt']).date().isoformat()
+
+    return '<?xml version="1.0" encoding="UTF-8"?>\n' + ET.tostring(urlset, encoding='unicode')
+
+
+def _render(kind, entries, journey=None):
+    return render_sitemap(entries) if kind == 'sitemap' else render_feed(entries, journey)
+
+
+def _etag(xml):
+    return '"' + hashlib.sha256(xml.encode('utf-8')).hexdigest()[:32] + '"'
+
+
+def _sort_key(entry):
+    return to_datetime(entry['createdAt']).timestamp()
+
+
+def _json_default(value):
+    # DynamoDB returns numbers as Decimal and string sets as set
+    if isinstance(value, (set, frozenset)):
+        return sorted(value)
+    return int(value) if value % 1 == 0 else float(value)
+
+
+def _key(name, suffix):
+    return f"{FEED_S3_PREFIX.rstrip('/')}/{name}.{suffix}"
+
+
+def _put(name, suffix, body, content_type, etag, overwrite):
+    if overwrite:
+        conditions = {}
+    elif etag:
+        conditions = {'if_match': etag}
+    else:
+        conditions = {'if_none_match': '*'}
+    put_object_conditionally(
+        Bucket=_bucket(),
+        Key=_key(name, suffix),
+        Body=body.encode('utf-8'),
+        ContentType=content_type,
+        **conditions
+    )
+
+
+def _store(name, entries, xml, json_etag=None, xml_etag=None, overwrite=False):
+    """
+    Write a document and the entries it was built from to S3
+
+    Each object is only written while it still has the ETag read before the
+    update, or while it does not exist when no ETag is given, unless
+    overwrite is set.
+
+    Raises:
+        ClientError: PreconditionFailed when another writer got there first
+    """
+    if not _bucket():
+        return
+    _put(name, 'json', json.dumps(entries, default=_json_default), 'application/json', json_etag, overwrite)
+    _put(name, 'xml', xml, 'application/xml', xml_etag, overwrite)
+
+
+def _load(name, suffix):
+    """
+    Read a stored object
+
+    Returns:
+        tuple: (text, ETag), or (None, None) when it does not exist
+    """
+    bucket = _bucket()
+    if not bucket:
+        return None, None
+    try:
+        response = get_s3_client().get_object(Bucket=bucket, Key=_key(name, suffix))
+    except ClientError as e:
+        if e.response['Error']['Code'] in ('NoSuchKey', '404'):
+            return None, None
+        raise
+    return response['Body'].read().decode('utf-8'), response['ETag']
+
+
+def _stored_etag(name, suffix):
+    try:
+        return get_s3_client().head_object(Bucket=_bucket(), Key=_key(name, suffix))['ETag']
+    except ClientError as e:
+        if e.response['Error']['Code'] in ('NoSuchKey', '404'):
+            return None
+        raise
+
+
+def _discard(name):
+    s3_client = get_s3_client()
+    for suffix in ('json', 'xml'):
+        s3_client.delete_object(Bucket=_bucket(), Key=_key(name, suffix))
+
+
+def _cache_document(name, xml):
+    document = {'xml': xml, 'etag': _etag(xml), 'loaded_at': time.monotonic()}
+    with _cache_lock:
+        if name not in _cache and len(_cache) >= FEED_CACHE_MAX_ENTRIES:
+            del _cache[min(_cache, key=lambda cached: _cache[cached]['loaded_at'])]
+        _cache[name] = document
+    return document
+
+
+def _build(kind, journey=None):
+    """
+    Generate a document from the blog listing
+    """
+    filters = {'fields': ','.join(ENTRY_FIELDS)}
+    if journey:
+        filters['journey'] = journey
+    entries = sorted(blog_service.filter_blogs(filters), key=_sort_key, reverse=True)
+    if kind == 'feed':
+        entries = entries[:FEED_SIZE]
+    return entries, _render(kind, entries, journey)
+
+
+def get_document(kind, journey=None):
+    """
+    Return a generated feed or sitemap, reading DynamoDB only when no copy exists
+
+    Documents are served from the container cache while fresh, then from S3,
+    and only generated from the blog listing when S3 has no copy yet. Feeds
+    of journeys without posts are generated on every request, never stored.
+
+    Args:
+        kind (str): 'feed' or 'sitemap'
+        journey (str): Optional journey to restrict a feed to
+
+    Returns:
+        dict: {'xml': document, 'etag': entity tag}
+    """
+    name = _document_name(kind, journey)
+    cached = _cache.get(name)
+    if cached and time.monotonic() - cached['loaded_at'] < FEED_CACHE_TTL:
+        return cached
+
+    try:
+        xml, _ = _load(name, 'xml')
+    except Exception:
+        logger.exception("Failed to read %s from S3", name)
+        xml = None
+
+    if xml is None:
+        logger.info("Generating %s from the blog listing", name)
+        entries, xml = _build(kind, journey)
+        if journey and not entries:
+            # Journeys come from the query string, so unknown ones are neither
+            # stored nor cached; the first post in a journey creates its feed
+            return {'xml': xml, 'etag': _etag(xml)}
+        try:
+            _store(name, entries, xml)
+        except ClientError as e:
+            if not is_precondition_failed(e):
+                logger.exception("Failed to store %s in S3", name)
+            else:
+                # Another container or a new post created it first; theirs is read after the TTL
+                logger.info("%s was stored concurrently", name)
+        except Exception:
+            logger.exception("Failed to store %s in S3", name)
+
+    return _cache_document(name, xml)
+
+
+def load_stored_document(kind, journey=None):
+    """
+    Cache the stored copy of a document, without generating one when S3 has none
+
+    Returns:
+        dict: {'xml': document, 'etag': entity tag}, or None if nothing is stored
+    """
+    name = _document_name(kind, journey)
+    xml, _ = _load(name, 'xml')
+    if xml is None:
+        return None
+    return _cache_document(name, xml)
+
+
+def _add_entry(kind, entry, journey=None):
+    """
+    Add an entry to a stored document with conditional writes, retrying with
+    a fresh read when another writer updated it in between
+    """
+    if not _bucket():
+        return
+    name = _document_name(kind, journey)
+    for attempt in range(FEED_WRITE_ATTEMPTS):
+        # The XML ETag is read before the entries, so an XML write by anyone
+        # who read older entries than ours makes this write fail and retry
+        xml_etag = _stored_etag(name, 'xml')
+        stored, json_etag = _load(name, 'json')
+        if stored is None:
+            # Nothing stored yet; index reads may not see the new post, so it is merged in too
+            entries, _ = _build(kind, journey)
+        else:
+            entries = json.loads(stored)
+        entries = [existing for existing in entries if existing['id'] != entry['id']]
+        entries.append(entry)
+        entries.sort(key=_sort_key, reverse=True)
+        if kind == 'feed':
+            entries = entries[:FEED_SIZE]
+        xml = _render(kind, entries, journey)
+
+        try:
+            _store(name, entries, xml, json_etag, xml_etag)
+        except ClientError as e:
+            if not is_precondition_failed(e):
+                raise
+            logger.debug("%s changed concurrently, retrying (attempt %d)", name, attempt + 1)
+            time.sleep(random.uniform(0, 0.05 * (attempt + 1)))
+            continue
+        _cache_document(name, xml)
+        return
+    raise RuntimeError(f"Gave up updating {name} after {FEED_WRITE_ATTEMPTS} attempts")
+
+
+def add_blog(blog):
+    """
+    Incrementally add a newly posted blog to the stored feeds and sitemap
+
+    Failures are logged rather than raised so they never fail the post itself.
+    A document that could not be updated is deleted from S3, so the next read
+    regenerates it from the blog listing.
+
+    Args:
+        blog (dict): The blog item as written to DynamoDB
+    """
+    entry = {field: blog[field] for field in ENTRY_FIELDS if field in blog}
+    targets = [('feed', None), ('sitemap', None)]
+    if blog.get('journey'):
+        targets.append(('feed', blog['journey']))
+
+    for kind, journey in targets:
+        name = _document_name(kind, journey)
+        try:
+            _add_entry(kind, entry, journey)
+        except Exception:
+            logger.exception("Failed to update %s with blog %s", name, blog.get('id'))
+            try:
+                _discard(name)
+            except Exception:
+                logger.exception("Failed to discard %s; run scripts/rebuild_feeds.py", name)
+
+
+def rebuild_document(kind, journey=None):
+    """
+    Regenerate a document from the blog listing and overwrite the stored copy
+
+    Returns:
+        list: The entries the document was built from
+    """
+    name = _document_name(kind, journey)
+    entries, xml = _build(kind, journey)
+    _store(name, entries, xml, overwrite=True)
+    _cache_document(name, xml)
+    return entries
+
+
+def clear_cache():
+    """
+    Drop all documents cached in this container
+    """
+    with _cache_lock:
+        _cache.clear()
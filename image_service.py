@@ -1,5 +1,8 @@
-import boto3
 import os
+from utils.logger import get_logger
+from utils.s3 import get_s3_client
+
+logger = get_logger(__name__)
 
 # Get bucket name from environment variable - required
 S3_BUCKET_NAME = os.environ.get('S3_BUCKET_NAME')
@@ -20,7 +23,7 @@ def get_image_by_filename(filename):
         dict: A dictionary containing the presigned URL or an error message
     """
     try:
-        s3_client = boto3.client('s3')
+        s3_client = get_s3_client()
         
         # Generate the presigned URL
         presigned_url = s3_client.generate_presigned_url(
@@ -37,5 +40,5 @@ def get_image_by_filename(filename):
             'expires_in': URL_EXPIRATION
         }
     except Exception as e:
-        print(f"Error generating presigned URL: {str(e)}")
+        logger.exception("Error generating presigned URL for %s", filename)
         return None
@@ -1,30 +1,146 @@
 import json
-from utils.response import format_response, redirect
+import time
+from utils.events import normalize_event
+from utils.logger import get_logger, bind_request
+from utils import profiling
+from utils.response import format_response, format_xml_response, not_modified, redirect
+import async_blog_service
 import blog_service
+import feed_service
 import image_service
+import latest_service
+import related_service
+import stats_service
+import warmup
+
+logger = get_logger(__name__)
+
+if warmup.PRELOAD_ON_INIT:
+    # Module import happens in the Lambda init phase, before any user request
+    warmup.initialise()
 
 def lambda_handler(event, context):
     """
     Main handler for all routes of the blogging API
     """
+    if warmup.is_warmup_event(event):
+        bind_request(context)
+        return warmup.initialise()
+
+    event = normalize_event(event)
+    profile = profiling.should_profile(event)
+    bind_request(context, force_debug=profile)
+    started = time.perf_counter()
+
+    if profile:
+        label = f"{event.get('httpMethod')} {event.get('resource') or event.get('path', '')}"
+        response = profiling.profile_call(route_request, event, label=label)
+    else:
+        response = route_request(event)
+
+    logger.info(
+        "%s %s -> %s",
+        event.get('httpMethod'), event.get('path', ''), response['statusCode'],
+        extra={'duration_ms': round((time.perf_counter() - started) * 1000, 2)}
+    )
+    return response
+
+def _multi_values(name, query_parameters, multi_query_parameters):
+    """
+    Collect every value of a query parameter, whether repeated or comma separated
+    """
+    raw_values = multi_query_parameters.get(name) or (
+        [query_parameters[name]] if name in query_parameters else []
+    )
+    values = []
+    for raw in raw_values:
+        values.extend(value for value in raw.split(',') if value)
+    return values
+
+def list_blogs(query_parameters, multi_query_parameters):
+    """
+    List blogs, fanning out concurrent queries when several journeys or months are requested
+    """
+    journeys = _multi_values('journey', query_parameters, multi_query_parameters)
+    months = _multi_values('month', query_parameters, multi_query_parameters)
+    tags = _multi_values('tags', query_parameters, multi_query_parameters)
+
+    if len(journeys) <= 1 and not months:
+        filters = dict(query_parameters)
+        if tags:
+            filters['tags'] = ','.join(tags)
+        return blog_service.filter_blogs(filters)
+
+    filters = {'journeys': journeys, 'months': months}
+    for name in ('start', 'end', 'fields'):
+        if name in query_parameters:
+            filters[name] = query_parameters[name]
+    if tags:
+        filters['tags'] = ','.join(tags)
+    return async_blog_service.run(async_blog_service.filter_blogs(filters))
+
+def route_request(event):
+    """
+    Dispatch an API Gateway event to the matching service call
+    """
     http_method = event.get('httpMethod')
     path = event.get('path', '')
     path_parameters = event.get('pathParameters', {}) or {}
     query_parameters = event.get('queryStringParameters', {}) or {}
+    multi_query_parameters = event.get('multiValueQueryStringParameters', {}) or {}
     
     # Route handling logic
     if path.startswith('/blogs'):
         if http_method == 'GET':
+            # Archive aggregates (posts per month / journey)
+            if path.rstrip('/') == '/blogs/stats':
+                return format_response(200, stats_service.get_stats())
+            # Incremental sync: blogs created or modified since a cursor
+            elif path.rstrip('/') == '/blogs/changes':
+                try:
+                    changes = blog_service.get_changes(
+                        since=query_parameters.get('since'),
+                        limit=query_parameters.get('limit'),
+                        fields=query_parameters.get('fields')
+                    )
+                except ValueError as e:
+                    return format_response(400, {'error': str(e)})
+                return format_response(200, changes)
+            # Precomputed related posts
+            elif 'id' in path_parameters and path.rstrip('/').endswith('/related'):
+                related = related_service.get_related(path_parameters['id'])
+                if related is None:
+                    return format_response(404, {'error': 'Blog not found'})
+                return format_response(200, related)
             # Get blog by ID
-            if 'id' in path_parameters:
+            elif 'id' in path_parameters:
                 blog_id = path_parameters['id']
-                blog = blog_service.get_blog_by_id(blog_id)
+                try:
+                    blog = blog_service.get_blog_by_id(
+                        blog_id,
+                        fields=query_parameters.get('fields'),
+                        body_format=query_parameters.get('format', 'markdown')
+                    )
+                except ValueError as e:
+                    return format_response(400, {'error': str(e)})
                 if blog:
                     return format_response(200, blog)
                 return format_response(404, {'error': 'Blog not found'})
-            # Get blogs with filters (date range and/or journey)
+            # Newest posts for the home page
+            elif 'latest' in query_parameters:
+                if set(query_parameters) - {'latest', 'fields'}:
+                    return format_response(400, {'error': 'latest can only be combined with fields'})
+                try:
+                    blogs = latest_service.get_latest(query_parameters['latest'], query_parameters.get('fields'))
+                except ValueError as e:
+                    return format_response(400, {'error': str(e)})
+                return format_response(200, blogs)
+            # Get blogs with filters (date range, journeys, months and/or tags)
             else:
-                blogs = blog_service.filter_blogs(query_parameters)
+                try:
+                    blogs = list_blogs(query_parameters, multi_query_parameters)
+                except ValueError as e:
+                    return format_response(400, {'error': str(e)})
                     
                 return format_response(200, blogs)
         
@@ -48,18 +164,40 @@ def lambda_handler(event, context):
                     blog_data = body
                 
                 # Post the blog
-                blog_service.post_blog(blog_data, token)
+                blog = blog_service.post_blog(blog_data, token)
+                feed_service.add_blog(blog)
+                try:
+                    related_service.update_for_new_blog(blog)
+                except Exception:
+                    # The post exists; scripts/build_related.py fills any gap
+                    logger.exception("Failed to update related posts for blog %s", blog['id'])
                 
                 return format_response(201, {'message': 'Blog created successfully'})
                 
+            except blog_service.ReadOnlyBackendError as e:
+                # Served from the offline copy (STORAGE_BACKEND=sqlite)
+                return format_response(503, {'error': str(e)})
             except ValueError as e:
                 # Authentication or validation error
                 return format_response(401, {'error': str(e)})
             except json.JSONDecodeError:
                 return format_response(400, {'error': 'Invalid JSON in request body'})
-            except Exception as e:
+            except Exception:
+                logger.exception("Unhandled error creating blog")
                 return format_response(500, {'error': 'Internal server error'})
     
+    elif path in ('/feed.xml', '/sitemap.xml'):
+        if http_method == 'GET':
+            kind = 'feed' if path == '/feed.xml' else 'sitemap'
+            journey = query_parameters.get('journey') if kind == 'feed' else None
+            document = feed_service.get_document(kind, journey)
+            
+            headers = event.get('headers') or {}
+            if_none_match = headers.get('If-None-Match') or headers.get('if-none-match')
+            if if_none_match == document['etag']:
+                return not_modified(document['etag'], feed_service.FEED_CACHE_TTL)
+            return format_xml_response(200, document['xml'], document['etag'], feed_service.FEED_CACHE_TTL)
+    
     elif path.startswith('/images'):
         if http_method == 'GET' and 'filename' in path_parameters:
             filename = path_parameters['filename']
@@ -0,0 +1,153 @@
+import os
+import random
+import time
+from botocore.exceptions import ClientError
+import blog_service
+from utils import singleflight
+from utils.dynamodb import get_table, get_meta_key, build_projection, META_ENTITY
+from utils.logger import get_logger
+from utils.timestamps import now_ms
+
+logger = get_logger(__name__)
+
+LATEST_ITEM = 'latest'
+
+# Number of newest post summaries kept on the latest item
+LATEST_SIZE = int(os.environ.get('LATEST_SIZE', 50))
+
+# Largest N accepted by GET /blogs?latest=N
+LATEST_MAX = 500
+
+# Attempts at the conditional write before giving up to concurrent writers
+LATEST_WRITE_ATTEMPTS = 5
+
+
+def _entry(blog):
+    return {field: blog[field] for field in blog_service.LISTING_FIELDS if field in blog}
+
+
+def _merge(entries, blog):
+    entries = [entry for entry in entries if entry['id'] != blog['id']]
+    entries.append(_entry(blog))
+    entries.sort(key=lambda entry: entry.get('createdAt', 0), reverse=True)
+    return entries[:LATEST_SIZE]
+
+
+def _write(table, entries, version):
+    """
+    Store the list, provided nobody else has written since version was read
+    """
+    values = {':entries': entries, ':next': (version or 0) + 1, ':meta': META_ENTITY, ':now': now_ms()}
+    if version is None:
+        condition = 'attribute_not_exists(#version)'
+    else:
+        condition = '#version = :expected'
+        values[':expected'] = version
+    table.update_item(
+        Key=get_meta_key(LATEST_ITEM),
+        UpdateExpression='SET #entries = :entries, #version = :next, #entity = :meta, #updatedAt = :now',
+        ConditionExpression=condition,
+        ExpressionAttributeNames={
+            '#entries': 'entries', '#version': 'version', '#entity': 'entity', '#updatedAt': 'updatedAt'
+        },
+        ExpressionAttributeValues=values
+    )
+
+
+def record_blog(blog, table=None):
+    """
+    Add a new blog to the bounded, newest-first list on the latest item
+
+    Uses optimistic locking on a version attribute, re-reading and retrying
+    when another writer updated the list in between.
+
+    Args:
+        blog (dict): The blog item as written to DynamoDB
+        table: Optional table resource, defaults to the blogs table
+    """
+    table = table or get_table()
+    for attempt in range(LATEST_WRITE_ATTEMPTS):
+        item = table.get_item(Key=get_meta_key(LATEST_ITEM), ConsistentRead=True).get('Item') or {}
+        try:
+            _write(table, _merge(item.get('entries', []), blog), item.get('version'))
+            return
+        except ClientError as e:
+            if e.response['Error']['Code'] != 'ConditionalCheckFailedException':
+                raise
+            logger.debug("Latest item changed concurrently, retrying (attempt %d)", attempt + 1)
+            time.sleep(random.uniform(0, 0.05 * (attempt + 1)))
+    raise RuntimeError(f"Gave up updating the latest item after {LATEST_WRITE_ATTEMPTS} attempts")
+
+
+def query_latest(n, table=None):
+    """
+    Read the n newest blogs from the createdAt index
+    """
+    table = table or get_table()
+    projection, names = build_projection(blog_service.LISTING_FIELDS)
+    params = {
+        'IndexName': blog_service.CREATED_INDEX,
+        'KeyConditionExpression': 'entity = :blog_entity',
+        'ExpressionAttributeValues': {':blog_entity': blog_service.BLOG_ENTITY},
+        'ProjectionExpression': projection,
+        'ExpressionAttributeNames': names,
+        'ScanIndexForward': False,
+        'Limit': n
+    }
+    items = []
+    while len(items) < n:
+        response = table.query(**params)
+        items.extend(response.get('Items', []))
+        if 'LastEvaluatedKey' not in response:
+            break
+        params['ExclusiveStartKey'] = response['LastEvaluatedKey']
+    return items[:n]
+
+
+def replace_latest(table=None):
+    """
+    Overwrite the latest item from the createdAt index, e.g. after a migration
+    """
+    table = table or get_table()
+    entries = query_latest(LATEST_SIZE, table)
+    item = table.get_item(Key=get_meta_key(LATEST_ITEM), ConsistentRead=True).get('Item') or {}
+    _write(table, entries, item.get('version'))
+    return entries
+
+
+def _get_latest(n):
+    table = get_table()
+    item = table.get_item(Key=get_meta_key(LATEST_ITEM)).get('Item')
+    if item is not None and len(item.get('entries', [])) >= n:
+        return item['entries'][:n]
+
+    logger.info("Serving latest %d from the createdAt index", n)
+    return query_latest(n, table)
+
+
+def get_latest(n, fields=None):
+    """
+    Return the n newest blog summaries, newest first
+
+    Served from the precomputed latest item with a single GetItem when it holds
+    at least n entries, otherwise from a query on the createdAt index.
+
+    Args:
+        n (int or str): Number of posts, 1 to LATEST_MAX
+        fields (str): Comma separated attributes to return (see LISTING_FIELDS)
+
+    Raises:
+        ValueError: If n or fields are invalid
+    """
+    try:
+        n = int(n)
+    except (TypeError, ValueError):
+        raise ValueError("latest must be an integer")
+    if not 1 <= n <= LATEST_MAX:
+        raise ValueError(f"latest must be between 1 and {LATEST_MAX}")
+    requested = blog_service.parse_fields(fields, blog_service.LISTING_FIELDS) if fields else None
+
+    entries = singleflight.get_group('get_latest').do(n, _get_latest, n)
+    if requested:
+        entries = [{field: entry[field] for field in requested if field in entry} for entry in entries]
+    return entries
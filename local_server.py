@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+"""
+Run the API outside Lambda by adapting WSGI requests to API Gateway events.
+
+The adapter can be served by any WSGI server (e.g. `gunicorn local_server:app`)
+or run directly, which uses a pooled stdlib server:
+
+    python local_server.py --port 8080 --workers 16 \
+        --dynamodb-endpoint http://localhost:8000 --s3-endpoint http://localhost:9000
+
+Worker threads share the handler module, so AWS clients and in-process caches
+stay warm across requests just as they do in a warm Lambda container.
+"""
+
+import argparse
+import base64
+import os
+import re
+import sys
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from socketserver import ThreadingMixIn
+from urllib.parse import parse_qs
+from wsgiref.simple_server import WSGIServer, WSGIRequestHandler, make_server
+
+# API Gateway resources, mirroring the Events in template.yaml.
+# Literal paths must come before templated ones that could also match them.
+ROUTES = [
+    '/feed.xml',
+    '/sitemap.xml',
+    '/blogs',
+    '/blogs/stats',
+    '/blogs/changes',
+    '/blogs/{id}',
+    '/blogs/{id}/related',
+    '/images/{filename}',
+]
+
+
+def _compile_route(resource):
+    pattern = re.sub(r'\{(\w+)\}', r'(?P<\1>[^/]+)', resource)
+    return resource, re.compile(f"^{pattern}$")
+
+_COMPILED_ROUTES = [_compile_route(resource) for resource in ROUTES]
+
+
+def match_route(path):
+    """
+    Find the API Gateway resource matching a request path
+
+    Returns:
+        tuple: (resource template or None, path parameters dict or None)
+    """
+    for resource, pattern in _COMPILED_ROUTES:
+        match = pattern.match(path)
+        if match:
+            return resource, match.groupdict() or None
+    return None, None
+
+
+class LocalContext:
+    """
+    Minimal stand-in for the Lambda context object
+    """
+    function_name = 'bloggs-local'
+    memory_limit_in_mb = 256
+
+    def __init__(self, timeout_ms=10000):
+        self.aws_request_id = str(uuid.uuid4())
+        self._deadline = time.monotonic() + timeout_ms / 1000
+
+    def get_remaining_time_in_millis(self):
+        return max(0, int((self._deadline - time.monotonic()) * 1000))
+
+
+def _read_headers(environ):
+    headers = {}
+    for key, value in environ.items():
+        if key.startswith('HTTP_'):
+            headers[key[5:].replace('_', '-').title()] = value
+    for key in ('CONTENT_TYPE', 'CONTENT_LENGTH'):
+        if environ.get(key):
+            headers[key.replace('_', '-').title()] = environ[key]
+    return headers
+
+
+def _read_body(environ):
+    try:
+        length = int(environ.get('CONTENT_LENGTH') or 0)
+    except ValueError:
+        length = 0
+    if not length:
+        return None, False
+    raw = environ['wsgi.input'].read(length)
+    try:
+        return raw.decode('utf-8'), False
+    except UnicodeDecodeError:
+        return base64.b64encode(raw).decode('ascii'), True
+
+
+def make_event(environ, payload_version=1):
+    """
+    Convert a WSGI environ into an API Gateway proxy event
+
+    Args:
+        environ (dict): The WSGI request environment
+        payload_version (int): 1 for REST API events, 2 for HTTP API (payload 2.0) events
+
+    Returns:
+        dict: The event passed to lambda_handler
+    """
+    method = environ.get('REQUEST_METHOD', 'GET')
+    path = environ.get('PATH_INFO') or '/'
+    raw_query = environ.get('QUERY_STRING', '')
+    multi_query = parse_qs(raw_query, keep_blank_values=True)
+    headers = _read_headers(environ)
+    body, is_base64 = _read_body(environ)
+    resource, path_parameters = match_route(path)
+    request_id = str(uuid.uuid4())
+    source_ip = environ.get('REMOTE_ADDR', '127.0.0.1')
+
+    if payload_version == 2:
+        return {
+            'version': '2.0',
+            'routeKey': f"{method} {resource}" if resource else '$default',
+            'rawPath': path,
+            'rawQueryString': raw_query,
+            'headers': {name.lower(): value for name, value in headers.items()},
+            'queryStringParameters': {k: ','.join(v) for k, v in multi_query.items()} or None,
+            'pathParameters': path_parameters,
+            'requestContext': {
+                'requestId': request_id,
+                'http': {'method': method, 'path': path, 'sourceIp': source_ip},
+            },
+            'body': body,
+            'isBase64Encoded': is_base64,
+        }
+
+    return {
+        'resource': resource,
+        'path': path,
+        'httpMethod': method,
+        'headers': headers,
+        'multiValueHeaders': {name: [value] for name, value in headers.items()},
+        # API Gateway REST APIs pass the last value of repeated parameters
+        'queryStringParameters': {k: v[-1] for k, v in multi_query.items()} or None,
+        'multiValueQueryStringParameters': multi_query or None,
+        'pathParameters': path_parameters,
+        'requestContext': {
+            'requestId': request_id,
+            'resourcePath': resource,
+            'httpMethod': method,
+            'identity': {'sourceIp': source_ip},
+        },
+        'body': body,
+        'isBase64Encoded': is_base64,
+    }
+
+
+class LambdaWSGIApp:
+    """
+    WSGI application that forwards every request to lambda_handler
+    """
+    def __init__(self, payload_version=1):
+        self.payload_version = payload_version
+        self._handler = None
+
+    @property
+    def handler(self):
+        # Imported lazily so endpoint environment variables can be set first
+        if self._handler is None:
+            from lambda_function import lambda_handler
+            self._handler = lambda_handler
+        return self._handler
+
+    def __call__(self, environ, start_response):
+        event = make_event(environ, self.payload_version)
+        response = self.handler(event, LocalContext())
+
+        status_code = response.get('statusCode', 200)
+        try:
+            reason = HTTPStatus(status_code).phrase
+        except ValueError:
+            reason = 'Unknown'
+
+        body = response.get('body') or ''
+        if response.get('isBase64Encoded'):
+            payload = base64.b64decode(body)
+        else:
+            payload = body.encode('utf-8') if isinstance(body, str) else body
+
+        headers = [(name, str(value)) for name, value in (response.get('headers') or {}).items()]
+        headers.append(('Content-Length', str(len(payload))))
+        start_response(f"{status_code} {reason}", headers)
+        return [payload]
+
+
+app = LambdaWSGIApp(payload_version=int(os.environ.get('LOCAL_PAYLOAD_VERSION', 1)))
+
+
+class PooledWSGIServer(ThreadingMixIn, WSGIServer):
+    """
+    WSGI server that handles connections on a fixed-size thread pool
+    """
+    daemon_threads = True
+
+    def __init__(self, *args, workers=8, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='bloggs-worker')
+
+    def process_request(self, request, client_address):
+        self.pool.submit(self.process_request_thread, request, client_address)
+
+    def server_close(self):
+        super().server_close()
+        self.pool.shutdown(wait=True)
+
+
+class QuietRequestHandler(WSGIRequestHandler):
+    access_log = False
+
+    def log_message(self, format, *args):
+        if self.access_log:
+            super().log_message(format, *args)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--workers', type=int, default=8, help='Size of the request thread pool')
+    parser.add_argument('--payload-version', type=int, choices=[1, 2], default=1,
+                        help='1 for REST API events, 2 for HTTP API events')
+    parser.add_argument('--dynamodb-endpoint', help='DynamoDB endpoint, e.g. DynamoDB Local')
+    parser.add_argument('--s3-endpoint', help='S3 endpoint, e.g. MinIO')
+    parser.add_argument('--access-log', action='store_true', help='Log every request to stderr')
+    args = parser.parse_args()
+
+    if args.dynamodb_endpoint:
+        os.environ['DYNAMODB_ENDPOINT_URL'] = args.dynamodb_endpoint
+    if args.s3_endpoint:
+        os.environ['S3_ENDPOINT_URL'] = args.s3_endpoint
+    QuietRequestHandler.access_log = args.access_log
+
+    wsgi_app = LambdaWSGIApp(payload_version=args.payload_version)
+    # Import (and initialise clients) before accepting traffic
+    wsgi_app.handler
+
+    server = make_server(
+        args.host, args.port, wsgi_app,
+        server_class=lambda *a, **kw: PooledWSGIServer(*a, workers=args.workers, **kw),
+        handler_class=QuietRequestHandler
+    )
+    print(f"Serving on http://{args.host}:{args.port} with {args.workers} workers", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,284 @@
+import heapq
+import math
+import os
+from collections import Counter, defaultdict
+from decimal import Decimal
+from botocore.exceptions import ClientError
+import blog_service
+from utils.dynamodb import get_table, build_projection, META_ID_PREFIX
+from utils.logger import get_logger
+from utils.timestamps import to_datetime
+
+logger = get_logger(__name__)
+
+# Number of related posts stored for each blog
+RELATED_K = int(os.environ.get('RELATED_K', 5))
+
+# Added to the tag similarity of posts from the same journey
+RELATED_JOURNEY_BOOST = float(os.environ.get('RELATED_JOURNEY_BOOST', 0.3))
+
+# Newest posts read from each index (all posts, same journey) when a post is added
+RELATED_CANDIDATES = int(os.environ.get('RELATED_CANDIDATES', 100))
+
+# Tags (and journeys) on more than this share of posts, e.g. 'travel', only
+# offer the RELATED_CANDIDATES posts nearest in time as candidates
+RELATED_MAX_TAG_SHARE = float(os.environ.get('RELATED_MAX_TAG_SHARE', 0.2))
+
+# Attributes needed to score candidates
+CANDIDATE_FIELDS = ['id', 'title', 'journey', 'tags', 'createdAt']
+
+
+def _tags(blog):
+    return set(blog.get('tags') or [])
+
+
+def _recency(blog):
+    created_at = blog.get('createdAt')
+    return to_datetime(created_at).timestamp() if created_at is not None else 0
+
+
+def build_vectors(blogs, sample=None):
+    """
+    Build L2-normalised sparse tag vectors weighted by inverse document frequency
+
+    Rare tags say more about a post than ones every post has (e.g. 'travel').
+
+    Args:
+        blogs (list): Blog items with id and tags
+        sample (list): Blogs to estimate tag frequencies from, defaults to blogs
+
+    Returns:
+        dict: blog id -> {tag: weight}
+    """
+    sample = blogs if sample is None else sample
+    document_frequency = Counter(tag for blog in sample for tag in _tags(blog))
+    total = len(sample)
+
+    vectors = {}
+    for blog in blogs:
+        weights = {
+            tag: math.log((1 + total) / (1 + document_frequency[tag])) + 1
+            for tag in _tags(blog)
+        }
+        norm = math.sqrt(sum(weight * weight for weight in weights.values())) or 1.0
+        vectors[blog['id']] = {tag: weight / norm for tag, weight in weights.items()}
+    return vectors
+
+
+def similarity(blog, other, vectors):
+    """
+    Cosine similarity of the tag vectors plus the same-journey boost
+    """
+    vector, other_vector = vectors.get(blog['id'], {}), vectors.get(other['id'], {})
+    if len(vector) > len(other_vector):
+        vector, other_vector = other_vector, vector
+    score = sum(weight * other_vector.get(tag, 0.0) for tag, weight in vector.items())
+    if blog.get('journey') and blog.get('journey') == other.get('journey'):
+        score += RELATED_JOURNEY_BOOST
+    return score
+
+
+def _entry(blog, score):
+    # DynamoDB does not accept floats
+    return {'id': blog['id'], 'title': blog.get('title', ''), 'score': Decimal(str(round(score, 4)))}
+
+
+def _nearest(members, position, n):
+    # Members are ordered by creation time, so neighbours are the nearest in time
+    start = max(0, min(position - n // 2, len(members) - n))
+    return members[start:start + n]
+
+
+def compute_related(blogs, k=RELATED_K):
+    """
+    Compute the top-k related posts for every blog
+
+    Only posts sharing a tag or a journey are scored, found through inverted
+    indexes rather than comparing every pair. Tags and journeys on more than
+    RELATED_MAX_TAG_SHARE of the posts (and more than RELATED_CANDIDATES posts)
+    only offer the RELATED_CANDIDATES posts nearest in time, so a tag on almost
+    every post does not make this all-pairs.
+
+    Args:
+        blogs (list): Blog items with CANDIDATE_FIELDS
+        k (int): Number of related posts to keep per blog
+
+    Returns:
+        dict: blog id -> list of {'id', 'title', 'score'}, best first
+    """
+    vectors = build_vectors(blogs)
+    by_id = {blog['id']: blog for blog in blogs}
+    groups = defaultdict(list)
+    for blog in sorted(blogs, key=_recency):
+        for tag in _tags(blog):
+            groups[('tag', tag)].append(blog['id'])
+        if blog.get('journey'):
+            groups[('journey', blog['journey'])].append(blog['id'])
+
+    max_group = max(RELATED_CANDIDATES, int(RELATED_MAX_TAG_SHARE * len(blogs)))
+    positions = {
+        key: {blog_id: position for position, blog_id in enumerate(members)}
+        for key, members in groups.items() if len(members) > max_group
+    }
+    if positions:
+        logger.info("Limiting candidates from %d common tags and journeys", len(positions))
+
+    related = {}
+    for blog in blogs:
+        keys = [('tag', tag) for tag in _tags(blog)]
+        if blog.get('journey'):
+            keys.append(('journey', blog['journey']))
+        candidates = set()
+        for key in keys:
+            members = groups[key]
+            if key in positions:
+                members = _nearest(members, positions[key][blog['id']], RELATED_CANDIDATES)
+            candidates.update(members)
+        candidates.discard(blog['id'])
+
+        scored = (
+            (similarity(blog, by_id[candidate], vectors), _recency(by_id[candidate]), candidate)
+            for candidate in candidates
+        )
+        top = heapq.nlargest(k, scored)
+        related[blog['id']] = [_entry(by_id[candidate], score) for score, _, candidate in top if score > 0]
+    return related
+
+
+def load_candidates(include_related=False, table=None):
+    """
+    Read the attributes needed for scoring for every blog, for offline rebuilds
+    """
+    operation, params = blog_service.build_listing_request({})
+    projection, names = build_projection(CANDIDATE_FIELDS + (['related'] if include_related else []))
+    params['ProjectionExpression'] = projection
+    params['ExpressionAttributeNames'] = {**params['ExpressionAttributeNames'], **names}
+    return blog_service.fetch_all(operation, params, table)
+
+
+def load_recent_candidates(journey=None, limit=RELATED_CANDIDATES, table=None):
+    """
+    Read the newest posts, of one journey or of all, with a single index query
+
+    Args:
+        journey (str): Restrict to this journey, or None for every post
+        limit (int): Maximum number of posts read
+
+    Returns:
+        list: Blog items with CANDIDATE_FIELDS and related, newest first
+    """
+    table = table or get_table()
+    projection, names = build_projection(CANDIDATE_FIELDS + ['related'])
+    if journey:
+        index, condition, value = blog_service.JOURNEY_INDEX, 'journey = :value', journey
+    else:
+        index, condition, value = blog_service.CREATED_INDEX, 'entity = :value', blog_service.BLOG_ENTITY
+    response = table.query(
+        IndexName=index,
+        KeyConditionExpression=condition,
+        ExpressionAttributeValues={':value': value},
+        ProjectionExpression=projection,
+        ExpressionAttributeNames=names,
+        ScanIndexForward=False,
+        Limit=limit
+    )
+    return response.get('Items', [])
+
+
+def store_related(blog, related, table=None):
+    """
+    Save the related posts list on a blog item
+
+    The write is conditional on the blog still existing, so a post deleted
+    meanwhile is not recreated as a stub holding only its related list.
+
+    Args:
+        blog (dict): The blog, with at least its id
+        related (list): Entries as returned by compute_related
+
+    Returns:
+        bool: False if the blog no longer exists
+    """
+    table = table or get_table()
+    try:
+        table.update_item(
+            Key={'id': blog['id']},
+            UpdateExpression='SET #related = :related',
+            ConditionExpression='attribute_exists(id)',
+            ExpressionAttributeNames={'#related': 'related'},
+            ExpressionAttributeValues={':related': related}
+        )
+    except ClientError as e:
+        if e.response['Error']['Code'] != 'ConditionalCheckFailedException':
+            raise
+        logger.info("Blog %s no longer exists, related posts not stored", blog['id'])
+        return False
+    return True
+
+
+def update_for_new_blog(blog, k=RELATED_K):
+    """
+    Incrementally add a newly posted blog to the related-posts index
+
+    Stores the new blog's own top-k, and inserts it into the lists of existing
+    posts it now outranks. Only the newest RELATED_CANDIDATES posts overall and
+    in the same journey are considered, and tag frequencies are estimated from
+    the newest posts, so the cost does not grow with the table. The offline job
+    (scripts/build_related.py) rescores every post and should run periodically.
+
+    Args:
+        blog (dict): The blog item as written to DynamoDB
+    """
+    table = get_table()
+    # One more than the window, as the new post itself is usually the newest
+    limit = RELATED_CANDIDATES + 1
+    recent = [candidate for candidate in load_recent_candidates(limit=limit, table=table)
+              if candidate['id'] != blog['id']]
+    blogs = {candidate['id']: candidate for candidate in recent}
+    if blog.get('journey'):
+        for candidate in load_recent_candidates(blog['journey'], limit=limit, table=table):
+            if candidate['id'] != blog['id']:
+                blogs.setdefault(candidate['id'], candidate)
+    blogs = list(blogs.values())
+
+    new_blog = {field: blog[field] for field in CANDIDATE_FIELDS if field in blog}
+    vectors = build_vectors(blogs + [new_blog], sample=recent + [new_blog])
+
+    scored = []
+    for other in blogs:
+        score = similarity(new_blog, other, vectors)
+        if score <= 0:
+            continue
+        scored.append((score, _recency(other), other['id'], other))
+
+        current = [entry for entry in other.get('related') or [] if entry['id'] != blog['id']]
+        if len(current) < k or score > min(float(entry['score']) for entry in current):
+            current.append(_entry(new_blog, score))
+            current.sort(key=lambda entry: entry['score'], reverse=True)
+            store_related(other, current[:k], table)
+
+    top = heapq.nlargest(k, scored, key=lambda row: row[:3])
+    store_related(blog, [_entry(other, score) for score, _, _, other in top], table)
+
+
+def get_related(blog_id):
+    """
+    Return the precomputed related posts of a blog
+
+    Returns:
+        list: Related post summaries, best first, or None if the blog does not exist
+    """
+    if str(blog_id).startswith(META_ID_PREFIX):
+        return None
+
+    table = get_table()
+    projection, names = build_projection(['id', 'related'])
+    response = table.query(
+        KeyConditionExpression='id = :id',
+        ExpressionAttributeValues={':id': str(blog_id)},
+        ProjectionExpression=projection,
+        ExpressionAttributeNames=names
+    )
+    if not response['Items']:
+        return None
+    return response['Items'][0].get('related', [])
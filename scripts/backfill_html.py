@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Render and store the HTML version of every blog body that does not have one yet.
+
+Posts written before render-on-write are rendered on each read with ?format=html
+until this has been run. Use --force to re-render everything, e.g. after changing
+the Markdown extensions or sanitiser settings.
+"""
+
+import argparse
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+# Add project root to Python path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from blog_service import fetch_all
+from utils import body_store
+from utils.dynamodb import get_table, get_item_key, build_projection
+from utils.markdown_render import render_markdown
+
+HTML_FIELDS = ['bodyHtml'] + body_store.storage_fields('bodyHtml')
+
+
+def find_blogs(force=False):
+    """
+    Return the primary keys of blogs whose HTML needs (re-)rendering
+    """
+    table = get_table()
+    projection, names = build_projection([key['AttributeName'] for key in table.key_schema])
+
+    # Filter server side so only keys come back, never the bodies themselves
+    has_body = ' OR '.join(f"attribute_exists({field})" for field in ['body'] + body_store.STORAGE_FIELDS[:2])
+    filter_expression = f"({has_body})"
+    if not force:
+        has_html = ' OR '.join(f"attribute_exists({field})" for field in HTML_FIELDS[:3])
+        filter_expression += f" AND NOT ({has_html})"
+
+    items = fetch_all('scan', {
+        'ProjectionExpression': projection,
+        'ExpressionAttributeNames': names,
+        'FilterExpression': filter_expression
+    }, table)
+    return [get_item_key(table, item) for item in items]
+
+
+def backfill_blog(key, dry_run=False):
+    """
+    Render one blog's body and store the HTML alongside it
+    """
+    table = get_table()
+    blog_id = key['id']
+    projection, names = build_projection(['id', 'body'] + body_store.STORAGE_FIELDS)
+    item = table.get_item(Key=key, ProjectionExpression=projection,
+                          ExpressionAttributeNames=names).get('Item')
+    if not item:
+        return blog_id, 'missing'
+
+    html = render_markdown(body_store.unpack_body(item).get('body', ''))
+    if dry_run:
+        return blog_id, f"would store {len(html)} bytes"
+
+    stored = body_store.pack_body(blog_id, html, attribute='bodyHtml')
+    # Clear whichever representation was used before so only one remains
+    removed = [field for field in HTML_FIELDS if field not in stored]
+    names = {f"#s{i}": field for i, field in enumerate(stored)}
+    names.update({f"#r{i}": field for i, field in enumerate(removed)})
+    expression = 'SET ' + ', '.join(f"#s{i} = :s{i}" for i in range(len(stored)))
+    if removed:
+        expression += ' REMOVE ' + ', '.join(f"#r{i}" for i in range(len(removed)))
+
+    table.update_item(
+        Key=key,
+        UpdateExpression=expression,
+        ExpressionAttributeNames=names,
+        ExpressionAttributeValues={f":s{i}": value for i, value in enumerate(stored.values())},
+        ConditionExpression='attribute_exists(id)'
+    )
+    return blog_id, f"stored {len(html)} bytes"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--force', action='store_true', help='Re-render blogs that already have HTML')
+    parser.add_argument('--workers', type=int, default=8, help='Number of blogs rendered in parallel')
+    parser.add_argument('--dry-run', action='store_true', help='Render but do not write anything')
+    args = parser.parse_args()
+
+    keys = find_blogs(force=args.force)
+    print(f"Rendering HTML for {len(keys)} blogs")
+
+    with ThreadPoolExecutor(max_workers=args.workers) as executor:
+        for blog_id, outcome in executor.map(lambda key: backfill_blog(key, args.dry_run), keys):
+            print(f"  {blog_id}: {outcome}")
+
+
+if __name__ == "__main__":
+    main()
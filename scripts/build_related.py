@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+Recompute the related posts of every blog from a full scan.
+
+POST /blogs updates related posts incrementally; run this periodically so
+scores reflect current tag frequencies, and after bulk imports.
+"""
+
+import argparse
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+# Add project root to Python path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import related_service
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('-k', type=int, default=related_service.RELATED_K, help='Related posts kept per blog')
+    parser.add_argument('--workers', type=int, default=8, help='Number of parallel item updates')
+    parser.add_argument('--dry-run', action='store_true', help='Compute but do not write anything')
+    args = parser.parse_args()
+
+    blogs = related_service.load_candidates(include_related=True)
+    related = related_service.compute_related(blogs, k=args.k)
+
+    # Only rewrite items whose list actually changed
+    changed = [blog for blog in blogs if blog.get('related', []) != related[blog['id']]]
+    print(f"Computed related posts for {len(blogs)} blogs, {len(changed)} changed")
+
+    if args.dry_run:
+        for blog in changed[:10]:
+            print(f"  {blog['id']}: {[entry['id'] for entry in related[blog['id']]]}")
+        return
+
+    with ThreadPoolExecutor(max_workers=args.workers) as executor:
+        stored = list(executor.map(lambda blog: related_service.store_related(blog, related[blog['id']]), changed))
+    print(f"Done, {stored.count(False)} blogs deleted meanwhile were skipped")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,57 +1,431 @@
 #!/usr/bin/env python3
 """
-Helper script to inspect the DynamoDB table schema
+Inspect the blogs table: schema, item sizes and the read cost of each route.
+
+A sample of the table is read with a parallel scan of randomly chosen segments
+(--sample 0.1 reads about 10% of the table, so the profile costs about 10% of a
+full scan). From it the script reports the item-size distribution, the share of
+bytes taken by each attribute, journey skew, the size of every GSI, and an
+estimate of the read capacity units consumed by each blog_service route.
+
+    python scripts/inspect_table.py --sample 0.05 --json profile-$(date +%F).json
+
+Sizes follow the DynamoDB item size rules; RCUs assume eventually consistent
+reads (0.5 RCU per 4 KB) and are estimates, not measurements.
 """
 
-import boto3
-import os
+import argparse
 import json
-from pprint import pprint
+import math
+import os
+import random
+import sys
+import time
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+
+# Add project root to Python path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import blog_service
+import latest_service
+import stats_service
+from utils.dynamodb import get_dynamodb_client, META_ID_PREFIX, META_ENTITY
+from utils.timestamps import to_month
 
 # Set the table name to inspect
 table_name = os.environ.get('DYNAMODB_TABLE_NAME', 'bloggs')
 
-def describe_table():
+READ_UNIT = 4096
+# Extra bytes DynamoDB stores per item in each index it is projected into
+INDEX_ITEM_OVERHEAD = 100
+SIZE_BUCKETS = [1024, 4096, 16384, 65536, 409600]
+
+
+def value_size(value):
+    """
+    Billed size in bytes of a low-level (typed) attribute value
+    """
+    (type_name, data), = value.items()
+    if type_name == 'S':
+        return len(data.encode('utf-8'))
+    if type_name == 'N':
+        digits = Decimal(data).normalize().as_tuple().digits
+        return (len(digits) + 1) // 2 + 1
+    if type_name == 'B':
+        return len(data)
+    if type_name in ('BOOL', 'NULL'):
+        return 1
+    if type_name == 'SS':
+        return sum(len(member.encode('utf-8')) for member in data)
+    if type_name == 'NS':
+        return sum(value_size({'N': member}) for member in data)
+    if type_name == 'BS':
+        return sum(len(member) for member in data)
+    if type_name == 'L':
+        return 3 + sum(value_size(member) + 1 for member in data)
+    if type_name == 'M':
+        return 3 + sum(len(name.encode('utf-8')) + value_size(member) + 1 for name, member in data.items())
+    raise ValueError(f"Unknown attribute type {type_name}")
+
+
+def attribute_sizes(item):
+    """
+    Billed size of each attribute of a low-level item, name included
+    """
+    return {name: len(name.encode('utf-8')) + value_size(value) for name, value in item.items()}
+
+
+def read_units(size_bytes):
+    return math.ceil(max(size_bytes, 1) / READ_UNIT) * 0.5
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * pct / 100))]
+
+
+def describe(client):
+    """
+    Key schema, GSIs and the (roughly 6-hourly) item count and size from DescribeTable
+    """
+    table = client.describe_table(TableName=table_name)['Table']
+    return {
+        'key_schema': {key['AttributeName']: key['KeyType'] for key in table.get('KeySchema', [])},
+        'attributes': {attr['AttributeName']: attr['AttributeType'] for attr in table.get('AttributeDefinitions', [])},
+        'item_count': table.get('ItemCount', 0),
+        'size_bytes': table.get('TableSizeBytes', 0),
+        'indexes': [
+            {
+                'name': index['IndexName'],
+                'key_schema': {key['AttributeName']: key['KeyType'] for key in index['KeySchema']},
+                'projection': index['Projection'].get('ProjectionType', 'ALL'),
+                'non_key_attributes': index['Projection'].get('NonKeyAttributes', []),
+                'item_count': index.get('ItemCount', 0),
+                'size_bytes': index.get('IndexSizeBytes', 0),
+            }
+            for index in table.get('GlobalSecondaryIndexes', [])
+        ],
+    }
+
+
+def scan_segment(client, segment, total_segments, max_items=None):
+    """
+    Read one scan segment with the low-level client so attribute types are kept
+
+    Returns:
+        tuple: (items, consumed read capacity units, whether the segment was read to the end)
+    """
+    params = {
+        'TableName': table_name,
+        'Segment': segment,
+        'TotalSegments': total_segments,
+        'ReturnConsumedCapacity': 'TOTAL',
+    }
+    items, consumed = [], 0.0
+    while True:
+        response = client.scan(**params)
+        items.extend(response.get('Items', []))
+        consumed += response.get('ConsumedCapacity', {}).get('CapacityUnits', 0) or 0
+        if 'LastEvaluatedKey' not in response:
+            return items, consumed, True
+        if max_items and len(items) >= max_items:
+            return items, consumed, False
+        params['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+
+def sample_table(client, sample, workers, seed=None, max_items=None, table_items=0):
+    """
+    Scan a random subset of segments in parallel
+
+    The table is split into workers / sample segments and `workers` of them are
+    read, so about `sample` of the items are returned.
+
+    Segments cut short by max_items only count for the share of their items
+    that was read, judged against the mean of the segments read in full or,
+    when none were, against table_items (DescribeTable ItemCount). The
+    resulting fraction is what figures are extrapolated by.
+    """
+    total_segments = max(workers, min(1000000, round(workers / sample)))
+    segments = random.Random(seed).sample(range(total_segments), workers)
+    per_segment = math.ceil(max_items / workers) if max_items else None
+
+    client_per_worker = [client] + [get_dynamodb_client() for _ in range(workers - 1)]
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        results = list(executor.map(
+            lambda args: scan_segment(args[0], args[1], total_segments, per_segment),
+            zip(client_per_worker, segments)
+        ))
+
+    complete = [len(segment_items) for segment_items, _, finished in results if finished]
+    truncated = [len(segment_items) for segment_items, _, finished in results if not finished]
+    expected = sum(complete) / len(complete) if complete else table_items / total_segments
+    if truncated and not expected:
+        raise ValueError("Every segment was cut short by max_items and the table item count is unknown; "
+                         "rerun without max_items")
+    segments_covered = len(complete) + sum(min(1.0, count / expected) for count in truncated)
+
+    items = [item for segment_items, _, _ in results for item in segment_items]
+    return items, {
+        'segments_read': workers,
+        'segments_truncated': len(truncated),
+        'total_segments': total_segments,
+        'fraction': segments_covered / total_segments,
+        'items': len(items),
+        'consumed_rcu': round(sum(consumed for _, consumed, _ in results), 2),
+        'elapsed_s': round(time.perf_counter() - started, 3),
+    }
+
+
+def _plain(value):
+    (type_name, data), = value.items()
+    return data if type_name in ('S', 'N') else None
+
+
+def _is_meta(item):
+    if 'entity' in item and _plain(item['entity']) == META_ENTITY:
+        return True
+    return 'id' in item and str(_plain(item['id'])).startswith(META_ID_PREFIX)
+
+
+def size_distribution(sizes):
+    sizes = sorted(sizes)
+    buckets = {}
+    lower = 0
+    for upper in SIZE_BUCKETS:
+        buckets[f"{lower}-{upper}"] = sum(1 for size in sizes if lower <= size < upper)
+        lower = upper
+    return {
+        'count': len(sizes),
+        'mean': round(sum(sizes) / len(sizes), 1) if sizes else 0,
+        'min': sizes[0] if sizes else 0,
+        'p50': percentile(sizes, 50),
+        'p90': percentile(sizes, 90),
+        'p99': percentile(sizes, 99),
+        'max': sizes[-1] if sizes else 0,
+        'buckets': buckets,
+    }
+
+
+def attribute_share(per_item_sizes):
+    """
+    Bytes taken by each attribute across the sample, largest first
+    """
+    totals = defaultdict(int)
+    present = Counter()
+    for sizes in per_item_sizes:
+        for name, size in sizes.items():
+            totals[name] += size
+            present[name] += 1
+    grand_total = sum(totals.values()) or 1
+    return {
+        name: {
+            'bytes_share': round(total / grand_total, 4),
+            'mean_bytes': round(total / present[name], 1),
+            'present': round(present[name] / len(per_item_sizes), 4),
+        }
+        for name, total in sorted(totals.items(), key=lambda pair: pair[1], reverse=True)
+    }
+
+
+def journey_skew(blogs, fraction):
+    counts = Counter(_plain(item['journey']) for item in blogs if 'journey' in item)
+    if not counts:
+        return {'journeys': {}, 'top_share': 0, 'max_to_mean': 0}
+    total = sum(counts.values())
+    mean = total / len(counts)
+    return {
+        # Scaled from the sample to the whole table
+        'journeys': {journey: round(count / fraction) for journey, count in counts.most_common()},
+        'top_share': round(counts.most_common(1)[0][1] / total, 4),
+        'max_to_mean': round(counts.most_common(1)[0][1] / mean, 2),
+    }
+
+
+def index_profile(index, items, per_item_sizes, key_names, fraction):
+    """
+    Estimate how many items an index holds and what each costs to store and read
+    """
+    index_keys = list(index['key_schema'])
+    projected = []
+    for item, sizes in zip(items, per_item_sizes):
+        # GSIs are sparse: items missing any index key attribute are left out
+        if not all(name in item for name in index_keys):
+            continue
+        if index['projection'] == 'ALL':
+            size = sum(sizes.values())
+        else:
+            names = set(index_keys) | set(key_names)
+            if index['projection'] == 'INCLUDE':
+                names |= set(index['non_key_attributes'])
+            size = sum(size for name, size in sizes.items() if name in names)
+        projected.append(size + INDEX_ITEM_OVERHEAD)
+
+    base_bytes = sum(sum(sizes.values()) for sizes in per_item_sizes) or 1
+    return {
+        'projection': index['projection'],
+        'items_share': round(len(projected) / len(items), 4) if items else 0,
+        'estimated_items': round(len(projected) / fraction),
+        'mean_item_bytes': round(sum(projected) / len(projected), 1) if projected else 0,
+        'estimated_bytes': round(sum(projected) / fraction),
+        'bytes_vs_base': round(sum(projected) / base_bytes, 4),
+    }
+
+
+def route_costs(blogs, blog_sizes, fraction, skew, meta_sizes):
+    """
+    Estimated RCUs consumed by each blog_service route
+
+    Reads are charged on the whole item even when a projection is used, and
+    queries/scans are charged on the summed size of the items read.
+    """
+    sizes = sorted(blog_sizes)
+    mean = sum(sizes) / len(sizes) if sizes else 0
+    estimated_blogs = len(blogs) / fraction
+    journeys = skew['journeys']
+    journey_mean = sum(journeys.values()) / len(journeys) if journeys else 0
+    journey_max = max(journeys.values()) if journeys else 0
+    months = {_month(item) for item in blogs if 'createdAt' in item}
+    per_month = estimated_blogs / len(months) if months else 0
+
+    def bulk(count):
+        return round(math.ceil(count * mean / READ_UNIT) * 0.5, 1)
+
+    return {
+        'get_blog_by_id': {'p50': read_units(percentile(sizes, 50)), 'p99': read_units(percentile(sizes, 99))},
+        'filter_blogs (no filters, scan)': bulk(estimated_blogs),
+        'filter_blogs (journey, mean)': bulk(journey_mean),
+        'filter_blogs (journey, hottest)': bulk(journey_max),
+        'filter_blogs (one month)': bulk(per_month),
+        'get_changes (per 100 changes)': bulk(100),
+        'get_latest (stored item)': read_units(meta_sizes.get(latest_service.LATEST_ITEM, 0)),
+        'get_stats': read_units(meta_sizes.get(stats_service.STATS_ITEM, 0)),
+    }
+
+
+def _month(item):
+    created_at = item['createdAt']
+    return to_month(created_at['S'] if 'S' in created_at else Decimal(created_at['N']))
+
+
+def meta_item_sizes(client, key_schema):
+    """
+    Sizes of the bookkeeping items, read directly so they are never missed by sampling
+    """
+    sizes = {}
+    for name in (stats_service.STATS_ITEM, latest_service.LATEST_ITEM):
+        key = {
+            attribute: {'S': f"{META_ID_PREFIX}{name}"} if key_type == 'HASH' else {'N': '0'}
+            for attribute, key_type in key_schema.items()
+        }
+        item = client.get_item(TableName=table_name, Key=key).get('Item')
+        if item:
+            sizes[name] = sum(attribute_sizes(item).values())
+    return sizes
+
+
+def profile(sample=0.1, workers=8, seed=None, max_items=None):
     """
-    Retrieve and print the DynamoDB table schema
+    Build the full profile of the table as a JSON-serialisable dict
     """
+    client = get_dynamodb_client()
+    description = describe(client)
+    items, sampling = sample_table(client, sample, workers, seed, max_items, description['item_count'])
+    fraction = sampling['fraction']
+
+    blogs = [item for item in items if not _is_meta(item)]
+    per_item_sizes = [attribute_sizes(item) for item in blogs]
+    blog_sizes = [sum(sizes.values()) for sizes in per_item_sizes]
+    skew = journey_skew(blogs, fraction)
+    listing_fields = set(blog_service.LISTING_FIELDS)
+    listing_bytes = sum(size for sizes in per_item_sizes for name, size in sizes.items() if name in listing_fields)
+
+    return {
+        'table': table_name,
+        'generated_at': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+        'schema': description,
+        'sampling': sampling,
+        'estimated_blogs': round(len(blogs) / fraction),
+        'item_size': size_distribution(blog_sizes),
+        'attributes': attribute_share(per_item_sizes),
+        # Bytes a listing returns vs bytes it is charged for
+        'listing_bytes_share': round(listing_bytes / (sum(blog_sizes) or 1), 4),
+        'entities': dict(Counter(_plain(item['entity']) if 'entity' in item else None for item in items)),
+        'journey_skew': skew,
+        'indexes': {
+            index['name']: index_profile(index, blogs, per_item_sizes, description['key_schema'], fraction)
+            for index in description['indexes']
+        },
+        'estimated_rcu': route_costs(blogs, blog_sizes, fraction, skew,
+                                     meta_item_sizes(client, description['key_schema'])),
+    }
+
+
+def print_summary(report):
+    schema = report['schema']
+    print(f"\n=== Table {report['table']} ===")
+    print(f"Key schema: {schema['key_schema']}")
+    for index in schema['indexes']:
+        print(f"GSI {index['name']}: {index['key_schema']} ({index['projection']})")
+
+    sampling = report['sampling']
+    print(f"\nSampled {sampling['items']} items from {sampling['segments_read']}/{sampling['total_segments']} "
+          f"segments ({sampling['fraction']:.2%}) in {sampling['elapsed_s']}s, {sampling['consumed_rcu']} RCU")
+    if sampling['segments_truncated']:
+        print(f"{sampling['segments_truncated']} segments were cut short by --max-items; "
+              f"estimates are scaled by the share actually read")
+    print(f"Estimated blogs: {report['estimated_blogs']}")
+
+    sizes = report['item_size']
+    print(f"\nItem size (bytes): mean {sizes['mean']}  p50 {sizes['p50']}  p90 {sizes['p90']}  "
+          f"p99 {sizes['p99']}  max {sizes['max']}")
+    for bucket, count in sizes['buckets'].items():
+        print(f"  {bucket:>14}: {count}")
+
+    print(f"\n{'attribute':<20}{'bytes %':>10}{'mean B':>10}{'present':>10}")
+    for name, share in report['attributes'].items():
+        print(f"{name:<20}{share['bytes_share']:>10.1%}{share['mean_bytes']:>10}{share['present']:>10.0%}")
+    print(f"Listing attributes are {report['listing_bytes_share']:.1%} of the bytes listings are charged for")
+
+    skew = report['journey_skew']
+    print(f"\nJourneys (top share {skew['top_share']:.1%}, max/mean {skew['max_to_mean']}):")
+    for journey, count in skew['journeys'].items():
+        print(f"  {journey:<20}{count:>8}")
+
+    print(f"\n{'index':<22}{'items %':>10}{'est. items':>12}{'mean B':>10}{'vs base':>10}")
+    for name, index in report['indexes'].items():
+        print(f"{name:<22}{index['items_share']:>10.1%}{index['estimated_items']:>12}"
+              f"{index['mean_item_bytes']:>10}{index['bytes_vs_base']:>10.1%}")
+
+    print("\nEstimated RCU per call:")
+    for route, cost in report['estimated_rcu'].items():
+        print(f"  {route:<36}{cost}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sample', type=float, default=0.1, help='Fraction of the table to read (0-1]')
+    parser.add_argument('--workers', type=int, default=8, help='Segments scanned in parallel')
+    parser.add_argument('--max-items', type=int, help='Stop after roughly this many sampled items')
+    parser.add_argument('--seed', type=int, help='Seed for choosing segments, for repeatable samples')
+    parser.add_argument('--json', help='Also write the profile to this file as JSON')
+    args = parser.parse_args()
+
+    if not 0 < args.sample <= 1:
+        parser.error('--sample must be in (0, 1]')
+
     try:
-        # Create DynamoDB client
-        dynamodb = boto3.client('dynamodb')
-        
-        # Call describe_table API
-        response = dynamodb.describe_table(TableName=table_name)
-        
-        # Print table details
-        print(f"\n=== Table Schema for {table_name} ===")
-        
-        # Key schema (primary key)
-        print("\nKey Schema:")
-        for key in response['Table'].get('KeySchema', []):
-            key_type = 'Partition Key' if key['KeyType'] == 'HASH' else 'Sort Key'
-            print(f"  {key['AttributeName']} ({key_type})")
-        
-        # Attribute definitions
-        print("\nAttribute Definitions:")
-        for attr in response['Table'].get('AttributeDefinitions', []):
-            attr_type = {
-                'S': 'String',
-                'N': 'Number',
-                'B': 'Binary'
-            }.get(attr['AttributeType'], attr['AttributeType'])
-            print(f"  {attr['AttributeName']}: {attr_type}")
-        
-        # GSIs
-        if 'GlobalSecondaryIndexes' in response['Table']:
-            print("\nGlobal Secondary Indexes:")
-            for gsi in response['Table']['GlobalSecondaryIndexes']:
-                print(f"  {gsi['IndexName']}:")
-                for key in gsi.get('KeySchema', []):
-                    key_type = 'Partition Key' if key['KeyType'] == 'HASH' else 'Sort Key'
-                    print(f"    {key['AttributeName']} ({key_type})")
-        
-    except Exception as e:
-        print(f"Error: {str(e)}")
+        report = profile(args.sample, args.workers, args.seed, args.max_items)
+    except ValueError as e:
+        parser.error(str(e))
+    print_summary(report)
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=2)
+
 
 if __name__ == "__main__":
-    describe_table()
+    main()
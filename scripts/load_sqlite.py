@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Build the read-only SQLite copy of the blogs table used offline.
+
+Serve it with STORAGE_BACKEND=sqlite SQLITE_PATH=<db> for local development
+and load tests without AWS. The copy can be built from a JSONL export (plain
+items or a DynamoDB export to S3), straight from the live table, or from
+synthetic posts.
+
+Examples:
+
+    python scripts/load_sqlite.py blogs.db --jsonl export.jsonl
+    python scripts/load_sqlite.py blogs.db --from-table
+    python scripts/load_sqlite.py blogs.db --synthetic 10000
+"""
+
+import argparse
+import os
+import sys
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+# Add project root to Python path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(SCRIPTS_DIR, '..')))
+sys.path.insert(0, SCRIPTS_DIR)
+
+import sqlite_backend
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('db', help='SQLite file to create or extend')
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument('--jsonl', help='JSONL export of the blogs table')
+    source.add_argument('--from-table', action='store_true', help='Scan the DynamoDB table')
+    source.add_argument('--synthetic', type=int, metavar='POSTS', help='Generate this many synthetic posts')
+    parser.add_argument('--seed', type=int, default=0, help='Seed for --synthetic')
+    args = parser.parse_args()
+
+    if args.jsonl:
+        count = sqlite_backend.load_jsonl(args.jsonl, args.db)
+    elif args.from_table:
+        import blog_service
+        count = sqlite_backend.load_items(blog_service.fetch_all('scan', {}), args.db)
+    else:
+        from synthetic_data import generate_posts
+        count = sqlite_backend.load_items(generate_posts(args.synthetic, seed=args.seed), args.db)
+
+    print(f"Loaded {count} blogs into {args.db}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,334 @@
+#!/usr/bin/env python3
+"""
+Load generator that replays a traffic mix against the Lambda handler in-process.
+
+Requests are either synthetic (weighted routes with Zipf-skewed blog popularity)
+or replayed from a JSONL file of recorded API Gateway events. They are spread over
+a thread or process pool, and a fraction of them can be run as simulated cold starts
+by reloading the application modules first.
+
+Examples:
+
+    # Against an in-process moto table seeded with 10k synthetic posts
+    python scripts/load_test.py --moto 10000 --requests 5000 --workers 8
+
+    # Replay recorded events against the real table, 5% cold starts
+    python scripts/load_test.py --replay events.jsonl --cold-ratio 0.05
+
+    # Against the offline SQLite copy built by scripts/load_sqlite.py
+    python scripts/load_test.py --sqlite blogs.db --requests 5000 --workers 8
+"""
+
+import argparse
+import importlib
+import json
+import os
+import random
+import sys
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, SCRIPTS_DIR)
+
+# Keep per-request INFO logs out of the report unless asked for
+os.environ.setdefault('LOG_LEVEL', 'WARNING')
+os.environ.setdefault('LOG_DEBUG_SAMPLE_RATE', '0')
+
+from test_lambda import create_api_event
+from synthetic_data import JOURNEYS, generate_posts, create_blogs_table, seed_table
+
+# Modules reloaded (in dependency order) to simulate a fresh container.
+# utils.dynamodb and utils.s3 are reset with reset_clients() instead, see reload_app
+APP_MODULES = [
+    'utils.logger',
+    'utils.response',
+    'utils.events',
+    'utils.timestamps',
+    'utils.singleflight',
+    'utils.body_store',
+    'utils.markdown_render',
+    'utils.auth',
+    'utils.profiling',
+    'stats_service',
+    'blog_service',
+    'sqlite_backend',
+    'async_blog_service',
+    'image_service',
+    'feed_service',
+    'latest_service',
+    'related_service',
+    'warmup',
+    'lambda_function',
+]
+
+# Relative weight of each synthetic route in the traffic mix
+DEFAULT_MIX = {
+    'get_blog': 60,
+    'list_all': 10,
+    'list_journey': 15,
+    'list_date_range': 8,
+    'list_journey_date_range': 5,
+    'get_image': 2,
+}
+
+_reload_lock = threading.Lock()
+_moto_mock = None
+
+
+class TrafficGenerator:
+    """
+    Produces API Gateway events according to a weighted route mix
+    """
+    def __init__(self, blog_ids, mix=None, zipf_s=1.1, seed=0):
+        self.rng = random.Random(seed)
+        self.routes = list((mix or DEFAULT_MIX).keys())
+        self.route_weights = list((mix or DEFAULT_MIX).values())
+        self.blog_ids = list(blog_ids)
+        self.rng.shuffle(self.blog_ids)
+        # Zipf popularity: the blog at rank r is requested in proportion to 1 / r^s
+        cumulative, total = [], 0.0
+        for rank in range(1, len(self.blog_ids) + 1):
+            total += 1.0 / rank ** zipf_s
+            cumulative.append(total)
+        self.id_cum_weights = cumulative
+
+    def _date_range(self):
+        year = self.rng.choice([2022, 2023, 2024])
+        month = self.rng.randint(1, 10)
+        return {'start': f"{year}-{month:02d}-01", 'end': f"{year}-{month + 2:02d}-28"}
+
+    def next_event(self):
+        route = self.rng.choices(self.routes, weights=self.route_weights)[0]
+
+        if route == 'get_blog' and self.blog_ids:
+            blog_id = self.rng.choices(self.blog_ids, cum_weights=self.id_cum_weights)[0]
+            event = create_api_event(f"/blogs/{blog_id}", path_params={'id': blog_id})
+        elif route == 'list_journey':
+            event = create_api_event('/blogs', query_params={'journey': self.rng.choice(JOURNEYS)})
+        elif route == 'list_date_range':
+            event = create_api_event('/blogs', query_params=self._date_range())
+        elif route == 'list_journey_date_range':
+            query = {'journey': self.rng.choice(JOURNEYS), **self._date_range()}
+            event = create_api_event('/blogs', query_params=query)
+        elif route == 'get_image':
+            filename = f"image-{self.rng.randint(0, 100)}.png"
+            event = create_api_event(f"/images/{filename}", path_params={'filename': filename})
+        else:
+            route = 'list_all'
+            event = create_api_event('/blogs')
+        return route, event
+
+
+def load_recorded_events(path):
+    """
+    Read recorded API Gateway events (one JSON object per line)
+    """
+    with open(path) as f:
+        events = [json.loads(line) for line in f if line.strip()]
+    return [(f"{e.get('httpMethod')} {e.get('resource') or e.get('path')}", e) for e in events]
+
+
+def setup_moto(post_count, seed):
+    """
+    Start an in-process moto DynamoDB and seed it with synthetic posts
+
+    Returns:
+        list: IDs of the seeded posts
+    """
+    global _moto_mock
+    import boto3
+    from moto import mock_dynamodb
+
+    for var in ('AWS_ACCESS_KEY_ID', 'AWS_SECRET_ACCESS_KEY', 'AWS_SESSION_TOKEN'):
+        os.environ[var] = 'testing'
+    os.environ.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
+
+    _moto_mock = mock_dynamodb()
+    _moto_mock.start()
+
+    dynamodb = boto3.resource('dynamodb')
+    table = create_blogs_table(dynamodb, os.environ['DYNAMODB_TABLE_NAME'])
+    posts = generate_posts(post_count, seed=seed)
+    seed_table(table, posts)
+    return [post['id'] for post in posts]
+
+
+def reload_app():
+    """
+    Re-import the application modules as a fresh container would
+
+    Returns:
+        float: Time taken to reload, in milliseconds
+    """
+    started = time.perf_counter()
+    with _reload_lock:
+        # Client creation is the main cold-start cost; resetting rather than
+        # reloading keeps every thread's cached client invalidated
+        sys.modules['utils.dynamodb'].reset_clients()
+        sys.modules['utils.s3'].reset_clients()
+        for name in APP_MODULES:
+            if name in sys.modules:
+                importlib.reload(sys.modules[name])
+            else:
+                importlib.import_module(name)
+    return (time.perf_counter() - started) * 1000
+
+
+def invoke(route, event, cold):
+    """
+    Invoke the handler once, optionally as a simulated cold start
+
+    Returns:
+        tuple: (route, cold, status code, latency in ms)
+    """
+    started = time.perf_counter()
+    if cold:
+        reload_app()
+    try:
+        handler = sys.modules['lambda_function'].lambda_handler
+        status = handler(event, {}).get('statusCode')
+    except Exception:
+        status = 'error'
+    return route, cold, status, (time.perf_counter() - started) * 1000
+
+
+def _init_process_worker(moto_posts, seed):
+    """
+    Initialiser for process pool workers, each with its own warm modules
+    """
+    if moto_posts:
+        setup_moto(moto_posts, seed)
+    importlib.import_module('lambda_function')
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def summarise(label, latencies, errors, elapsed=None):
+    latencies = sorted(latencies)
+    summary = {
+        'label': label,
+        'requests': len(latencies),
+        'errors': errors,
+        'p50_ms': round(percentile(latencies, 50), 2),
+        'p95_ms': round(percentile(latencies, 95), 2),
+        'p99_ms': round(percentile(latencies, 99), 2),
+        'max_ms': round(latencies[-1], 2) if latencies else 0.0,
+    }
+    if elapsed:
+        summary['throughput_rps'] = round(len(latencies) / elapsed, 2)
+    return summary
+
+
+def run(args):
+    blog_ids = []
+    if args.sqlite:
+        # Set before the app is imported so process workers inherit it too
+        os.environ['STORAGE_BACKEND'] = 'sqlite'
+        os.environ['SQLITE_PATH'] = os.path.abspath(args.sqlite)
+    if args.moto:
+        blog_ids = setup_moto(args.moto, args.seed)
+
+    # Import once in the parent so thread workers start warm
+    importlib.import_module('lambda_function')
+
+    if args.replay:
+        workload = load_recorded_events(args.replay)
+        workload = [workload[i % len(workload)] for i in range(args.requests)]
+    else:
+        if not blog_ids:
+            blog_ids = [blog['id'] for blog in sys.modules['blog_service'].filter_blogs({})]
+        mix = json.loads(args.mix) if args.mix else None
+        generator = TrafficGenerator(blog_ids, mix=mix, zipf_s=args.zipf, seed=args.seed)
+        workload = [generator.next_event() for _ in range(args.requests)]
+
+    rng = random.Random(args.seed)
+    cold_flags = [rng.random() < args.cold_ratio for _ in workload]
+
+    if args.mode == 'process':
+        executor = ProcessPoolExecutor(
+            max_workers=args.workers,
+            initializer=_init_process_worker,
+            initargs=(args.moto, args.seed)
+        )
+    else:
+        executor = ThreadPoolExecutor(max_workers=args.workers)
+
+    started = time.perf_counter()
+    with executor:
+        futures = [
+            executor.submit(invoke, route, event, cold)
+            for (route, event), cold in zip(workload, cold_flags)
+        ]
+        results = [future.result() for future in futures]
+    elapsed = time.perf_counter() - started
+
+    by_label = defaultdict(list)
+    errors = defaultdict(int)
+    for route, cold, status, latency in results:
+        for label in (route, 'cold' if cold else 'warm', 'all'):
+            by_label[label].append(latency)
+            if status == 'error' or (isinstance(status, int) and status >= 500):
+                errors[label] += 1
+
+    report = {
+        'mode': args.mode,
+        'workers': args.workers,
+        'elapsed_s': round(elapsed, 3),
+        'overall': summarise('all', by_label.pop('all'), errors['all'], elapsed),
+        'routes': [summarise(label, values, errors[label]) for label, values in sorted(by_label.items())],
+    }
+    if args.mode == 'thread' and not args.cold_ratio:
+        # Process workers and simulated cold starts start their own counters
+        report['coalescing'] = sys.modules['utils.singleflight'].get_stats()
+    return report
+
+
+def print_report(report):
+    overall = report['overall']
+    print(f"\n=== Load test: {overall['requests']} requests, {report['workers']} {report['mode']} workers ===")
+    print(f"Elapsed: {report['elapsed_s']}s  Throughput: {overall['throughput_rps']} req/s  Errors: {overall['errors']}")
+    print(f"\n{'route':<28}{'count':>8}{'errors':>8}{'p50':>10}{'p95':>10}{'p99':>10}{'max':>10}")
+    for row in [overall] + report['routes']:
+        print(f"{row['label']:<28}{row['requests']:>8}{row['errors']:>8}"
+              f"{row['p50_ms']:>10}{row['p95_ms']:>10}{row['p99_ms']:>10}{row['max_ms']:>10}")
+    for name, counts in report.get('coalescing', {}).items():
+        print(f"\nCoalesced {name}: {counts['deduplicated']} of {counts['calls']} calls shared an in-flight call")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--requests', type=int, default=1000, help='Total number of requests to send')
+    parser.add_argument('--workers', type=int, default=4, help='Size of the worker pool')
+    parser.add_argument('--mode', choices=['thread', 'process'], default='thread')
+    parser.add_argument('--replay', help='JSONL file of recorded API Gateway events to replay')
+    parser.add_argument('--mix', help='JSON object of route weights, e.g. \'{"get_blog": 80, "list_all": 20}\'')
+    parser.add_argument('--zipf', type=float, default=1.1, help='Zipf exponent for blog popularity skew')
+    parser.add_argument('--cold-ratio', type=float, default=0.0,
+                        help='Fraction of requests run as simulated cold starts (module reload)')
+    parser.add_argument('--moto', type=int, default=0, metavar='POSTS',
+                        help='Run against an in-process moto table seeded with this many posts')
+    parser.add_argument('--sqlite', metavar='DB',
+                        help='Read blogs from this SQLite copy instead of DynamoDB (images still use AWS)')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--json', help='Also write the report to this file as JSON')
+    args = parser.parse_args()
+    if args.sqlite and args.moto:
+        parser.error('--sqlite and --moto are alternative backends')
+
+    report = run(args)
+    print_report(report)
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
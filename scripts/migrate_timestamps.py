@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Rewrite every blog so its times are epoch milliseconds and it is indexed.
+
+Older posts store createdAt as epoch seconds or ISO strings, which the
+createdAt-sorted indexes cannot order (items whose createdAt is not a number
+are left out of them entirely). This converts createdAt to milliseconds and
+sets entity = 'blog' and a missing updatedAt, so every post appears in the
+createdAt, journey-createdAt and updatedAt indexes.
+
+The table is read with a parallel scan, one worker per segment. Only
+createdAt, updatedAt and entity are set, with an UpdateItem conditioned on
+the values that were scanned. Concurrent writes to other attributes (e.g. a
+POST updating related posts) are kept. Items whose times changed since the
+scan are skipped and reported; run the script again to migrate them.
+"""
+
+import argparse
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from botocore.exceptions import ClientError
+
+# Add project root to Python path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from blog_service import BLOG_ENTITY
+from utils.dynamodb import get_table, get_item_key, META_ENTITY
+from utils.timestamps import to_ms
+
+
+def migrate_item(item):
+    """
+    Return the migrated copy of a blog item, or None if it needs no change
+    """
+    migrated = dict(item)
+    if item.get('createdAt') is not None:
+        migrated['createdAt'] = to_ms(item['createdAt'])
+    migrated['entity'] = BLOG_ENTITY
+    if migrated.get('updatedAt') is None and migrated.get('createdAt') is not None:
+        migrated['updatedAt'] = migrated['createdAt']
+    elif migrated.get('updatedAt') is not None:
+        migrated['updatedAt'] = to_ms(migrated['updatedAt'])
+
+    # ISO strings never compare equal to the numbers they become
+    unchanged = all(migrated.get(name) == item.get(name) for name in ('createdAt', 'updatedAt', 'entity'))
+    return None if unchanged else migrated
+
+
+def update_item(table, item, migrated):
+    """
+    Write the migrated time attributes, provided they still hold the scanned values
+
+    Returns:
+        bool: False if the item was modified or deleted since it was scanned
+    """
+    names = {'#id': 'id'}
+    values = {}
+    updates = []
+    conditions = ['attribute_exists(#id)']
+    for index, name in enumerate(('createdAt', 'updatedAt', 'entity')):
+        names[f"#a{index}"] = name
+        if migrated.get(name) is not None:
+            updates.append(f"#a{index} = :new{index}")
+            values[f":new{index}"] = migrated[name]
+        if item.get(name) is None:
+            conditions.append(f"attribute_not_exists(#a{index})")
+        else:
+            conditions.append(f"#a{index} = :old{index}")
+            values[f":old{index}"] = item[name]
+
+    try:
+        table.update_item(
+            Key=get_item_key(table, item),
+            UpdateExpression='SET ' + ', '.join(updates),
+            ConditionExpression=' AND '.join(conditions),
+            ExpressionAttributeNames=names,
+            ExpressionAttributeValues=values
+        )
+    except ClientError as e:
+        if e.response['Error']['Code'] != 'ConditionalCheckFailedException':
+            raise
+        return False
+    return True
+
+
+def migrate_segment(segment, total_segments, dry_run=False):
+    """
+    Scan one segment of the table and update the blogs in it that need migrating
+
+    Returns:
+        tuple: (items scanned, items updated, items skipped as concurrently modified)
+    """
+    table = get_table()
+    params = {
+        'Segment': segment,
+        'TotalSegments': total_segments,
+        'FilterExpression': 'attribute_not_exists(entity) OR entity <> :meta',
+        'ExpressionAttributeValues': {':meta': META_ENTITY}
+    }
+    scanned = updated = skipped = 0
+
+    while True:
+        response = table.scan(**params)
+        for item in response.get('Items', []):
+            scanned += 1
+            migrated = migrate_item(item)
+            if migrated is None:
+                continue
+            if dry_run or update_item(table, item, migrated):
+                updated += 1
+            else:
+                skipped += 1
+        if 'LastEvaluatedKey' not in response:
+            break
+        params['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+    return scanned, updated, skipped
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--segments', type=int, default=8, help='Parallel scan segments (one worker each)')
+    parser.add_argument('--dry-run', action='store_true', help='Count items to migrate without writing')
+    args = parser.parse_args()
+
+    with ThreadPoolExecutor(max_workers=args.segments) as executor:
+        results = list(executor.map(
+            lambda segment: migrate_segment(segment, args.segments, args.dry_run),
+            range(args.segments)
+        ))
+
+    scanned, updated, skipped = (sum(column) for column in zip(*results))
+    action = 'Would update' if args.dry_run else 'Updated'
+    print(f"Scanned {scanned} blogs. {action} {updated}")
+    if skipped:
+        print(f"Skipped {skipped} modified since the scan; run again to migrate them")
+
+
+if __name__ == "__main__":
+    main()
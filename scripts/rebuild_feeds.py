@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""
+Regenerate the stored RSS feeds and sitemap from the blog listing.
+
+POST /blogs keeps the documents up to date, and a document it could not update
+is deleted so the next read regenerates it. Run this after importing, deleting
+or editing posts directly in the table, or after changing SITE_URL,
+POST_URL_TEMPLATE or FEED_SIZE. Posts created while it runs may be missing
+from the result; run it again once they have been written.
+"""
+
+import argparse
+import os
+import sys
+
+# Add project root to Python path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import feed_service
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--journey', action='append',
+                        help='Only rebuild the feed of this journey (repeatable); default is every document')
+    args = parser.parse_args()
+
+    if args.journey:
+        journeys = args.journey
+    else:
+        sitemap = feed_service.rebuild_document('sitemap')
+        print(f"sitemap: {len(sitemap)} entries")
+        print(f"feed: {len(feed_service.rebuild_document('feed'))} entries")
+        journeys = sorted({entry['journey'] for entry in sitemap if entry.get('journey')})
+
+    for journey in journeys:
+        entries = feed_service.rebuild_document('feed', journey)
+        print(f"feed ({journey}): {len(entries)} entries")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+"""
+Rebuild the precomputed latest-posts item from the createdAt index.
+
+POST /blogs keeps the item up to date; run this after importing, deleting or
+migrating posts directly in the table, or after changing LATEST_SIZE.
+"""
+
+import argparse
+import os
+import sys
+
+# Add project root to Python path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import latest_service
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--dry-run', action='store_true', help='Print the entries without writing them')
+    args = parser.parse_args()
+
+    if args.dry_run:
+        entries = latest_service.query_latest(latest_service.LATEST_SIZE)
+    else:
+        entries = latest_service.replace_latest()
+        print("Latest item replaced")
+
+    print(f"{len(entries)} entries")
+    for entry in entries:
+        print(f"  {entry.get('createdAt')}  {entry['id']}  {entry.get('title', '')}")
+
+
+if __name__ == "__main__":
+    main()
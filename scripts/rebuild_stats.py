@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+"""
+Recompute the archive aggregates (posts per month / journey) from a full scan.
+
+POST /blogs keeps the aggregates up to date incrementally; run this after
+importing or deleting posts directly in the table, or to correct drift.
+"""
+
+import argparse
+import os
+import sys
+from pprint import pprint
+
+# Add project root to Python path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import stats_service
+from blog_service import build_listing_request, fetch_all
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--dry-run', action='store_true', help='Print the counters without writing them')
+    args = parser.parse_args()
+
+    operation, params = build_listing_request({'fields': 'id,journey,createdAt'})
+    blogs = fetch_all(operation, params)
+    counters = stats_service.compute_stats(blogs)
+
+    print(f"Counted {counters['total']} blogs")
+    pprint(counters)
+    if not args.dry_run:
+        stats_service.replace_stats(counters)
+        print("Stats item replaced")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Helpers for generating synthetic blog posts and seeding a blogs table with them.
+Used by the benchmark suite and the load-test harness.
+"""
+
+import random
+import uuid
+from datetime import datetime, timezone
+
+JOURNEYS = ['europe', 'asia', 'africa', 'south-america', 'north-america', 'oceania', 'antarctica']
+TAGS = ['travel', 'food', 'hiking', 'city', 'beach', 'train', 'camping', 'museum',
+        'wildlife', 'budget', 'photography', 'festival', 'island', 'mountains', 'culture']
+WORDS = ['the', 'road', 'we', 'walked', 'past', 'old', 'market', 'and', 'river', 'morning',
+         'bus', 'coffee', 'rain', 'view', 'hostel', 'ferry', 'night', 'sunset', 'street', 'map']
+
+# Posts are spread evenly between these dates (milliseconds since the epoch)
+START_MS = int(datetime(2022, 1, 1, tzinfo=timezone.utc).timestamp() * 1000)
+END_MS = int(datetime(2025, 1, 1, tzinfo=timezone.utc).timestamp() * 1000)
+
+
+def generate_posts(count, seed=0, body_words=400):
+    """
+    Generate a deterministic list of synthetic blog posts
+
+    Args:
+        count (int): Number of posts to generate
+        seed (int): Random seed so runs are comparable across commits
+        body_words (int): Average number of words in each body
+
+    Returns:
+        list: Blog post items shaped like those written by post_blog
+    """
+    rng = random.Random(seed)
+    posts = []
+    for i in range(count):
+        created_at = rng.randint(START_MS, END_MS)
+        words = rng.randint(body_words // 2, body_words * 2)
+        posts.append({
+            'id': str(uuid.UUID(int=rng.getrandbits(128))),
+            'title': f"Synthetic post {i}",
+            'body': ' '.join(rng.choice(WORDS) for _ in range(words)),
+            'description': f"Summary of synthetic post {i}",
+            'username': f"author-{rng.randint(1, 5)}",
+            'createdAt': created_at,
+            # Skew towards the first journeys so some partitions are hot
+            'journey': JOURNEYS[min(int(rng.expovariate(0.6)), len(JOURNEYS) - 1)],
+            'tags': rng.sample(TAGS, rng.randint(1, 4)),
+            'image': f"image-{i}.png",
+            'entity': 'blog',
+            'updatedAt': created_at,
+        })
+    return posts
+
+
+def create_blogs_table(dynamodb, table_name):
+    """
+    Create a blogs table with the same key schema and indexes as production
+
+    Args:
+        dynamodb: A boto3 DynamoDB resource
+        table_name (str): Name of the table to create
+
+    Returns:
+        The boto3 Table resource
+    """
+    table = dynamodb.create_table(
+        TableName=table_name,
+        KeySchema=[
+            {'AttributeName': 'id', 'KeyType': 'HASH'},
+        ],
+        AttributeDefinitions=[
+            {'AttributeName': 'id', 'AttributeType': 'S'},
+            {'AttributeName': 'journey', 'AttributeType': 'S'},
+            {'AttributeName': 'entity', 'AttributeType': 'S'},
+            {'AttributeName': 'createdAt', 'AttributeType': 'N'},
+            {'AttributeName': 'updatedAt', 'AttributeType': 'N'},
+        ],
+        GlobalSecondaryIndexes=[
+            {
+                'IndexName': 'journey-createdAt',
+                'KeySchema': [
+                    {'AttributeName': 'journey', 'KeyType': 'HASH'},
+                    {'AttributeName': 'createdAt', 'KeyType': 'RANGE'},
+                ],
+                'Projection': {'ProjectionType': 'ALL'},
+            },
+            {
+                'IndexName': 'createdAt',
+                'KeySchema': [
+                    {'AttributeName': 'entity', 'KeyType': 'HASH'},
+                    {'AttributeName': 'createdAt', 'KeyType': 'RANGE'},
+                ],
+                'Projection': {'ProjectionType': 'ALL'},
+            },
+            {
+                'IndexName': 'updatedAt',
+                'KeySchema': [
+                    {'AttributeName': 'entity', 'KeyType': 'HASH'},
+                    {'AttributeName': 'updatedAt', 'KeyType': 'RANGE'},
+                ],
+                'Projection': {'ProjectionType': 'ALL'},
+            }
+        ],
+        BillingMode='PAY_PER_REQUEST'
+    )
+    return table
+
+
+def seed_table(table, posts):
+    """
+    Write posts to a table using batched writes
+    """
+    with table.batch_writer() as batch:
+        for post in posts:
+            batch.put_item(Item=post)
@@ -13,8 +13,8 @@ from pprint import pprint
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 # Set required environment variables for testing
-os.environ['S3_BUCKET_NAME'] = 'lestes-tech-media-store'
-os.environ['DYNAMODB_TABLE_NAME'] = 'bloggs'
+os.environ.setdefault('S3_BUCKET_NAME', 'lestes-tech-media-store')
+os.environ.setdefault('DYNAMODB_TABLE_NAME', 'bloggs')
 
 # Import the Lambda handler after setting environment variables
 from lambda_function import lambda_handler
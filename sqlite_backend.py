@@ -0,0 +1,236 @@
+import base64
+import json
+import os
+import sqlite3
+import threading
+from decimal import Decimal
+import blog_service
+from utils import body_store
+from utils.dynamodb import META_ID_PREFIX, META_ENTITY
+from utils.logger import get_logger
+from utils.timestamps import to_ms, parse_date_bound
+
+logger = get_logger(__name__)
+
+# Whole items are kept as JSON; the columns exist only to index the filters
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS blogs (
+    id TEXT PRIMARY KEY,
+    journey TEXT,
+    created_at INTEGER NOT NULL,
+    updated_at INTEGER NOT NULL,
+    item TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS blog_tags (
+    tag TEXT NOT NULL,
+    blog_id TEXT NOT NULL REFERENCES blogs (id),
+    PRIMARY KEY (tag, blog_id)
+);
+CREATE INDEX IF NOT EXISTS blogs_journey_created_at ON blogs (journey, created_at);
+CREATE INDEX IF NOT EXISTS blogs_created_at ON blogs (created_at);
+CREATE INDEX IF NOT EXISTS blogs_updated_at ON blogs (updated_at, id);
+"""
+
+
+class SQLiteBackend(blog_service.BlogBackend):
+    """
+    Read-only blogs from a SQLite file built by load_jsonl
+
+    Mirrors the DynamoDB listing semantics (journey, date range and tag filters,
+    newest first) with SQL indexes in place of the GSIs. Connections are opened
+    read-only, one per thread.
+    """
+    name = 'sqlite'
+    read_only = True
+
+    def __init__(self, path):
+        if not os.path.exists(path):
+            raise ValueError(f"SQLite database not found: {path}")
+        self.path = path
+        self._local = threading.local()
+
+    def _connection(self):
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            uri = f"file:{os.path.abspath(self.path)}?mode=ro"
+            connection = self._local.connection = sqlite3.connect(uri, uri=True)
+        return connection
+
+    def _items(self, sql, params, fields):
+        rows = self._connection().execute(sql, params).fetchall()
+        items = []
+        for (document,) in rows:
+            item = json.loads(document)
+            items.append(item if fields is None else {field: item[field] for field in fields if field in item})
+        return items
+
+    def get_blog(self, blog_id, fields):
+        items = self._items('SELECT item FROM blogs WHERE id = ?', (blog_id,), fields)
+        return items[0] if items else None
+
+    def list_blogs(self, filters):
+        conditions = []
+        params = []
+
+        try:
+            if 'start' in filters:
+                conditions.append('created_at >= ?')
+                params.append(parse_date_bound(filters['start']))
+            if 'end' in filters:
+                conditions.append('created_at <= ?')
+                params.append(parse_date_bound(filters['end'], end_of_day=True))
+        except ValueError:
+            raise ValueError("start and end must be ISO dates, e.g. 2024-06-01")
+        if len(params) == 2 and params[0] > params[1]:
+            raise ValueError("start must not be after end")
+
+        if 'journey' in filters:
+            conditions.insert(0, 'journey = ?')
+            params.insert(0, filters['journey'])
+
+        if filters.get('tags'):
+            # A post matches if it has any of the requested tags
+            tags = [tag for tag in filters['tags'].split(',') if tag]
+            placeholders = ', '.join('?' * len(tags))
+            conditions.append(
+                f"EXISTS (SELECT 1 FROM blog_tags WHERE blog_id = blogs.id AND tag IN ({placeholders}))"
+            )
+            params.extend(tags)
+
+        fields = (blog_service.parse_fields(filters['fields'], blog_service.LISTING_FIELDS)
+                  if filters.get('fields') else blog_service.LISTING_FIELDS)
+
+        sql = 'SELECT item FROM blogs'
+        if conditions:
+            sql += ' WHERE ' + ' AND '.join(conditions)
+        sql += ' ORDER BY created_at DESC, id'
+        return self._items(sql, params, fields)
+
+    def list_changes(self, watermark, seen, limit, fields):
+        sql = 'SELECT item FROM blogs WHERE updated_at >= ?'
+        params = [watermark]
+        if seen:
+            # Items at the watermark itself were returned last time
+            placeholders = ', '.join('?' * len(seen))
+            sql += f" AND NOT (updated_at = ? AND id IN ({placeholders}))"
+            params += [watermark] + sorted(seen)
+        sql += ' ORDER BY updated_at, id LIMIT ?'
+        params.append(limit)
+        return self._items(sql, params, fields)
+
+
+def _deserialise(value):
+    """
+    Convert a DynamoDB JSON attribute value (as in table exports) to plain JSON
+    """
+    (kind, data), = value.items()
+    if kind == 'S':
+        return data
+    if kind == 'N':
+        number = Decimal(data)
+        return int(number) if number == number.to_integral_value() else float(number)
+    if kind == 'B':
+        return base64.b64decode(data)
+    if kind in ('SS', 'L'):
+        return [_deserialise(element) if kind == 'L' else element for element in data]
+    if kind == 'NS':
+        return [_deserialise({'N': element}) for element in data]
+    if kind == 'BS':
+        return [base64.b64decode(element) for element in data]
+    if kind == 'M':
+        return {key: _deserialise(element) for key, element in data.items()}
+    if kind == 'BOOL':
+        return data
+    if kind == 'NULL':
+        return None
+    raise ValueError(f"Unknown DynamoDB attribute type: {kind}")
+
+
+def _read_item(line):
+    record = json.loads(line)
+    # DynamoDB export to S3 wraps typed attributes in {"Item": {...}}
+    if 'Item' in record and isinstance(record['Item'], dict):
+        return {key: _deserialise(value) for key, value in record['Item'].items()}
+    return record
+
+
+def _prepare(item):
+    """
+    Normalise an exported blog item into what blog_service returns
+    """
+    if 'bodyGz' in item or 'bodyHtmlGz' in item:
+        body_store.unpack_body(item)
+        body_store.unpack_body(item, 'bodyHtml')
+    for attribute in ('body', 'bodyHtml'):
+        if body_store.storage_fields(attribute)[1] in item:
+            # Bodies offloaded to S3 stay in S3; the offline copy is read-only
+            logger.warning("Blog %s has its %s in S3, left out of the offline copy", item['id'], attribute)
+            for field in body_store.storage_fields(attribute):
+                item.pop(field, None)
+
+    item['createdAt'] = to_ms(item['createdAt'])
+    item['updatedAt'] = to_ms(item.get('updatedAt', item['createdAt']))
+    item['entity'] = blog_service.BLOG_ENTITY
+    return item
+
+
+def load_jsonl(jsonl_path, db_path):
+    """
+    Build (or extend) a SQLite database from a JSONL export of the blogs table
+
+    Lines may be plain blog items or DynamoDB export records ({"Item": ...}).
+    Bookkeeping items are skipped, stored bodies are decompressed and times
+    are normalised to epoch milliseconds.
+
+    Args:
+        jsonl_path (str): The export, one item per line
+        db_path (str): SQLite file to write
+
+    Returns:
+        int: Number of blogs loaded
+    """
+    with open(jsonl_path) as f:
+        items = (_read_item(line) for line in f if line.strip())
+        return load_items(items, db_path)
+
+
+def load_items(items, db_path):
+    """
+    Write blog items into a SQLite database, replacing any with the same ID
+
+    Returns:
+        int: Number of blogs loaded
+    """
+    connection = sqlite3.connect(db_path)
+    count = 0
+    try:
+        with connection:
+            connection.executescript(SCHEMA)
+            for item in items:
+                if str(item.get('id', '')).startswith(META_ID_PREFIX) or item.get('entity') == META_ENTITY:
+                    continue
+                item = _prepare(dict(item))
+                connection.execute('DELETE FROM blog_tags WHERE blog_id = ?', (item['id'],))
+                connection.execute(
+                    'INSERT OR REPLACE INTO blogs (id, journey, created_at, updated_at, item) VALUES (?, ?, ?, ?, ?)',
+                    (item['id'], item.get('journey'), item['createdAt'], item['updatedAt'],
+                     json.dumps(item, default=_json_default))
+                )
+                connection.executemany(
+                    'INSERT OR IGNORE INTO blog_tags (tag, blog_id) VALUES (?, ?)',
+                    [(tag, item['id']) for tag in item.get('tags') or []]
+                )
+                count += 1
+            connection.execute('ANALYZE')
+    finally:
+        connection.close()
+    logger.info("Loaded %d blogs into %s", count, db_path)
+    return count
+
+
+def _json_default(value):
+    if isinstance(value, Decimal):
+        return int(value) if value == value.to_integral_value() else float(value)
+    if isinstance(value, (set, frozenset)):
+        return sorted(value)
+    raise TypeError(f"Cannot store {type(value).__name__} in the offline copy")
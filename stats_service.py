@@ -0,0 +1,101 @@
+from utils.dynamodb import get_table, get_meta_key, META_ENTITY
+from utils.logger import get_logger
+from utils.timestamps import now_ms, to_month
+
+logger = get_logger(__name__)
+
+STATS_ITEM = 'stats'
+
+# Counter attributes are flat so a single UpdateItem ADD can create them
+MONTH_PREFIX = 'month#'
+JOURNEY_PREFIX = 'journey#'
+
+
+def _counter_names(blog):
+    names = ['total']
+    if blog.get('createdAt') is not None:
+        names.append(f"{MONTH_PREFIX}{to_month(blog['createdAt'])}")
+    if blog.get('journey'):
+        names.append(f"{JOURNEY_PREFIX}{blog['journey']}")
+    return names
+
+
+def record_blog(blog, table=None):
+    """
+    Atomically count a new blog in the archive aggregates
+
+    Args:
+        blog (dict): The blog item as written to DynamoDB
+        table: Optional table resource, defaults to the blogs table
+    """
+    table = table or get_table()
+    counters = _counter_names(blog)
+    names = {f"#c{i}": name for i, name in enumerate(counters)}
+    names['#entity'] = 'entity'
+    names['#updatedAt'] = 'updatedAt'
+
+    table.update_item(
+        Key=get_meta_key(STATS_ITEM),
+        UpdateExpression=(
+            'ADD ' + ', '.join(f"#c{i} :one" for i in range(len(counters))) +
+            ' SET #entity = :meta, #updatedAt = :now'
+        ),
+        ExpressionAttributeNames=names,
+        ExpressionAttributeValues={
+            ':one': 1,
+            ':meta': META_ENTITY,
+            ':now': now_ms()
+        }
+    )
+
+
+def compute_stats(blogs):
+    """
+    Count blogs per month and per journey, as stored by record_blog
+
+    Args:
+        blogs (list): Blog items with createdAt and journey attributes
+
+    Returns:
+        dict: Counter attributes keyed by their stored names
+    """
+    counters = {}
+    for blog in blogs:
+        for name in _counter_names(blog):
+            counters[name] = counters.get(name, 0) + 1
+    counters.setdefault('total', 0)
+    return counters
+
+
+def replace_stats(counters, table=None):
+    """
+    Overwrite the aggregate item with freshly computed counters
+    """
+    table = table or get_table()
+    table.put_item(Item={
+        **get_meta_key(STATS_ITEM),
+        **counters,
+        'entity': META_ENTITY,
+        'updatedAt': now_ms()
+    })
+
+
+def get_stats():
+    """
+    Return posts per month and per journey with a single GetItem
+
+    Returns:
+        dict: {'total': n, 'months': {'YYYY-MM': n}, 'journeys': {journey: n}}
+    """
+    table = get_table()
+    item = table.get_item(Key=get_meta_key(STATS_ITEM)).get('Item') or {}
+
+    stats = {'total': item.get('total', 0), 'months': {}, 'journeys': {}}
+    for name, value in item.items():
+        if name.startswith(MONTH_PREFIX):
+            stats['months'][name[len(MONTH_PREFIX):]] = value
+        elif name.startswith(JOURNEY_PREFIX):
+            stats['journeys'][name[len(JOURNEY_PREFIX):]] = value
+    stats['months'] = dict(sorted(stats['months'].items(), reverse=True))
+    stats['journeys'] = dict(sorted(stats['journeys'].items()))
+    return stats
@@ -0,0 +1 @@
+# Empty init file to make benchmarks a proper package
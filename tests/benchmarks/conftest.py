@@ -0,0 +1,70 @@
+"""
+Shared fixtures for the benchmark suite.
+
+Benchmarks are skipped unless BLOGGS_BENCHMARK=1 is set, because seeding the
+mock table with thousands of posts takes a while. Run them with e.g.
+
+    BLOGGS_BENCHMARK=1 BENCHMARK_POSTS=100000 python -m pytest tests/benchmarks \
+        --benchmark-json=bench_output.json
+"""
+
+import os
+import sys
+import tracemalloc
+import pytest
+import boto3
+from moto import mock_dynamodb
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'scripts'))
+
+from synthetic_data import generate_posts, create_blogs_table, seed_table
+
+BENCHMARK_POSTS = int(os.environ.get('BENCHMARK_POSTS', 10000))
+
+
+def pytest_collection_modifyitems(config, items):
+    if os.environ.get('BLOGGS_BENCHMARK') == '1':
+        return
+    skip = pytest.mark.skip(reason="set BLOGGS_BENCHMARK=1 to run benchmarks")
+    for item in items:
+        if 'benchmarks' in item.nodeid:
+            item.add_marker(skip)
+
+
+@pytest.fixture(scope='session')
+def seeded_table():
+    """Create a mock blogs table seeded with BENCHMARK_POSTS synthetic posts."""
+    os.environ['AWS_ACCESS_KEY_ID'] = 'testing'
+    os.environ['AWS_SECRET_ACCESS_KEY'] = 'testing'
+    os.environ['AWS_SECURITY_TOKEN'] = 'testing'
+    os.environ['AWS_SESSION_TOKEN'] = 'testing'
+    os.environ['AWS_DEFAULT_REGION'] = 'us-east-1'
+    os.environ['DYNAMODB_TABLE_NAME'] = 'bench-blogs-table'
+    os.environ.setdefault('S3_BUCKET_NAME', 'bench-blog-images')
+
+    with mock_dynamodb():
+        dynamodb = boto3.resource('dynamodb', region_name='us-east-1')
+        table = create_blogs_table(dynamodb, os.environ['DYNAMODB_TABLE_NAME'])
+        posts = generate_posts(BENCHMARK_POSTS)
+        seed_table(table, posts)
+        yield table, posts
+
+
+@pytest.fixture
+def track_allocations(benchmark):
+    """
+    Run a callable once under tracemalloc and record its peak allocation
+    in the benchmark's extra_info, so it lands in the saved JSON results.
+    """
+    def track(func, *args, **kwargs):
+        tracemalloc.start()
+        try:
+            func(*args, **kwargs)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        benchmark.extra_info['peak_alloc_bytes'] = peak
+        benchmark.extra_info['posts'] = BENCHMARK_POSTS
+    return track
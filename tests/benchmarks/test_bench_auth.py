@@ -0,0 +1,37 @@
+import json
+import time
+import jwt
+import pytest
+from cryptography.hazmat.primitives.asymmetric import rsa
+from jwt.algorithms import RSAAlgorithm
+
+
+@pytest.fixture(scope='module')
+def signed_token():
+    """Create a Cognito-style RS256 token and the JWKS that verifies it."""
+    from utils.auth import CognitoAuth
+
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    jwk = json.loads(RSAAlgorithm.to_jwk(private_key.public_key()))
+    jwk['kid'] = 'bench-key'
+
+    auth = CognitoAuth(user_pool_id='eu-west-2_bench')
+    # Pre-populate the key set so no request is made to Cognito
+    auth._jwks = {'keys': [jwk]}
+
+    token = jwt.encode(
+        {'sub': 'user-123', 'iss': auth.issuer, 'exp': int(time.time()) + 3600},
+        private_key,
+        algorithm='RS256',
+        headers={'kid': 'bench-key'}
+    )
+    return auth, token
+
+def test_verify_token(benchmark, signed_token, track_allocations):
+    """Benchmark CognitoAuth.verify_token with a warm JWKS cache."""
+    auth, token = signed_token
+
+    track_allocations(auth.verify_token, token)
+    payload = benchmark(auth.verify_token, token)
+
+    assert payload['sub'] == 'user-123'
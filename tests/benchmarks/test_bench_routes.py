@@ -0,0 +1,49 @@
+import json
+import pytest
+
+from synthetic_data import JOURNEYS
+
+FILTER_COMBINATIONS = {
+    'no-filters': {},
+    'journey': {'journey': JOURNEYS[0]},
+    'date-range': {'start': '2023-01-01', 'end': '2023-03-31'},
+    'journey-and-date-range': {'journey': JOURNEYS[0], 'start': '2023-01-01', 'end': '2023-03-31'},
+}
+
+
+def make_event(path, path_params=None, query_params=None):
+    return {
+        'httpMethod': 'GET',
+        'path': path,
+        'pathParameters': path_params,
+        'queryStringParameters': query_params,
+        'headers': {'Accept': 'application/json'},
+        'body': None
+    }
+
+def test_get_blog_by_id_route(benchmark, seeded_table, track_allocations):
+    """Benchmark GET /blogs/{id} through the Lambda handler."""
+    table, posts = seeded_table
+    from lambda_function import lambda_handler
+
+    blog_id = posts[len(posts) // 2]['id']
+    event = make_event(f"/blogs/{blog_id}", path_params={'id': blog_id})
+
+    track_allocations(lambda_handler, event, {})
+    response = benchmark(lambda_handler, event, {})
+
+    assert response['statusCode'] == 200
+
+@pytest.mark.parametrize('combination', list(FILTER_COMBINATIONS))
+def test_filter_blogs_route(benchmark, seeded_table, track_allocations, combination):
+    """Benchmark GET /blogs for each supported filter combination."""
+    from lambda_function import lambda_handler
+
+    benchmark.group = 'filter_blogs'
+    event = make_event('/blogs', query_params=dict(FILTER_COMBINATIONS[combination]))
+
+    track_allocations(lambda_handler, event, {})
+    response = benchmark(lambda_handler, event, {})
+
+    assert response['statusCode'] == 200
+    assert isinstance(json.loads(response['body']), list)
@@ -0,0 +1,33 @@
+import json
+from decimal import Decimal
+
+from synthetic_data import generate_posts
+
+
+def as_dynamodb_items(posts):
+    """Mimic boto3 deserialisation, which returns numbers as Decimal."""
+    return [{**post, 'createdAt': Decimal(post['createdAt'])} for post in posts]
+
+def test_format_response_listing(benchmark, track_allocations):
+    """Benchmark serialising a full listing page of summaries."""
+    from utils.response import format_response
+
+    items = as_dynamodb_items(generate_posts(1000, body_words=0))
+    for item in items:
+        del item['body']
+
+    track_allocations(format_response, 200, items)
+    response = benchmark(format_response, 200, items)
+
+    assert len(json.loads(response['body'])) == 1000
+
+def test_format_response_single_blog(benchmark, track_allocations):
+    """Benchmark serialising a single post including a long body."""
+    from utils.response import format_response
+
+    item = as_dynamodb_items(generate_posts(1, body_words=5000))[0]
+
+    track_allocations(format_response, 200, item)
+    response = benchmark(format_response, 200, item)
+
+    assert response['statusCode'] == 200
@@ -0,0 +1,230 @@
+import os
+import sys
+import boto3
+import pytest
+from moto import mock_dynamodb
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from utils import dynamodb, s3
+
+
+@pytest.fixture(autouse=True)
+def reset_aws_clients():
+    """Make sure each test creates its AWS clients inside its own mocks."""
+    dynamodb.reset_clients()
+    s3.reset_clients()
+    yield
+    dynamodb.reset_clients()
+    s3.reset_clients()
+
+@pytest.fixture
+def aws_credentials():
+    """Mocked AWS Credentials for boto3."""
+    os.environ['AWS_ACCESS_KEY_ID'] = 'testing'
+    os.environ['AWS_SECRET_ACCESS_KEY'] = 'testing'
+    os.environ['AWS_SECURITY_TOKEN'] = 'testing'
+    os.environ['AWS_SESSION_TOKEN'] = 'testing'
+    os.environ['AWS_DEFAULT_REGION'] = 'us-east-1'
+    
+@pytest.fixture
+def dynamodb_client(aws_credentials):
+    """Create a mock DynamoDB client."""
+    with mock_dynamodb():
+        yield boto3.client('dynamodb', region_name='us-east-1')
+
+@pytest.fixture
+def dynamodb_resource(aws_credentials):
+    """Create a mock DynamoDB resource."""
+    with mock_dynamodb():
+        yield boto3.resource('dynamodb', region_name='us-east-1')
+        
+@pytest.fixture
+def setup_blogs_table(dynamodb_resource):
+    """Create a mock DynamoDB table and add a test blog post."""
+    # Set up the environment variable for the table name
+    table_name = 'test-blogs-table'
+    os.environ['DYNAMODB_TABLE_NAME'] = table_name
+    
+    # Create the test table
+    table = dynamodb_resource.create_table(
+        TableName=table_name,
+        KeySchema=[
+            {'AttributeName': 'id', 'KeyType': 'HASH'},  # Partition key
+        ],
+        AttributeDefinitions=[
+            {'AttributeName': 'id', 'AttributeType': 'S'},
+            {'AttributeName': 'date', 'AttributeType': 'S'},
+        ],
+        GlobalSecondaryIndexes=[
+            {
+                'IndexName': 'date-index',
+                'KeySchema': [
+                    {'AttributeName': 'date', 'KeyType': 'HASH'},
+                ],
+                'Projection': {'ProjectionType': 'ALL'},
+                'ProvisionedThroughput': {
+                    'ReadCapacityUnits': 5,
+                    'WriteCapacityUnits': 5
+                }
+            }
+        ],
+        ProvisionedThroughput={'ReadCapacityUnits': 5, 'WriteCapacityUnits': 5}
+    )
+    
+    # Add a test blog post
+    test_blog = {
+        'id': '123',
+        'title': 'Test Blog Post',
+        'body': 'This is a test blog post content.',
+        'description': 'This is a test blog post summary.',
+        'username': 'Test Author',
+        'createdAt': 1718463600000,  # 2024-06-15T15:00:00Z
+        'journey': 'test-journey',
+        'tags': ['test', 'blog', 'example'],
+        'image': 'test-image.png'
+    }
+    
+    table.put_item(Item=test_blog)
+    
+    return table_name, test_blog
+
+@pytest.fixture
+def setup_blogs_table_for_filtering(dynamodb_resource):
+    """Create a mock DynamoDB table with multiple blog posts for flexible filtering testing."""
+    # Set up the environment variable for the table name
+    table_name = 'test-blogs-table'
+    os.environ['DYNAMODB_TABLE_NAME'] = table_name
+    
+    # Create the test table with a GSI for journey
+    table = dynamodb_resource.create_table(
+        TableName=table_name,
+        KeySchema=[
+            {'AttributeName': 'id', 'KeyType': 'HASH'},  # Partition key
+        ],
+        AttributeDefinitions=[
+            {'AttributeName': 'id', 'AttributeType': 'S'},
+            {'AttributeName': 'journey', 'AttributeType': 'S'},
+            {'AttributeName': 'entity', 'AttributeType': 'S'},
+            {'AttributeName': 'createdAt', 'AttributeType': 'N'},
+            {'AttributeName': 'updatedAt', 'AttributeType': 'N'},
+        ],
+        GlobalSecondaryIndexes=[
+            {
+                'IndexName': 'journey-createdAt',  # GSI for journey, sorted by creation time
+                'KeySchema': [
+                    {'AttributeName': 'journey', 'KeyType': 'HASH'},
+                    {'AttributeName': 'createdAt', 'KeyType': 'RANGE'},
+                ],
+                'Projection': {'ProjectionType': 'ALL'},
+                'ProvisionedThroughput': {
+                    'ReadCapacityUnits': 5,
+                    'WriteCapacityUnits': 5
+                }
+            },
+            {
+                'IndexName': 'createdAt',  # Sparse GSI of blogs by creation time
+                'KeySchema': [
+                    {'AttributeName': 'entity', 'KeyType': 'HASH'},
+                    {'AttributeName': 'createdAt', 'KeyType': 'RANGE'},
+                ],
+                'Projection': {'ProjectionType': 'ALL'},
+                'ProvisionedThroughput': {
+                    'ReadCapacityUnits': 5,
+                    'WriteCapacityUnits': 5
+                }
+            },
+            {
+                'IndexName': 'updatedAt',  # Sparse GSI of blogs by last modification
+                'KeySchema': [
+                    {'AttributeName': 'entity', 'KeyType': 'HASH'},
+                    {'AttributeName': 'updatedAt', 'KeyType': 'RANGE'},
+                ],
+                'Projection': {'ProjectionType': 'ALL'},
+                'ProvisionedThroughput': {
+                    'ReadCapacityUnits': 5,
+                    'WriteCapacityUnits': 5
+                }
+            }
+        ],
+        ProvisionedThroughput={'ReadCapacityUnits': 5, 'WriteCapacityUnits': 5}
+    )
+    
+    # Add multiple blog posts with different journeys and dates
+    blog_posts = [
+        {
+            'id': '123',
+            'title': 'Blog Post 1',
+            'body': 'Content for blog post 1',
+            'description': 'Summary for blog post 1',
+            'username': 'Test Author',
+            'createdAt': 1715318400000,  # 2024-05-10
+            'journey': 'europe',
+            'tags': ['travel', 'europe'],
+            'image': 'image1.png',
+            'entity': 'blog'
+        },
+        {
+            'id': '124',
+            'title': 'Blog Post 2',
+            'body': 'Content for blog post 2',
+            'description': 'Summary for blog post 2',
+            'username': 'Test Author',
+            'createdAt': 1717396800000,  # 2024-06-03
+            'journey': 'europe',
+            'tags': ['travel', 'food'],
+            'image': 'image2.png',
+            'entity': 'blog'
+        },
+        {
+            'id': '125',
+            'title': 'Blog Post 3',
+            'body': 'Content for blog post 3',
+            'description': 'Summary for blog post 3',
+            'username': 'Another Author',
+            'createdAt': 1720588800000,  # 2024-07-10
+            'journey': 'asia',
+            'tags': ['travel', 'asia'],
+            'image': 'image3.png',
+            'entity': 'blog'
+        },
+        {
+            'id': '126',
+            'title': 'Blog Post 4',
+            'body': 'Content for blog post 4',
+            'description': 'Summary for blog post 4',
+            'username': 'Another Author',
+            'createdAt': 1722576000000,  # 2024-08-02
+            'journey': 'asia',
+            'tags': ['travel', 'food'],
+            'image': 'image4.png',
+            'entity': 'blog'
+        },
+        {
+            'id': '127',
+            'title': 'Blog Post 5',
+            'body': 'Content for blog post 5',
+            'description': 'Summary for blog post 5',
+            'username': 'Third Author',
+            'createdAt': 1723267200000,  # 2024-08-10
+            'journey': 'africa',
+            'tags': ['travel', 'africa'],
+            'image': 'image5.png',
+            'entity': 'blog'
+        }
+    ]
+    
+    for post in blog_posts:
+        table.put_item(Item=post)
+    
+    return table_name, blog_posts
+
+@pytest.fixture
+def dynamodb_calls(dynamodb_resource):
+    """Record the DynamoDB operations the application makes on this thread."""
+    operations = []
+
+    def record(model, **kwargs):
+        operations.append(model.name)
+
+    dynamodb.get_dynamodb_resource().meta.client.meta.events.register('before-call.dynamodb', record)
+    return operations
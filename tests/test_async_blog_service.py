@@ -0,0 +1,104 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+
+def test_expand_filters_splits_journeys_and_months():
+    """Test that every journey/month combination becomes its own sub-query."""
+    import async_blog_service
+
+    expanded = async_blog_service.expand_filters({
+        'journeys': ['europe', 'asia'],
+        'months': ['2024-02', '2024-06'],
+        'tags': 'food'
+    })
+
+    assert len(expanded) == 4
+    assert {'journey': 'asia', 'start': '2024-02-01', 'end': '2024-02-29', 'tags': 'food'} in expanded
+    assert {'journey': 'europe', 'start': '2024-06-01', 'end': '2024-06-30', 'tags': 'food'} in expanded
+
+def test_filter_blogs_multiple_journeys_merged_newest_first(dynamodb_resource, setup_blogs_table_for_filtering):
+    """Test that concurrent per-journey queries are merged by createdAt."""
+    import async_blog_service
+
+    result = async_blog_service.run(async_blog_service.filter_blogs({'journeys': ['europe', 'africa']}))
+
+    assert [post['id'] for post in result] == ['127', '124', '123']
+
+def test_filter_blogs_multiple_months_without_journey(dynamodb_resource, setup_blogs_table_for_filtering):
+    """Test that month ranges without a journey are merged from createdAt index queries."""
+    import async_blog_service
+
+    result = async_blog_service.run(async_blog_service.filter_blogs({'months': ['2024-05', '2024-08']}))
+
+    assert [post['id'] for post in result] == ['127', '126', '123']
+    assert all('body' not in post for post in result)
+
+def test_filter_blogs_deduplicates_repeated_values(dynamodb_resource, setup_blogs_table_for_filtering):
+    """Test that duplicate journeys and months never repeat a post."""
+    import async_blog_service
+
+    result = async_blog_service.run(async_blog_service.filter_blogs({
+        'journeys': ['asia', 'asia'],
+        'months': ['2024-07', '2024-07', '2024-08'],
+        'tags': 'food,asia'
+    }))
+
+    assert [post['id'] for post in result] == ['126', '125']
+
+def test_filter_blogs_sub_queries_go_through_singleflight(dynamodb_resource, setup_blogs_table_for_filtering):
+    """Test that each sub-query is issued through the blog_service singleflight group."""
+    import async_blog_service
+    from utils import singleflight
+
+    group = singleflight.get_group('filter_blogs')
+    calls_before = group.calls
+    async_blog_service.run(async_blog_service.filter_blogs({'journeys': ['europe', 'asia']}))
+
+    assert group.calls - calls_before == 2
+
+def test_filter_blogs_workers_keep_request_context(dynamodb_resource, setup_blogs_table_for_filtering, mocker):
+    """Test that executor threads see the request ID bound by the handler."""
+    import blog_service
+    import async_blog_service
+    from utils import logger as log_utils
+
+    seen = []
+    original = blog_service.filter_blogs
+
+    def recording_filter_blogs(filters):
+        seen.append(log_utils.get_request_id())
+        return original(filters)
+
+    mocker.patch('blog_service.filter_blogs', side_effect=recording_filter_blogs)
+    log_utils.bind_request({'aws_request_id': 'req-async-1'})
+    async_blog_service.run(async_blog_service.filter_blogs({'journeys': ['europe', 'asia']}))
+
+    assert seen == ['req-async-1', 'req-async-1']
+
+def test_run_reuses_event_loop():
+    """Test that warm invocations on the same thread share one event loop."""
+    import asyncio
+    import async_blog_service
+
+    async def current_loop():
+        return asyncio.get_running_loop()
+
+    assert async_blog_service.run(current_loop()) is async_blog_service.run(current_loop())
+
+def test_lambda_handler_fans_out_repeated_journeys(dynamodb_resource, setup_blogs_table_for_filtering):
+    """Test that repeated journey parameters are routed to the async service."""
+    import json
+    os.environ.setdefault('S3_BUCKET_NAME', 'test-blog-images')
+    from lambda_function import lambda_handler
+
+    response = lambda_handler({
+        'httpMethod': 'GET',
+        'path': '/blogs',
+        'queryStringParameters': {'journey': 'asia'},
+        'multiValueQueryStringParameters': {'journey': ['europe', 'asia']},
+    }, {})
+
+    assert response['statusCode'] == 200
+    assert [post['id'] for post in json.loads(response['body'])] == ['126', '125', '124', '123']
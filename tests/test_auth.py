@@ -0,0 +1,53 @@
+import os
+import sys
+import pytest
+import requests
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from utils import auth
+
+
+def _response(mocker, status, body):
+    response = mocker.Mock(status_code=status)
+    response.json.return_value = body
+    if status >= 400:
+        response.raise_for_status.side_effect = requests.HTTPError(f"{status} error")
+    return response
+
+def test_get_jwks_does_not_cache_error_responses(mocker):
+    """Test that a failed fetch is raised and the next call fetches again."""
+    get = mocker.patch('utils.auth.requests.get', side_effect=[
+        _response(mocker, 503, {'message': 'Service unavailable'}),
+        _response(mocker, 200, {'message': 'not a key set'}),
+        _response(mocker, 200, {'keys': [{'kid': 'k1'}]}),
+    ])
+    cognito = auth.CognitoAuth('pool')
+
+    with pytest.raises(requests.HTTPError):
+        cognito.get_jwks()
+    with pytest.raises(ValueError):
+        cognito.get_jwks()
+    assert cognito.get_jwks() == {'keys': [{'kid': 'k1'}]}
+    assert cognito.get_jwks() == {'keys': [{'kid': 'k1'}]}
+    assert get.call_count == 3
+
+def test_verify_token_refetches_jwks_for_unknown_kid(mocker):
+    """Test that a rotated signing key is picked up, at most once per refresh interval."""
+    mocker.patch('utils.auth.jwt.get_unverified_header', return_value={'kid': 'new'})
+    mocker.patch('utils.auth.RSAAlgorithm.from_jwk', side_effect=lambda jwk: 'key')
+    decode = mocker.patch('utils.auth.jwt.decode', return_value={'username': 'author'})
+    get = mocker.patch('utils.auth.requests.get', side_effect=[
+        _response(mocker, 200, {'keys': [{'kid': 'old'}]}),
+        _response(mocker, 200, {'keys': [{'kid': 'old'}, {'kid': 'new'}]}),
+    ])
+    mocker.patch.object(auth, 'JWKS_REFRESH_INTERVAL', 0)
+    cognito = auth.CognitoAuth('pool')
+
+    assert cognito.verify_token('token') == {'username': 'author'}
+    assert get.call_count == 2
+    decode.assert_called_once()
+
+    mocker.patch('utils.auth.jwt.get_unverified_header', return_value={'kid': 'forged'})
+    mocker.patch.object(auth, 'JWKS_REFRESH_INTERVAL', 3600)
+    assert cognito.verify_token('token') is None
+    assert get.call_count == 2
@@ -10,77 +10,6 @@ from datetime import datetime
 
 # We'll import blog_service inside the tests after setting up the environment
 
-@pytest.fixture
-def aws_credentials():
-    """Mocked AWS Credentials for boto3."""
-    os.environ['AWS_ACCESS_KEY_ID'] = 'testing'
-    os.environ['AWS_SECRET_ACCESS_KEY'] = 'testing'
-    os.environ['AWS_SECURITY_TOKEN'] = 'testing'
-    os.environ['AWS_SESSION_TOKEN'] = 'testing'
-    os.environ['AWS_DEFAULT_REGION'] = 'us-east-1'
-    
-@pytest.fixture
-def dynamodb_client(aws_credentials):
-    """Create a mock DynamoDB client."""
-    with mock_dynamodb():
-        yield boto3.client('dynamodb', region_name='us-east-1')
-
-@pytest.fixture
-def dynamodb_resource(aws_credentials):
-    """Create a mock DynamoDB resource."""
-    with mock_dynamodb():
-        yield boto3.resource('dynamodb', region_name='us-east-1')
-        
-@pytest.fixture
-def setup_blogs_table(dynamodb_resource):
-    """Create a mock DynamoDB table and add a test blog post."""
-    # Set up the environment variable for the table name
-    table_name = 'test-blogs-table'
-    os.environ['DYNAMODB_TABLE_NAME'] = table_name
-    
-    # Create the test table
-    table = dynamodb_resource.create_table(
-        TableName=table_name,
-        KeySchema=[
-            {'AttributeName': 'id', 'KeyType': 'HASH'},  # Partition key
-        ],
-        AttributeDefinitions=[
-            {'AttributeName': 'id', 'AttributeType': 'S'},
-            {'AttributeName': 'date', 'AttributeType': 'S'},
-        ],
-        GlobalSecondaryIndexes=[
-            {
-                'IndexName': 'date-index',
-                'KeySchema': [
-                    {'AttributeName': 'date', 'KeyType': 'HASH'},
-                ],
-                'Projection': {'ProjectionType': 'ALL'},
-                'ProvisionedThroughput': {
-                    'ReadCapacityUnits': 5,
-                    'WriteCapacityUnits': 5
-                }
-            }
-        ],
-        ProvisionedThroughput={'ReadCapacityUnits': 5, 'WriteCapacityUnits': 5}
-    )
-    
-    # Add a test blog post
-    test_blog = {
-        'id': '123',
-        'title': 'Test Blog Post',
-        'body': 'This is a test blog post content.',
-        'description': 'This is a test blog post summary.',
-        'username': 'Test Author',
-        'createdAt': '2024-06-15T15:00:00Z',
-        'journey': 'test-journey',
-        'tags': ['test', 'blog', 'example'],
-        'image': 'test-image.png'
-    }
-    
-    table.put_item(Item=test_blog)
-    
-    return table_name, test_blog
-
 def test_get_blog_by_id_success(dynamodb_resource, setup_blogs_table):
     """Test successfully retrieving a blog by ID."""
     table_name, test_blog = setup_blogs_table
@@ -99,12 +28,41 @@ def test_get_blog_by_id_success(dynamodb_resource, setup_blogs_table):
     assert result['body'] == 'This is a test blog post content.'
     assert result['description'] == 'This is a test blog post summary.'
     assert result['username'] == 'Test Author'
-    assert result['createdAt'] == '2024-06-15T15:00:00Z'
+    assert result['createdAt'] == 1718463600000
     assert result['journey'] == 'test-journey'
     assert result['image'] == 'test-image.png'
     assert 'test' in result['tags']
     assert 'blog' in result['tags']
 
+def test_get_blog_by_id_returns_whole_item_without_fields(dynamodb_resource, setup_blogs_table):
+    """Test that attributes outside BLOG_FIELDS are kept when no fieldset is given."""
+    table_name, test_blog = setup_blogs_table
+    table = dynamodb_resource.Table(table_name)
+    table.update_item(
+        Key={'id': '123'},
+        UpdateExpression='SET #location = :location, gallery = :gallery, bodyHtml = :html, '
+                         'entity = :entity, updatedAt = :updated, related = :related',
+        ExpressionAttributeNames={'#location': 'location'},
+        ExpressionAttributeValues={
+            ':location': 'Lisbon', ':gallery': ['a.png', 'b.png'], ':html': '<p>Stored</p>',
+            ':entity': 'blog', ':updated': 1717396800000, ':related': [{'id': '456', 'title': 'x', 'score': 1}]
+        }
+    )
+
+    import blog_service
+    result = blog_service.get_blog_by_id('123')
+    assert result['location'] == 'Lisbon'
+    assert result['gallery'] == ['a.png', 'b.png']
+    assert result['body'] == test_blog['body']
+    assert 'bodyHtml' not in result
+    assert not set(blog_service.INTERNAL_FIELDS) & set(result)
+
+    html = blog_service.get_blog_by_id('123', body_format='html')
+    assert html['location'] == 'Lisbon'
+    assert html['body'] == '<p>Stored</p>'
+    assert 'bodyHtml' not in html
+    assert not set(blog_service.INTERNAL_FIELDS) & set(html)
+
 def test_get_blog_by_id_not_found(dynamodb_resource, setup_blogs_table):
     """Test retrieving a blog by ID that doesn't exist."""
     table_name, test_blog = setup_blogs_table
@@ -119,103 +77,6 @@ def test_get_blog_by_id_not_found(dynamodb_resource, setup_blogs_table):
     # Assertions
     assert result is None
 
-@pytest.fixture
-def setup_blogs_table_for_filtering(dynamodb_resource):
-    """Create a mock DynamoDB table with multiple blog posts for flexible filtering testing."""
-    # Set up the environment variable for the table name
-    table_name = 'test-blogs-table'
-    os.environ['DYNAMODB_TABLE_NAME'] = table_name
-    
-    # Create the test table with a GSI for journey
-    table = dynamodb_resource.create_table(
-        TableName=table_name,
-        KeySchema=[
-            {'AttributeName': 'id', 'KeyType': 'HASH'},  # Partition key
-        ],
-        AttributeDefinitions=[
-            {'AttributeName': 'id', 'AttributeType': 'S'},
-            {'AttributeName': 'journey', 'AttributeType': 'S'},
-        ],
-        GlobalSecondaryIndexes=[
-            {
-                'IndexName': 'journey',  # GSI for journey
-                'KeySchema': [
-                    {'AttributeName': 'journey', 'KeyType': 'HASH'},
-                ],
-                'Projection': {'ProjectionType': 'ALL'},
-                'ProvisionedThroughput': {
-                    'ReadCapacityUnits': 5,
-                    'WriteCapacityUnits': 5
-                }
-            }
-        ],
-        ProvisionedThroughput={'ReadCapacityUnits': 5, 'WriteCapacityUnits': 5}
-    )
-    
-    # Add multiple blog posts with different journeys and dates
-    blog_posts = [
-        {
-            'id': '123',
-            'title': 'Blog Post 1',
-            'body': 'Content for blog post 1',
-            'description': 'Summary for blog post 1',
-            'username': 'Test Author',
-            'createdAt': 1715318400000,  # 2024-05-10
-            'journey': 'europe',
-            'tags': ['travel', 'europe'],
-            'image': 'image1.png'
-        },
-        {
-            'id': '124',
-            'title': 'Blog Post 2',
-            'body': 'Content for blog post 2',
-            'description': 'Summary for blog post 2',
-            'username': 'Test Author',
-            'createdAt': 1717396800000,  # 2024-06-03
-            'journey': 'europe',
-            'tags': ['travel', 'food'],
-            'image': 'image2.png'
-        },
-        {
-            'id': '125',
-            'title': 'Blog Post 3',
-            'body': 'Content for blog post 3',
-            'description': 'Summary for blog post 3',
-            'username': 'Another Author',
-            'createdAt': 1720588800000,  # 2024-07-10
-            'journey': 'asia',
-            'tags': ['travel', 'asia'],
-            'image': 'image3.png'
-        },
-        {
-            'id': '126',
-            'title': 'Blog Post 4',
-            'body': 'Content for blog post 4',
-            'description': 'Summary for blog post 4',
-            'username': 'Another Author',
-            'createdAt': 1722576000000,  # 2024-08-02
-            'journey': 'asia',
-            'tags': ['travel', 'food'],
-            'image': 'image4.png'
-        },
-        {
-            'id': '127',
-            'title': 'Blog Post 5',
-            'body': 'Content for blog post 5',
-            'description': 'Summary for blog post 5',
-            'username': 'Third Author',
-            'createdAt': 1723267200000,  # 2024-08-10
-            'journey': 'africa',
-            'tags': ['travel', 'africa'],
-            'image': 'image5.png'
-        }
-    ]
-    
-    for post in blog_posts:
-        table.put_item(Item=post)
-    
-    return table_name, blog_posts
-
 def test_filter_blogs_by_journey(dynamodb_resource, setup_blogs_table_for_filtering):
     """Test filtering blogs by journey."""
     table_name, blog_posts = setup_blogs_table_for_filtering
@@ -360,7 +221,7 @@ def test_post_blog_authenticated(dynamodb_resource, setup_blogs_table_for_filter
     # and make sure Table() returns our mocked table
     mock_dynamodb_resource = mocker.MagicMock()
     mock_dynamodb_resource.Table.return_value = table
-    mock_boto3_resource = mocker.patch('blog_service.boto3.resource', return_value=mock_dynamodb_resource)
+    mock_boto3_resource = mocker.patch('boto3.resource', return_value=mock_dynamodb_resource)
     
     # Call the function to post a blog (to be implemented)
     blog_service.post_blog(new_blog, token=valid_token)
@@ -374,8 +235,11 @@ def test_post_blog_authenticated(dynamodb_resource, setup_blogs_table_for_filter
     assert put_item_args['journey'] == new_blog['journey']
     assert put_item_args['tags'] == new_blog['tags']
     assert put_item_args['image'] == new_blog['image']
+    assert put_item_args['bodyHtml'] == '<p>This is the body of the new blog.</p>'
     assert 'id' in put_item_args
     assert 'createdAt' in put_item_args
+    assert put_item_args['entity'] == 'blog'
+    assert put_item_args['updatedAt'] > 0
 
 def test_post_blog_unauthenticated(dynamodb_resource, setup_blogs_table_for_filtering, mocker):
     """Test posting a blog with invalid authentication (should fail)."""
@@ -405,7 +269,7 @@ def test_post_blog_unauthenticated(dynamodb_resource, setup_blogs_table_for_filt
     # Mock boto3.resource to return our test dynamodb_resource
     mock_dynamodb_resource = mocker.MagicMock()
     mock_dynamodb_resource.Table.return_value = table
-    mock_boto3_resource = mocker.patch('blog_service.boto3.resource', return_value=mock_dynamodb_resource)
+    mock_boto3_resource = mocker.patch('boto3.resource', return_value=mock_dynamodb_resource)
     
     # Call the function with invalid token - should raise an exception
     with pytest.raises(ValueError, match="Invalid or missing authentication token"):
@@ -413,3 +277,144 @@ def test_post_blog_unauthenticated(dynamodb_resource, setup_blogs_table_for_filt
     
     # Assertions - check that put_item was NOT called since authentication failed
     mock_put_item.assert_not_called()
+
+def test_get_blog_by_id_with_fields(dynamodb_resource, setup_blogs_table):
+    """Test retrieving a sparse fieldset of a blog by ID."""
+    table_name, test_blog = setup_blogs_table
+    
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+    import blog_service
+    
+    result = blog_service.get_blog_by_id('123', fields='id,title,createdAt')
+    
+    assert result == {
+        'id': '123',
+        'title': 'Test Blog Post',
+        'createdAt': 1718463600000
+    }
+
+def test_filter_blogs_with_fields(dynamodb_resource, setup_blogs_table_for_filtering):
+    """Test that listing fields are translated into a projection."""
+    table_name, blog_posts = setup_blogs_table_for_filtering
+    
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+    import blog_service
+    
+    result = blog_service.filter_blogs({'journey': 'europe', 'fields': 'id, title'})
+    
+    assert len(result) == 2
+    for post in result:
+        assert set(post) == {'id', 'title'}
+
+def test_fields_rejected_outside_allow_list(dynamodb_resource, setup_blogs_table_for_filtering):
+    """Test that unknown fields, and the body in listings, are rejected."""
+    table_name, blog_posts = setup_blogs_table_for_filtering
+    
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+    import blog_service
+    
+    with pytest.raises(ValueError, match="Unknown fields: body"):
+        blog_service.filter_blogs({'fields': 'id,body'})
+    
+    with pytest.raises(ValueError, match="Unknown fields: secret"):
+        blog_service.get_blog_by_id('123', fields='id,secret')
+
+def test_get_changes_pages_through_updates(dynamodb_resource, setup_blogs_table_for_filtering):
+    """Test syncing changes in pages, including several changes in the same millisecond."""
+    import blog_service
+
+    table = dynamodb_resource.Table(setup_blogs_table_for_filtering[0])
+    for blog_id, updated_at in [('a', 1000), ('b', 2000), ('c', 2000), ('d', 3000)]:
+        table.put_item(Item={'id': blog_id, 'title': blog_id, 'entity': 'blog', 'updatedAt': updated_at})
+
+    first = blog_service.get_changes(limit=2, fields='id,title')
+    assert [change['id'] for change in first['changes']] == ['a', 'b']
+    assert first['hasMore'] is True
+    assert set(first['changes'][0]) == {'id', 'title', 'updatedAt'}
+
+    second = blog_service.get_changes(since=first['cursor'], limit=2)
+    assert [change['id'] for change in second['changes']] == ['c', 'd']
+    assert second['hasMore'] is False
+
+    # Nothing new: the cursor is handed back unchanged
+    third = blog_service.get_changes(since=second['cursor'])
+    assert third == {'changes': [], 'cursor': second['cursor'], 'hasMore': False}
+
+    # Seeded blogs without entity/updatedAt are not in the changes index
+    table.put_item(Item={'id': 'e', 'title': 'e', 'entity': 'blog', 'updatedAt': 4000})
+    assert [change['id'] for change in blog_service.get_changes(since=third['cursor'])['changes']] == ['e']
+
+def test_get_changes_rejects_bad_parameters(dynamodb_resource, setup_blogs_table_for_filtering):
+    """Test that malformed cursors and limits are rejected."""
+    import blog_service
+
+    with pytest.raises(ValueError):
+        blog_service.get_changes(since='not-a-cursor')
+    with pytest.raises(ValueError):
+        blog_service.get_changes(limit='0')
+    with pytest.raises(ValueError):
+        blog_service.get_changes(limit='many')
+
+def test_lambda_handler_changes_route(dynamodb_resource, setup_blogs_table_for_filtering):
+    """Test GET /blogs/changes is routed before the blog ID route."""
+    import json
+    os.environ.setdefault('S3_BUCKET_NAME', 'test-blog-images')
+    from lambda_function import lambda_handler
+
+    table = dynamodb_resource.Table(setup_blogs_table_for_filtering[0])
+    table.put_item(Item={'id': 'a', 'title': 'a', 'entity': 'blog', 'updatedAt': 1000})
+
+    response = lambda_handler({
+        'httpMethod': 'GET',
+        'path': '/blogs/changes',
+        'pathParameters': {'id': 'changes'},
+        'queryStringParameters': None
+    }, {})
+    assert response['statusCode'] == 200
+    body = json.loads(response['body'])
+    assert [change['id'] for change in body['changes']] == ['a']
+    assert body['hasMore'] is False
+
+    response = lambda_handler({
+        'httpMethod': 'GET',
+        'path': '/blogs/changes',
+        'queryStringParameters': {'since': '!!!'}
+    }, {})
+    assert response['statusCode'] == 400
+
+def test_date_ranges_are_key_conditions():
+    """Test that date ranges are served from the createdAt-sorted indexes, newest first."""
+    import blog_service
+
+    operation, params = blog_service.build_listing_request({'start': '2024-06-01', 'end': '2024-06-30'})
+    assert operation == 'query'
+    assert params['IndexName'] == blog_service.CREATED_INDEX
+    assert params['KeyConditionExpression'] == 'entity = :blog_entity AND createdAt BETWEEN :start AND :end'
+    assert params['ScanIndexForward'] is False
+    assert 'FilterExpression' not in params
+
+    operation, params = blog_service.build_listing_request({'journey': 'asia', 'start': '2024-06-01', 'tags': 'food'})
+    assert params['IndexName'] == blog_service.JOURNEY_INDEX
+    assert params['KeyConditionExpression'] == 'journey = :journey_val AND createdAt >= :start'
+    assert params['FilterExpression'] == '(contains(tags, :tag0))'
+
+    with pytest.raises(ValueError):
+        blog_service.build_listing_request({'start': 'yesterday'})
+    with pytest.raises(ValueError, match='start must not be after end'):
+        blog_service.build_listing_request({'start': '2024-07-01', 'end': '2024-06-30'})
+    # A single day is a valid range
+    blog_service.build_listing_request({'start': '2024-06-30', 'end': '2024-06-30'})
+
+def test_lambda_handler_rejects_inverted_date_range(dynamodb_resource, setup_blogs_table_for_filtering):
+    """Test that a start date after the end date is a 400, not a DynamoDB error."""
+    os.environ.setdefault('S3_BUCKET_NAME', 'test-blog-images')
+    from lambda_function import lambda_handler
+
+    response = lambda_handler({
+        'httpMethod': 'GET',
+        'path': '/blogs',
+        'queryStringParameters': {'start': '2024-08-01', 'end': '2024-06-01'}
+    }, {})
+
+    assert response['statusCode'] == 400
+    assert json.loads(response['body'])['error'] == 'start must not be after end'
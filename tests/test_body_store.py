@@ -0,0 +1,68 @@
+import os
+import sys
+import gzip
+import pytest
+import boto3
+from moto import mock_s3
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from utils import body_store
+
+
+@pytest.fixture
+def body_bucket(aws_credentials):
+    """Create a mock S3 bucket for offloaded bodies."""
+    with mock_s3():
+        s3_client = boto3.client('s3', region_name='us-east-1')
+        s3_client.create_bucket(Bucket='test-blog-bodies')
+        os.environ['BODY_S3_BUCKET'] = 'test-blog-bodies'
+        yield s3_client
+        del os.environ['BODY_S3_BUCKET']
+
+def test_small_body_stays_inline():
+    """Test that bodies under the threshold are stored as plain text."""
+    assert body_store.pack_body('1', 'short body') == {'body': 'short body'}
+
+def test_large_body_compressed_inline_round_trip(mocker):
+    """Test that mid-sized bodies are gzipped into a binary attribute."""
+    mocker.patch('utils.body_store.BODY_COMPRESS_THRESHOLD', 100)
+    body = 'We walked along the river. ' * 200
+
+    packed = body_store.pack_body('1', body)
+
+    assert set(packed) == {'bodyGz', 'bodyEncoding'}
+    assert len(packed['bodyGz']) < len(body)
+    assert body_store.unpack_body({'id': '1', **packed}) == {'id': '1', 'body': body}
+
+def test_huge_body_offloaded_to_s3_round_trip(body_bucket, mocker):
+    """Test that bodies too large for the item are written to S3 with a pointer."""
+    mocker.patch('utils.body_store.BODY_COMPRESS_THRESHOLD', 100)
+    mocker.patch('utils.body_store.BODY_S3_THRESHOLD', 100)
+    body = os.urandom(2000).hex()
+
+    packed = body_store.pack_body('abc', body)
+
+    assert packed == {'bodyKey': 'blog-bodies/abc.gz', 'bodyEncoding': 'gzip'}
+    stored = body_bucket.get_object(Bucket='test-blog-bodies', Key='blog-bodies/abc.gz')['Body'].read()
+    assert gzip.decompress(stored).decode() == body
+    assert body_store.unpack_body({'id': 'abc', **packed})['body'] == body
+
+def test_get_blog_by_id_rehydrates_compressed_body(dynamodb_resource, setup_blogs_table):
+    """Test that get_blog_by_id transparently decompresses stored bodies."""
+    table_name, test_blog = setup_blogs_table
+    body = 'A very long travelogue. ' * 500
+    dynamodb_resource.Table(table_name).put_item(Item={
+        'id': '999',
+        'title': 'Long post',
+        'bodyGz': gzip.compress(body.encode()),
+        'bodyEncoding': 'gzip'
+    })
+
+    import blog_service
+
+    result = blog_service.get_blog_by_id('999')
+    sparse = blog_service.get_blog_by_id('999', fields='title,body')
+
+    assert result['body'] == body
+    assert 'bodyGz' not in result
+    assert sparse == {'title': 'Long post', 'body': body}
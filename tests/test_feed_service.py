@@ -0,0 +1,179 @@
+import os
+import sys
+import json
+import pytest
+import boto3
+from moto import mock_s3
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+
+@pytest.fixture
+def feed_bucket(aws_credentials):
+    """Create a mock S3 bucket for generated feeds."""
+    with mock_s3():
+        s3_client = boto3.client('s3', region_name='us-east-1')
+        s3_client.create_bucket(Bucket='test-blog-feeds')
+        os.environ['FEED_S3_BUCKET'] = 'test-blog-feeds'
+        yield s3_client
+        del os.environ['FEED_S3_BUCKET']
+
+@pytest.fixture
+def feed_service():
+    import feed_service
+    feed_service.clear_cache()
+    yield feed_service
+    feed_service.clear_cache()
+
+def test_feed_generated_once_then_served_from_cache_and_s3(
+        dynamodb_resource, setup_blogs_table_for_filtering, feed_bucket, feed_service, mocker):
+    """Test that the listing is only read when no stored feed exists."""
+    import blog_service
+    spy = mocker.spy(blog_service, 'filter_blogs')
+
+    first = feed_service.get_document('feed')
+    second = feed_service.get_document('feed')
+    feed_service.clear_cache()
+    from_s3 = feed_service.get_document('feed')
+
+    assert spy.call_count == 1
+    assert first is second
+    assert from_s3['etag'] == first['etag']
+    # Newest post first
+    assert first['xml'].index('Blog Post 5') < first['xml'].index('Blog Post 1')
+    stored = feed_bucket.get_object(Bucket='test-blog-feeds', Key='feeds/feed.json')['Body'].read()
+    assert len(json.loads(stored)) == 5
+
+def test_journey_feed_and_sitemap(dynamodb_resource, setup_blogs_table_for_filtering, feed_bucket, feed_service):
+    """Test per-journey feeds and the sitemap contents."""
+    feed = feed_service.get_document('feed', journey='asia')
+    sitemap = feed_service.get_document('sitemap')
+
+    assert 'Blog Post 3' in feed['xml'] and 'Blog Post 4' in feed['xml']
+    assert 'Blog Post 1' not in feed['xml']
+    assert sitemap['xml'].count('<url>') == 5
+    assert '<lastmod>2024-08-10</lastmod>' in sitemap['xml']
+
+def test_add_blog_updates_stored_documents(dynamodb_resource, setup_blogs_table_for_filtering, feed_bucket, feed_service, mocker):
+    """Test that new posts are added incrementally without re-reading the listing."""
+    original = feed_service.get_document('feed')
+    feed_service.get_document('sitemap')
+    feed_service.get_document('feed', journey='europe')
+
+    import blog_service
+    spy = mocker.spy(blog_service, 'filter_blogs')
+    feed_service.add_blog({'id': '200', 'title': 'Fresh <post>', 'journey': 'europe', 'createdAt': 1730000000000})
+    updated = feed_service.get_document('feed')
+    sitemap = feed_service.get_document('sitemap')
+
+    assert spy.call_count == 0
+    assert updated['etag'] != original['etag']
+    assert updated['xml'].index('Fresh &lt;post&gt;') < updated['xml'].index('Blog Post 5')
+    assert sitemap['xml'].count('<url>') == 6
+
+def test_add_blog_sends_conditional_writes(dynamodb_resource, setup_blogs_table_for_filtering, feed_bucket, feed_service):
+    """Test that stored documents are updated with If-Match and created with If-None-Match."""
+    from utils.s3 import get_s3_client
+    feed_service.get_document('feed')
+    etag = feed_bucket.head_object(Bucket='test-blog-feeds', Key='feeds/feed.json')['ETag']
+
+    conditions = {}
+
+    def record(request, **kwargs):
+        key = request.url.split('/feeds/')[-1]
+        condition = request.headers.get('If-Match') or request.headers.get('If-None-Match')
+        conditions[key] = condition.decode('utf-8')
+
+    get_s3_client().meta.events.register('before-send.s3.PutObject', record)
+    try:
+        feed_service.add_blog({'id': '200', 'title': 'Fresh', 'journey': 'oceania', 'createdAt': 1730000000000})
+    finally:
+        get_s3_client().meta.events.unregister('before-send.s3.PutObject', record)
+
+    assert conditions['feed.json'] == etag
+    assert conditions['sitemap.json'] == '*'
+    assert conditions['feed-oceania.xml'] == '*'
+    assert 'Fresh' in feed_service.get_document('feed', journey='oceania')['xml']
+
+def test_add_blog_retries_when_another_writer_wins(feed_bucket, feed_service, mocker):
+    """Test that a failed precondition re-reads the stored entries and writes again."""
+    from botocore.exceptions import ClientError
+    feed_service._store('sitemap', [{'id': '1', 'createdAt': 1720000000000}], '<urlset/>')
+    mocker.patch.object(feed_service.time, 'sleep')
+    real_store = feed_service._store
+    attempts = []
+
+    def racing_store(name, entries, xml, json_etag=None, xml_etag=None, overwrite=False):
+        attempts.append(json_etag)
+        if len(attempts) == 1:
+            # Another post lands between our read and our write
+            real_store(name, entries + [{'id': '2', 'createdAt': 1725000000000}], xml, overwrite=True)
+            raise ClientError({'Error': {'Code': 'PreconditionFailed'}}, 'PutObject')
+        real_store(name, entries, xml, json_etag, xml_etag)
+
+    mocker.patch.object(feed_service, '_store', side_effect=racing_store)
+    feed_service._add_entry('sitemap', {'id': '3', 'createdAt': 1730000000000})
+
+    stored = json.loads(feed_bucket.get_object(Bucket='test-blog-feeds', Key='feeds/sitemap.json')['Body'].read())
+    assert [entry['id'] for entry in stored] == ['3', '2', '1']
+    assert len(attempts) == 2 and attempts[0] != attempts[1]
+
+def test_add_blog_discards_documents_it_cannot_update(feed_bucket, feed_service, mocker):
+    """Test that a document left behind by a failed update is removed so it is regenerated."""
+    feed_service._store('feed', [], '<rss/>')
+    mocker.patch.object(feed_service, '_add_entry', side_effect=RuntimeError('gave up'))
+
+    feed_service.add_blog({'id': '200', 'title': 'Fresh', 'createdAt': 1730000000000})
+
+    assert 'Contents' not in feed_bucket.list_objects_v2(Bucket='test-blog-feeds')
+
+def test_lambda_handler_feed_conditional_get(dynamodb_resource, setup_blogs_table_for_filtering, feed_bucket, feed_service):
+    """Test that a matching If-None-Match returns 304 without a body."""
+    os.environ.setdefault('S3_BUCKET_NAME', 'test-blog-images')
+    from lambda_function import lambda_handler
+
+    event = {'httpMethod': 'GET', 'path': '/feed.xml', 'headers': {}}
+    first = lambda_handler(event, {})
+    second = lambda_handler({**event, 'headers': {'If-None-Match': first['headers']['ETag']}}, {})
+
+    assert first['statusCode'] == 200
+    assert first['headers']['Content-Type'].startswith('application/xml')
+    assert second['statusCode'] == 304
+    assert second['body'] == ''
+
+def test_journey_feeds_do_not_collide_or_store_unknown_journeys(
+        dynamodb_resource, setup_blogs_table_for_filtering, feed_bucket, feed_service):
+    """Test that similar journey names get their own documents and unknown ones are not stored."""
+    table_name, blog_posts = setup_blogs_table_for_filtering
+    import boto3
+    boto3.resource('dynamodb', region_name='us-east-1').Table(table_name).put_item(Item={
+        'id': '300', 'title': 'Spaced journey', 'journey': 'south america', 'createdAt': 1725000000000, 'entity': 'blog'
+    })
+
+    spaced = feed_service.get_document('feed', journey='south america')
+    unknown = feed_service.get_document('feed', journey='south-america')
+
+    assert 'Spaced journey' in spaced['xml']
+    assert 'Spaced journey' not in unknown['xml']
+    keys = [obj['Key'] for obj in feed_bucket.list_objects_v2(Bucket='test-blog-feeds')['Contents']]
+    assert 'feeds/feed-south%20america.xml' in keys
+    assert not any('south-america' in key for key in keys)
+    assert list(feed_service._cache) == ['feed-south%20america']
+
+def test_cache_is_bounded(feed_service, mocker):
+    """Test that the least recently loaded document is evicted once the cache is full."""
+    mocker.patch.object(feed_service, 'FEED_CACHE_MAX_ENTRIES', 2)
+    for name in ('feed', 'sitemap', 'feed-europe'):
+        feed_service._cache_document(name, f"<{name}/>")
+
+    assert sorted(feed_service._cache) == ['feed-europe', 'sitemap']
+
+def test_rebuild_document_overwrites_stored_copy(dynamodb_resource, setup_blogs_table_for_filtering, feed_bucket, feed_service):
+    """Test that a rebuild replaces a stale stored document with one built from the listing."""
+    feed_service._store('feed-asia', [], '<rss/>')
+
+    entries = feed_service.rebuild_document('feed', journey='asia')
+    feed_service.clear_cache()
+
+    assert [entry['id'] for entry in entries] == ['126', '125']
+    assert 'Blog Post 4' in feed_service.get_document('feed', journey='asia')['xml']
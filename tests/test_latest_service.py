@@ -0,0 +1,78 @@
+import os
+import sys
+import json
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+
+def test_record_blog_keeps_bounded_newest_first_list(
+        dynamodb_resource, setup_blogs_table_for_filtering, dynamodb_calls, mocker):
+    """Test that the latest item holds the newest LATEST_SIZE posts and is served with one GetItem."""
+    import latest_service
+    mocker.patch.object(latest_service, 'LATEST_SIZE', 3)
+
+    for blog_id, created_at in [('a', 3000), ('b', 1000), ('c', 4000), ('d', 2000)]:
+        latest_service.record_blog({'id': blog_id, 'title': blog_id, 'body': 'not stored', 'createdAt': created_at})
+    assert set(dynamodb_calls) == {'GetItem', 'UpdateItem'}
+
+    dynamodb_calls.clear()
+    query = mocker.spy(latest_service, 'query_latest')
+    latest = latest_service.get_latest(3)
+    assert dynamodb_calls == ['GetItem']
+    assert [entry['id'] for entry in latest] == ['c', 'a', 'd']
+    assert 'body' not in latest[0]
+    assert latest_service.get_latest('2', fields='id') == [{'id': 'c'}, {'id': 'a'}]
+    query.assert_not_called()
+
+def test_record_blog_retries_after_concurrent_write(dynamodb_resource, setup_blogs_table_for_filtering, mocker):
+    """Test that a writer that lost the race re-reads the list instead of overwriting it."""
+    import latest_service
+    latest_service.record_blog({'id': 'a', 'createdAt': 1000})
+
+    real_write = latest_service._write
+    calls = []
+
+    def racing_write(table, entries, version):
+        if not calls:
+            # Another container adds a post between our read and our write
+            real_write(table, latest_service._merge(entries[1:], {'id': 'other', 'createdAt': 1500}), version)
+        calls.append(version)
+        return real_write(table, entries, version)
+
+    mocker.patch.object(latest_service, '_write', side_effect=racing_write)
+    latest_service.record_blog({'id': 'b', 'createdAt': 2000})
+
+    assert len(calls) == 2
+    assert [entry['id'] for entry in latest_service.get_latest(3)] == ['b', 'other', 'a']
+
+def test_get_latest_falls_back_to_index(dynamodb_resource, setup_blogs_table_for_filtering):
+    """Test that N beyond the stored list is served from the createdAt index."""
+    import latest_service
+
+    latest = latest_service.get_latest(2)
+    assert [entry['id'] for entry in latest] == ['127', '126']
+    with pytest.raises(ValueError):
+        latest_service.get_latest('0')
+
+    assert [entry['id'] for entry in latest_service.replace_latest()][:2] == ['127', '126']
+
+def test_lambda_handler_latest_route(dynamodb_resource, setup_blogs_table_for_filtering):
+    """Test GET /blogs?latest=N, and that it cannot be combined with filters."""
+    os.environ.setdefault('S3_BUCKET_NAME', 'test-blog-images')
+    from lambda_function import lambda_handler
+
+    response = lambda_handler({
+        'httpMethod': 'GET',
+        'path': '/blogs',
+        'queryStringParameters': {'latest': '1', 'fields': 'id,title'}
+    }, {})
+    assert response['statusCode'] == 200
+    assert json.loads(response['body']) == [{'id': '127', 'title': 'Blog Post 5'}]
+
+    response = lambda_handler({
+        'httpMethod': 'GET',
+        'path': '/blogs',
+        'queryStringParameters': {'latest': '1', 'journey': 'asia'}
+    }, {})
+    assert response['statusCode'] == 400
@@ -0,0 +1,82 @@
+import io
+import os
+import sys
+import json
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import local_server
+from utils.events import normalize_event
+
+
+def make_environ(method='GET', path='/', query='', body=b'', headers=None):
+    environ = {
+        'REQUEST_METHOD': method,
+        'PATH_INFO': path,
+        'QUERY_STRING': query,
+        'REMOTE_ADDR': '10.0.0.1',
+        'CONTENT_LENGTH': str(len(body)) if body else '',
+        'wsgi.input': io.BytesIO(body),
+    }
+    for name, value in (headers or {}).items():
+        environ['HTTP_' + name.upper().replace('-', '_')] = value
+    return environ
+
+def test_make_event_rest_shape():
+    """Test building a REST API (v1) event with path and query parameters."""
+    environ = make_environ(path='/blogs/123', query='fields=id&fields=title',
+                           headers={'Authorization': 'Bearer abc'})
+
+    event = local_server.make_event(environ, payload_version=1)
+
+    assert event['httpMethod'] == 'GET'
+    assert event['resource'] == '/blogs/{id}'
+    assert event['pathParameters'] == {'id': '123'}
+    assert event['queryStringParameters'] == {'fields': 'title'}
+    assert event['multiValueQueryStringParameters'] == {'fields': ['id', 'title']}
+    assert event['headers']['Authorization'] == 'Bearer abc'
+
+def test_make_event_http_api_shape_normalizes_to_rest():
+    """Test that an HTTP API (v2) event is understood by the handler's normalizer."""
+    body = json.dumps({'title': 'Hello'}).encode()
+    environ = make_environ(method='POST', path='/blogs', body=body)
+
+    event = normalize_event(local_server.make_event(environ, payload_version=2))
+
+    assert event['httpMethod'] == 'POST'
+    assert event['path'] == '/blogs'
+    assert event['resource'] == '/blogs'
+    assert event['pathParameters'] is None
+    assert json.loads(event['body']) == {'title': 'Hello'}
+
+def test_normalize_event_decodes_base64_body():
+    """Test that base64 encoded bodies are decoded before routing."""
+    event = normalize_event({'httpMethod': 'POST', 'body': 'eyJhIjogMX0=', 'isBase64Encoded': True})
+
+    assert event['body'] == '{"a": 1}'
+    assert event['isBase64Encoded'] is False
+
+def test_wsgi_app_returns_handler_response():
+    """Test that the WSGI app relays status, headers and body from the handler."""
+    app = local_server.LambdaWSGIApp()
+    received = {}
+
+    def fake_handler(event, context):
+        received['event'] = event
+        received['request_id'] = context.aws_request_id
+        return {'statusCode': 404, 'headers': {'Content-Type': 'application/json'},
+                'body': json.dumps({'error': 'Blog not found'})}
+
+    app._handler = fake_handler
+    captured = {}
+
+    def start_response(status, headers):
+        captured['status'] = status
+        captured['headers'] = dict(headers)
+
+    chunks = app(make_environ(path='/blogs/missing'), start_response)
+
+    assert captured['status'] == '404 Not Found'
+    assert captured['headers']['Content-Type'] == 'application/json'
+    assert json.loads(b''.join(chunks)) == {'error': 'Blog not found'}
+    assert received['event']['pathParameters'] == {'id': 'missing'}
+    assert received['request_id']
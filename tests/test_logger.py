@@ -0,0 +1,112 @@
+import os
+import sys
+import json
+import logging
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from utils import logger as log_utils
+
+
+class FakeContext:
+    aws_request_id = 'req-abc-123'
+
+
+@pytest.fixture
+def captured_records():
+    """Collect formatted records emitted through the application logger."""
+    lines = []
+
+    class ListHandler(logging.Handler):
+        def emit(self, record):
+            lines.append(self.format(record))
+
+    handler = ListHandler()
+    handler.setFormatter(log_utils.JsonFormatter())
+    handler.addFilter(log_utils.SamplingFilter(logging.INFO))
+
+    root = logging.getLogger(log_utils.ROOT_LOGGER_NAME)
+    root.addHandler(handler)
+    yield lines
+    root.removeHandler(handler)
+
+def test_records_are_json_with_request_id(captured_records):
+    """Test that records carry the bound request ID and extra fields."""
+    logger = log_utils.get_logger('test')
+    log_utils.bind_request(FakeContext())
+
+    logger.info("Found %d blogs", 3, extra={'journey': 'europe'})
+
+    entry = json.loads(captured_records[-1])
+    assert entry['message'] == 'Found 3 blogs'
+    assert entry['level'] == 'INFO'
+    assert entry['request_id'] == 'req-abc-123'
+    assert entry['journey'] == 'europe'
+    assert entry['logger'] == 'bloggs.test'
+
+def test_debug_records_only_emitted_when_sampled(captured_records, mocker):
+    """Test that DEBUG records are dropped unless the request was sampled."""
+    logger = log_utils.get_logger('test')
+
+    mocker.patch('utils.logger.random.random', return_value=0.99)
+    log_utils.bind_request(FakeContext())
+    logger.debug("not sampled")
+
+    log_utils.bind_request(FakeContext(), force_debug=True)
+    logger.debug("sampled")
+
+    messages = [json.loads(line)['message'] for line in captured_records]
+    assert 'not sampled' not in messages
+    assert 'sampled' in messages
+
+def test_bind_request_without_context_generates_id():
+    """Test that local invocations without a Lambda context still get an ID."""
+    request_id = log_utils.bind_request({})
+
+    assert request_id.startswith('local-')
+    assert log_utils.get_request_id() == request_id
+
+def test_unsampled_requests_do_not_build_debug_records(mocker):
+    """Test that DEBUG calls are skipped before record creation unless sampled."""
+    logger = log_utils.get_logger('test')
+    make_record = mocker.spy(logger.logger, 'makeRecord')
+
+    mocker.patch('utils.logger.random.random', return_value=0.99)
+    log_utils.bind_request(FakeContext())
+    logger.debug("not sampled")
+    assert not logger.isEnabledFor(logging.DEBUG)
+    make_record.assert_not_called()
+
+    log_utils.bind_request(FakeContext(), force_debug=True)
+    logger.debug("sampled")
+    assert make_record.call_count == 1
+
+def test_records_reach_standard_logging(caplog):
+    """Test that application records go through the standard logger hierarchy."""
+    logger = log_utils.get_logger('test')
+    log_utils.bind_request(FakeContext())
+
+    with caplog.at_level(logging.INFO, logger=log_utils.ROOT_LOGGER_NAME):
+        logging.getLogger(log_utils.ROOT_LOGGER_NAME).addHandler(caplog.handler)
+        try:
+            logger.info("Visible to %s", 'caplog', extra={'journey': 'europe'})
+        finally:
+            logging.getLogger(log_utils.ROOT_LOGGER_NAME).removeHandler(caplog.handler)
+
+    assert logger.logger is logging.getLogger('bloggs.test')
+    assert caplog.records[-1].getMessage() == 'Visible to caplog'
+    assert caplog.records[-1].journey == 'europe'
+
+def test_worker_threads_keep_request_context(captured_records):
+    """Test that records from executor threads carry the request ID when run in a copied context."""
+    import contextvars
+    from concurrent.futures import ThreadPoolExecutor
+    logger = log_utils.get_logger('test')
+    log_utils.bind_request(FakeContext(), force_debug=True)
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        executor.submit(contextvars.copy_context().run, logger.debug, "from a worker").result()
+
+    entry = json.loads(captured_records[-1])
+    assert entry['message'] == 'from a worker'
+    assert entry['request_id'] == 'req-abc-123'
@@ -0,0 +1,51 @@
+import os
+import sys
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from utils.markdown_render import render_markdown
+
+
+def test_render_markdown_sanitises_html():
+    """Test that Markdown is rendered and unsafe HTML is stripped."""
+    html = render_markdown("# Day 1\n\n**Lisbon** <script>alert(1)</script> [map](https://example.com)")
+
+    assert '<h1>Day 1</h1>' in html
+    assert '<strong>Lisbon</strong>' in html
+    assert '<script>' not in html
+    assert 'rel="noopener noreferrer"' in html
+
+def test_get_blog_by_id_html_uses_stored_render(dynamodb_resource, setup_blogs_table):
+    """Test that format=html serves the HTML rendered at write time."""
+    table_name, test_blog = setup_blogs_table
+    dynamodb_resource.Table(table_name).update_item(
+        Key={'id': '123'},
+        UpdateExpression='SET bodyHtml = :html',
+        ExpressionAttributeValues={':html': '<p>Stored render</p>'}
+    )
+    
+    import blog_service
+    
+    result = blog_service.get_blog_by_id('123', body_format='html')
+    markdown = blog_service.get_blog_by_id('123')
+    
+    assert result['body'] == '<p>Stored render</p>'
+    assert result['title'] == 'Test Blog Post'
+    assert 'bodyHtml' not in result
+    assert markdown['body'] == 'This is a test blog post content.'
+    assert 'bodyHtml' not in markdown
+
+def test_get_blog_by_id_html_falls_back_to_rendering(dynamodb_resource, setup_blogs_table):
+    """Test that posts without a stored render are rendered on read."""
+    import blog_service
+    
+    result = blog_service.get_blog_by_id('123', body_format='html')
+    
+    assert result['body'] == '<p>This is a test blog post content.</p>'
+
+def test_get_blog_by_id_rejects_unknown_format(dynamodb_resource, setup_blogs_table):
+    """Test that only markdown and html formats are accepted."""
+    import blog_service
+    
+    with pytest.raises(ValueError, match="Unknown format: pdf"):
+        blog_service.get_blog_by_id('123', body_format='pdf')
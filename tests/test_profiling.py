@@ -0,0 +1,48 @@
+import os
+import sys
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from utils import profiling
+
+
+def busy_work(n):
+    return sum(i * i for i in range(n))
+
+def test_should_profile_with_matching_header(mocker):
+    """Test that the X-Profile header enables profiling only with the right token."""
+    mocker.patch('utils.profiling.PROFILE_HEADER_TOKEN', 'secret')
+    mocker.patch('utils.profiling.PROFILE_SAMPLE_RATE', 0)
+
+    assert profiling.should_profile({'headers': {'X-Profile': 'secret'}})
+    assert not profiling.should_profile({'headers': {'X-Profile': 'wrong'}})
+    assert not profiling.should_profile({'headers': None})
+
+def test_should_profile_disabled_by_default(mocker):
+    """Test that nothing is profiled without a token or sample rate."""
+    mocker.patch('utils.profiling.PROFILE_HEADER_TOKEN', None)
+    mocker.patch('utils.profiling.PROFILE_SAMPLE_RATE', 0)
+
+    assert not profiling.should_profile({'headers': {'X-Profile': 'secret'}})
+
+def test_profile_call_returns_result_and_logs_summary(mocker):
+    """Test that a profiled call returns normally and logs the hottest functions."""
+    mocker.patch('utils.profiling.PROFILE_S3_PREFIX', None)
+    mock_info = mocker.patch.object(profiling.logger, 'info')
+
+    result = profiling.profile_call(busy_work, 1000, label='GET /blogs')
+
+    assert result == busy_work(1000)
+    extra = mock_info.call_args[1]['extra']
+    assert extra['profile_location'] is None
+    assert any('busy_work' in row[0] for row in extra['profile_top'])
+
+def test_profile_call_propagates_errors(mocker):
+    """Test that exceptions from the profiled call are not swallowed."""
+    mocker.patch('utils.profiling.PROFILE_S3_PREFIX', None)
+
+    def fail():
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError, match="boom"):
+        profiling.profile_call(fail)
@@ -0,0 +1,115 @@
+import os
+import sys
+import json
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+
+def test_compute_related_ranks_rare_tags_and_journey():
+    """Test that shared rare tags and the same journey outrank common tags."""
+    import related_service
+
+    blogs = [
+        {'id': '1', 'title': 'A', 'journey': 'europe', 'tags': ['travel', 'europe'], 'createdAt': 1},
+        {'id': '2', 'title': 'B', 'journey': 'europe', 'tags': ['travel'], 'createdAt': 2},
+        {'id': '3', 'title': 'C', 'journey': 'asia', 'tags': ['travel', 'food'], 'createdAt': 3},
+        {'id': '4', 'title': 'D', 'journey': 'africa', 'tags': ['travel', 'food'], 'createdAt': 4},
+        {'id': '5', 'title': 'E', 'journey': 'antarctica', 'tags': ['ice'], 'createdAt': 5},
+    ]
+    related = related_service.compute_related(blogs, k=2)
+
+    assert [entry['id'] for entry in related['1']] == ['2', '4']
+    assert [entry['id'] for entry in related['3']] == ['4', '2']
+    assert related['5'] == []
+    assert related['1'][0]['title'] == 'B'
+
+def test_compute_related_limits_candidates_of_common_tags(mocker):
+    """Test that a tag on every post does not make every pair a candidate."""
+    import related_service
+    mocker.patch.object(related_service, 'RELATED_CANDIDATES', 4)
+    blogs = [
+        {'id': str(i), 'title': str(i), 'tags': ['travel', f"topic{i % 10}"], 'createdAt': i}
+        for i in range(100)
+    ]
+    similarity = mocker.spy(related_service, 'similarity')
+
+    related = related_service.compute_related(blogs, k=3)
+
+    # Each post is scored against its 9 topic mates and at most 4 posts nearest in time
+    assert similarity.call_count <= 100 * (9 + 4)
+    assert {entry['id'] for entry in related['42']} <= {'32', '52', '22', '62', '12', '72', '2', '82', '92'}
+
+def test_store_related_does_not_recreate_deleted_blogs(dynamodb_resource, setup_blogs_table_for_filtering):
+    """Test that related posts are not written to a blog that no longer exists."""
+    import related_service
+    from utils.dynamodb import get_table
+
+    assert related_service.store_related({'id': '123'}, []) is True
+    assert related_service.store_related({'id': 'deleted'}, [{'id': '123', 'title': 'x', 'score': 1}]) is False
+    assert 'Item' not in get_table().get_item(Key={'id': 'deleted'})
+
+def test_update_for_new_blog(dynamodb_resource, setup_blogs_table_for_filtering):
+    """Test that a new post gets its own list and joins the lists of similar posts."""
+    import related_service
+    from utils.dynamodb import get_table
+
+    related_service.RELATED_K = 2
+    try:
+        for blog in related_service.load_candidates():
+            related_service.store_related(blog, [])
+        blog = {'id': '200', 'title': 'New', 'journey': 'asia', 'tags': ['asia', 'food'], 'createdAt': 1725000000000}
+        get_table().put_item(Item=blog)
+        related_service.update_for_new_blog(blog, k=2)
+    finally:
+        related_service.RELATED_K = 5
+
+    assert [entry['id'] for entry in related_service.get_related('200')] == ['125', '126']
+    assert related_service.get_related('125')[0]['id'] == '200'
+    # Shares no tag or journey with the new post
+    assert related_service.get_related('127') == []
+
+def test_update_for_new_blog_reads_only_recent_candidates(dynamodb_resource, setup_blogs_table_for_filtering, mocker):
+    """Test that adding a post queries a bounded window of posts instead of scanning the table."""
+    import blog_service
+    import related_service
+    from utils.dynamodb import get_table
+
+    mocker.patch.object(related_service, 'RELATED_CANDIDATES', 1)
+    fetch_all = mocker.spy(blog_service, 'fetch_all')
+
+    blog = {'id': '200', 'title': 'New', 'journey': 'europe', 'tags': ['asia'], 'createdAt': 1725000000000, 'entity': 'blog'}
+    get_table().put_item(Item=blog)
+    related_service.update_for_new_blog(blog, k=5)
+
+    fetch_all.assert_not_called()
+    # The newest other post overall (127, africa) shares nothing; the newest europe post (124) does
+    assert [entry['id'] for entry in related_service.get_related('200')] == ['124']
+    assert related_service.get_related('123') == []
+
+def test_lambda_handler_related_route(dynamodb_resource, setup_blogs_table_for_filtering):
+    """Test GET /blogs/{id}/related returns the stored list, and 404 for unknown blogs."""
+    import related_service
+    os.environ.setdefault('S3_BUCKET_NAME', 'test-blog-images')
+    from lambda_function import lambda_handler
+
+    blogs = related_service.load_candidates()
+    related = related_service.compute_related(blogs)
+    for blog in blogs:
+        related_service.store_related(blog, related[blog['id']])
+
+    response = lambda_handler({
+        'httpMethod': 'GET',
+        'path': '/blogs/123/related',
+        'pathParameters': {'id': '123'}
+    }, {})
+    assert response['statusCode'] == 200
+    body = json.loads(response['body'])
+    assert body[0]['id'] == '124'
+    assert set(body[0]) == {'id', 'title', 'score'}
+
+    response = lambda_handler({
+        'httpMethod': 'GET',
+        'path': '/blogs/999/related',
+        'pathParameters': {'id': '999'}
+    }, {})
+    assert response['statusCode'] == 404
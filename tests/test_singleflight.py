@@ -0,0 +1,86 @@
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+
+def test_concurrent_identical_calls_share_one_execution():
+    """Test that callers arriving while a call is in flight get its result."""
+    from utils.singleflight import Group
+
+    group = Group('test')
+    started = threading.Event()
+    release = threading.Event()
+    executions = []
+
+    def slow(value):
+        executions.append(value)
+        started.set()
+        release.wait(5)
+        return {'value': value}
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        leader = executor.submit(group.do, 'k', slow, 1)
+        started.wait(5)
+        followers = [executor.submit(group.do, 'k', slow, 1) for _ in range(3)]
+        other = executor.submit(group.do, 'other', lambda: 'other')
+        assert other.result(5) == 'other'
+        # Followers are blocked on the leader
+        while group.stats()['deduplicated'] < 3:
+            time.sleep(0.01)
+        release.set()
+        results = [future.result(5) for future in [leader] + followers]
+
+    assert executions == [1]
+    assert all(result is results[0] for result in results)
+    assert group.stats() == {'calls': 5, 'executed': 2, 'deduplicated': 3}
+
+    # Completed calls are not cached
+    group.do('k', slow, 2)
+    assert executions == [1, 2]
+
+def test_errors_are_shared_and_not_cached():
+    """Test that followers see the leader's exception and the next call retries."""
+    from utils.singleflight import Group
+
+    group = Group('test-errors')
+    release = threading.Event()
+
+    def failing():
+        release.wait(5)
+        raise RuntimeError('backend down')
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        futures = [executor.submit(group.do, 'k', failing)]
+        while not group._calls:
+            time.sleep(0.01)
+        futures.append(executor.submit(group.do, 'k', failing))
+        while group.stats()['deduplicated'] < 1:
+            time.sleep(0.01)
+        release.set()
+        for future in futures:
+            with pytest.raises(RuntimeError):
+                future.result(5)
+
+    assert group.do('k', lambda: 'recovered') == 'recovered'
+
+def test_filter_blogs_keys_are_normalized(dynamodb_resource, setup_blogs_table_for_filtering, mocker):
+    """Test that listings differing only in fieldset or tag order are coalesced."""
+    import blog_service
+
+    group = mocker.MagicMock()
+    group.do.side_effect = lambda key, func, *args: func(*args)
+    mocker.patch('utils.singleflight.get_group', return_value=group)
+
+    blog_service.filter_blogs({'fields': 'id,title', 'tags': 'food,asia'})
+    blog_service.filter_blogs({'tags': 'asia,food', 'fields': 'title, id'})
+    blog_service.get_blog_by_id('123', fields='title,id')
+    blog_service.get_blog_by_id(123, fields='id,title,id')
+
+    keys = [call.args[0] for call in group.do.call_args_list]
+    assert keys[0] == keys[1]
+    assert keys[2] == keys[3]
@@ -0,0 +1,65 @@
+import os
+import sys
+import json
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+
+def test_record_blog_increments_counters(dynamodb_resource, setup_blogs_table_for_filtering):
+    """Test that each recorded blog adds to the month, journey and total counters."""
+    import stats_service
+
+    stats_service.record_blog({'id': '1', 'journey': 'europe', 'createdAt': 1717396800000})
+    stats_service.record_blog({'id': '2', 'journey': 'europe', 'createdAt': 1717400000000})
+    stats_service.record_blog({'id': '3', 'journey': 'asia', 'createdAt': 1720588800})
+
+    assert stats_service.get_stats() == {
+        'total': 3,
+        'months': {'2024-07': 1, '2024-06': 2},
+        'journeys': {'asia': 1, 'europe': 2}
+    }
+
+def test_get_stats_without_item(dynamodb_resource, setup_blogs_table_for_filtering):
+    """Test that an empty table reports zero posts."""
+    import stats_service
+
+    assert stats_service.get_stats() == {'total': 0, 'months': {}, 'journeys': {}}
+
+def test_get_stats_is_a_single_get_item(dynamodb_resource, setup_blogs_table_for_filtering, dynamodb_calls):
+    """Test that reading the stats never describes the table first."""
+    import stats_service
+
+    stats_service.get_stats()
+    stats_service.get_stats()
+
+    assert dynamodb_calls == ['GetItem', 'GetItem']
+
+def test_rebuild_from_listing_and_meta_item_hidden(dynamodb_resource, setup_blogs_table_for_filtering):
+    """Test recomputing stats from a scan, and that the stats item is not listed as a blog."""
+    import stats_service
+    import blog_service
+
+    stats_service.replace_stats(stats_service.compute_stats(blog_service.filter_blogs({})))
+    stats = stats_service.get_stats()
+
+    assert stats['total'] == 5
+    assert stats['journeys'] == {'africa': 1, 'asia': 2, 'europe': 2}
+    assert stats['months'] == {'2024-08': 2, '2024-07': 1, '2024-06': 1, '2024-05': 1}
+    assert len(blog_service.filter_blogs({})) == 5
+    assert blog_service.get_blog_by_id('#meta#stats') is None
+
+def test_lambda_handler_stats_route(dynamodb_resource, setup_blogs_table_for_filtering):
+    """Test GET /blogs/stats is routed before the blog ID route."""
+    import stats_service
+    os.environ.setdefault('S3_BUCKET_NAME', 'test-blog-images')
+    from lambda_function import lambda_handler
+
+    stats_service.record_blog({'id': '1', 'journey': 'europe', 'createdAt': 1717396800000})
+    response = lambda_handler({
+        'httpMethod': 'GET',
+        'path': '/blogs/stats',
+        'pathParameters': {'id': 'stats'}
+    }, {})
+
+    assert response['statusCode'] == 200
+    assert json.loads(response['body'])['journeys'] == {'europe': 1}
@@ -0,0 +1,24 @@
+import os
+import sys
+from decimal import Decimal
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from utils.timestamps import to_ms, parse_date_bound, to_month
+
+
+def test_to_ms_normalises_every_stored_encoding():
+    """Test that ISO strings, seconds and milliseconds all become epoch milliseconds."""
+    assert to_ms('2024-06-15T15:00:00Z') == 1718463600000
+    assert to_ms('2024-06-15T16:00:00+01:00') == 1718463600000
+    assert to_ms(1718463600) == 1718463600000
+    assert to_ms(Decimal('1718463600000')) == 1718463600000
+    assert to_month(1718463600000) == to_month('2024-06-15T15:00:00Z') == '2024-06'
+
+def test_parse_date_bound_covers_whole_days():
+    """Test that date-only bounds include every millisecond of the day."""
+    assert parse_date_bound('2024-06-15') == 1718409600000
+    assert parse_date_bound('2024-06-15', end_of_day=True) == 1718409600000 + 86400000 - 1
+    assert parse_date_bound('2024-06-15T15:00:00Z', end_of_day=True) == 1718463600000
+    with pytest.raises(ValueError):
+        parse_date_bound('June')
@@ -0,0 +1,69 @@
+import os
+import sys
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+
+@pytest.fixture
+def fresh_state(mocker):
+    import warmup
+    mocker.patch.dict(warmup._state, {'initialised': False, 'duration_ms': None})
+    return warmup
+
+
+def test_is_warmup_event():
+    """Test that scheduled invocations are told apart from API Gateway requests."""
+    import warmup
+
+    assert warmup.is_warmup_event({'warmup': True})
+    assert warmup.is_warmup_event({'source': 'aws.events', 'detail-type': 'Scheduled Event'})
+    assert not warmup.is_warmup_event({'httpMethod': 'GET', 'path': '/blogs'})
+    assert not warmup.is_warmup_event(None)
+
+def test_initialise_runs_once_and_survives_failures(dynamodb_resource, setup_blogs_table_for_filtering, fresh_state, mocker):
+    """Test that every step runs once per container and failures are reported, not raised."""
+    warmup = fresh_state
+    get_jwks = mocker.patch('utils.auth.CognitoAuth.get_jwks', return_value={'keys': []})
+    load_stored = mocker.patch('feed_service.load_stored_document', side_effect=RuntimeError('no bucket'))
+
+    first = warmup.initialise()
+    assert first['initialised'] is True
+    assert isinstance(first['steps']['clients'], float)
+    assert isinstance(first['steps']['jwks'], float)
+    assert first['steps']['feeds'] == 'error'
+    get_jwks.assert_called_once()
+
+    second = warmup.initialise()
+    assert second['steps'] == {}
+    assert second['duration_ms'] == first['duration_ms']
+    load_stored.assert_called_once()
+
+def test_preload_feeds_never_generates_documents(dynamodb_resource, setup_blogs_table_for_filtering, fresh_state, mocker):
+    """Test that warm-up only caches stored documents and never reads the blog listing."""
+    import feed_service
+    mocker.patch('utils.auth.CognitoAuth.get_jwks', return_value={'keys': []})
+    feed_service.clear_cache()
+    mocker.patch.object(feed_service, '_load', side_effect=lambda name, suffix: (
+        ('<rss/>', '"etag"') if name == 'feed' else (None, None)
+    ))
+    build = mocker.patch.object(feed_service, '_build')
+
+    steps = fresh_state.initialise()['steps']
+
+    assert isinstance(steps['feeds'], float)
+    build.assert_not_called()
+    assert list(feed_service._cache) == ['feed']
+    feed_service.clear_cache()
+
+def test_lambda_handler_answers_warmup_events(fresh_state, mocker):
+    """Test that warm-up events initialise the container instead of being routed."""
+    os.environ.setdefault('S3_BUCKET_NAME', 'test-blog-images')
+    from lambda_function import lambda_handler
+
+    initialise = mocker.patch('warmup.initialise', return_value={'initialised': True, 'duration_ms': 1.0, 'steps': {}})
+    route_request = mocker.patch('lambda_function.route_request')
+
+    assert lambda_handler({'warmup': True}, {})['initialised'] is True
+    initialise.assert_called_once()
+    route_request.assert_not_called()
@@ -1,7 +1,26 @@
 import json
+import os
+import threading
+import time
 import jwt
 import requests
 from jwt.algorithms import RSAAlgorithm
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# User pool whose tokens may post blogs
+COGNITO_USER_POOL_ID = os.environ.get('COGNITO_USER_POOL_ID', 'eu-west-2_hidczk')
+
+# Seconds to wait for the JWKS endpoint
+JWKS_TIMEOUT = float(os.environ.get('JWKS_TIMEOUT', 5))
+
+# Minimum seconds between refetches triggered by tokens with an unknown key ID,
+# so forged tokens cannot turn every request into a JWKS fetch
+JWKS_REFRESH_INTERVAL = float(os.environ.get('JWKS_REFRESH_INTERVAL', 60))
+
+_instances = {}
+_instances_lock = threading.Lock()
 
 class CognitoAuth:
     def __init__(self, user_pool_id, region='eu-west-2'):
@@ -10,14 +29,36 @@ class CognitoAuth:
         self.issuer = f"https://cognito-idp.{region}.amazonaws.com/{user_pool_id}"
         self.jwks_url = f"{self.issuer}/.well-known/jwks.json"
         self._jwks = None
+        self._fetched_at = None
     
-    def get_jwks(self):
-        """Get the JSON Web Key Set from Cognito"""
-        if not self._jwks:
-            response = requests.get(self.jwks_url)
-            self._jwks = response.json()
+    def get_jwks(self, refresh=False):
+        """
+        Get the JSON Web Key Set from Cognito, cached once a valid set was fetched
+
+        Args:
+            refresh (bool): Fetch again even if a set is cached, e.g. after key rotation
+
+        Raises:
+            requests.RequestException: If Cognito cannot be reached or returns an error
+            ValueError: If the response is not a key set
+        """
+        if not self._jwks or refresh:
+            logger.debug("Fetching JWKS from %s", self.jwks_url)
+            self._fetched_at = time.monotonic()
+            response = requests.get(self.jwks_url, timeout=JWKS_TIMEOUT)
+            response.raise_for_status()
+            jwks = response.json()
+            if not isinstance(jwks, dict) or not isinstance(jwks.get('keys'), list):
+                raise ValueError(f"No keys in the JWKS response from {self.jwks_url}")
+            self._jwks = jwks
         return self._jwks
     
+    def _find_key(self, kid, jwks):
+        for jwk in jwks['keys']:
+            if jwk.get('kid') == kid:
+                return RSAAlgorithm.from_jwk(json.dumps(jwk))
+        return None
+    
     def verify_token(self, token):
         """
         Verify a JWT token from Cognito
@@ -29,14 +70,14 @@ class CognitoAuth:
             kid = header['kid']
             
             # Find the matching key in JWKS
-            jwks = self.get_jwks()
-            key = None
-            for jwk in jwks['keys']:
-                if jwk['kid'] == kid:
-                    key = RSAAlgorithm.from_jwk(json.dumps(jwk))
-                    break
+            key = self._find_key(kid, self.get_jwks())
+            if not key and (self._fetched_at is None or time.monotonic() - self._fetched_at >= JWKS_REFRESH_INTERVAL):
+                # The signing keys may have been rotated since they were cached
+                logger.info("Refetching JWKS for unknown kid %s", kid)
+                key = self._find_key(kid, self.get_jwks(refresh=True))
             
             if not key:
+                logger.warning("No JWKS key matches token kid %s", kid)
                 return None
             
             # Verify and decode the token
@@ -51,5 +92,16 @@ class CognitoAuth:
             return payload
             
         except Exception as e:
-            print(f"Token verification failed: {e}")
+            logger.warning("Token verification failed: %s", e)
             return None
+
+
+def get_auth(user_pool_id=None):
+    """
+    Return a CognitoAuth shared across warm invocations, so JWKS is fetched once per container
+    """
+    user_pool_id = user_pool_id or COGNITO_USER_POOL_ID
+    with _instances_lock:
+        if user_pool_id not in _instances:
+            _instances[user_pool_id] = CognitoAuth(user_pool_id=user_pool_id)
+        return _instances[user_pool_id]
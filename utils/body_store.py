@@ -0,0 +1,100 @@
+import gzip
+import os
+from utils.logger import get_logger
+from utils.s3 import get_s3_client
+
+logger = get_logger(__name__)
+
+# Bodies at least this many bytes (UTF-8) are stored gzip compressed
+BODY_COMPRESS_THRESHOLD = int(os.environ.get('BODY_COMPRESS_THRESHOLD', 4096))
+
+# Compressed bodies at least this many bytes are moved to S3, well below the 400 KB item limit
+BODY_S3_THRESHOLD = int(os.environ.get('BODY_S3_THRESHOLD', 100000))
+
+BODY_S3_PREFIX = os.environ.get('BODY_S3_PREFIX', 'blog-bodies')
+
+
+def storage_fields(attribute='body'):
+    """
+    Attributes that may hold a stored text besides the plain attribute itself
+    """
+    return [f"{attribute}Gz", f"{attribute}Key", f"{attribute}Encoding"]
+
+
+# Attributes that together hold a stored body, besides the plain `body`
+STORAGE_FIELDS = storage_fields('body')
+
+
+def _bucket():
+    bucket = os.environ.get('BODY_S3_BUCKET') or os.environ.get('S3_BUCKET_NAME')
+    if not bucket:
+        raise ValueError("BODY_S3_BUCKET or S3_BUCKET_NAME environment variable must be set")
+    return bucket
+
+
+def pack_body(blog_id, body, attribute='body'):
+    """
+    Choose how a blog body is stored and return the item attributes for it
+
+    Small bodies stay inline as text, larger ones are gzip compressed into a
+    binary attribute, and very large ones are written to S3 with a pointer.
+
+    Args:
+        blog_id (str): ID of the blog the body belongs to
+        body (str): The text to store, e.g. the Markdown body
+        attribute (str): Item attribute the text belongs in, e.g. 'body' or 'bodyHtml'
+
+    Returns:
+        dict: Attributes to merge into the DynamoDB item
+    """
+    gz_field, key_field, encoding_field = storage_fields(attribute)
+    raw = body.encode('utf-8')
+    if len(raw) < BODY_COMPRESS_THRESHOLD:
+        return {attribute: body}
+
+    compressed = gzip.compress(raw)
+    if len(compressed) < BODY_S3_THRESHOLD:
+        return {gz_field: compressed, encoding_field: 'gzip'}
+
+    suffix = '' if attribute == 'body' else f".{attribute}"
+    key = f"{BODY_S3_PREFIX.rstrip('/')}/{blog_id}{suffix}.gz"
+    get_s3_client().put_object(
+        Bucket=_bucket(),
+        Key=key,
+        Body=compressed,
+        ContentType='text/plain; charset=utf-8',
+        ContentEncoding='gzip'
+    )
+    logger.info("Stored %d byte %s for blog %s in S3", len(raw), attribute, blog_id)
+    return {key_field: key, encoding_field: 'gzip'}
+
+
+def _decode(data, encoding):
+    if encoding == 'gzip':
+        data = gzip.decompress(data)
+    return data.decode('utf-8')
+
+
+def unpack_body(item, attribute='body'):
+    """
+    Replace stored body attributes on an item with the plain text
+
+    Args:
+        item (dict): A blog item as read from DynamoDB (modified in place)
+        attribute (str): Attribute to rehydrate, e.g. 'body' or 'bodyHtml'
+
+    Returns:
+        dict: The same item
+    """
+    gz_field, key_field, encoding_field = storage_fields(attribute)
+    encoding = item.pop(encoding_field, None)
+
+    if gz_field in item:
+        stored = item.pop(gz_field)
+        # boto3 wraps binary attributes in boto3.dynamodb.types.Binary
+        item[attribute] = _decode(getattr(stored, 'value', stored), encoding or 'gzip')
+    elif key_field in item:
+        key = item.pop(key_field)
+        response = get_s3_client().get_object(Bucket=_bucket(), Key=key)
+        item[attribute] = _decode(response['Body'].read(), encoding)
+    return item
@@ -1,13 +1,80 @@
+import os
+import threading
 import boto3
 
+# Point at a local DynamoDB stand-in (e.g. DynamoDB Local) when set
+DYNAMODB_ENDPOINT_URL = os.environ.get('DYNAMODB_ENDPOINT_URL')
+
+# Bookkeeping items (counters, precomputed lists) live beside the blogs in the
+# same table, under reserved IDs and marked with entity = 'meta'
+META_ID_PREFIX = '#meta#'
+META_ENTITY = 'meta'
+
+# boto3 resources are not thread safe, so each thread keeps its own
+_local = threading.local()
+_create_lock = threading.Lock()
+# Bumped by reset_clients so every thread drops its cached resource
+_generation = 0
+
 def get_dynamodb_client():
     """
     Create and return a DynamoDB client
     """
-    return boto3.client('dynamodb')
+    return boto3.client('dynamodb', endpoint_url=DYNAMODB_ENDPOINT_URL)
 
 def get_dynamodb_resource():
     """
-    Create and return a DynamoDB resource
+    Return a DynamoDB resource, reused across warm invocations on this thread
+    """
+    resource = getattr(_local, 'resource', None)
+    if resource is None or _local.generation != _generation:
+        # The default boto3 session is not safe to use concurrently
+        with _create_lock:
+            resource = boto3.resource('dynamodb', endpoint_url=DYNAMODB_ENDPOINT_URL)
+        _local.resource = resource
+        _local.generation = _generation
+    return resource
+
+def get_table(table_name=None):
+    """
+    Return the blogs table named by DYNAMODB_TABLE_NAME (or table_name)
+    """
+    table_name = table_name or os.environ.get('DYNAMODB_TABLE_NAME')
+    if not table_name:
+        raise ValueError("DYNAMODB_TABLE_NAME environment variable must be set")
+    return get_dynamodb_resource().Table(table_name)
+
+def get_item_key(table, item):
+    """
+    Extract the primary key of an item according to the table's key schema
+    """
+    return {key['AttributeName']: item[key['AttributeName']] for key in table.key_schema}
+
+def get_meta_key(name):
+    """
+    Primary key of the bookkeeping item called name
+
+    Built from the known key (id) rather than the table's key schema, which
+    would cost a DescribeTable call per Table object, i.e. per request.
+    """
+    return {'id': f"{META_ID_PREFIX}{name}"}
+
+def build_projection(fields):
+    """
+    Build a ProjectionExpression that is safe for reserved words like `name`
+
+    Args:
+        fields (list): Attribute names to return
+
+    Returns:
+        tuple: (ProjectionExpression, ExpressionAttributeNames)
+    """
+    names = {f"#p{i}": field for i, field in enumerate(fields)}
+    return ', '.join(names), names
+
+def reset_clients():
+    """
+    Drop cached resources, e.g. between tests or after changing endpoints
     """
-    return boto3.resource('dynamodb')
+    global _generation
+    _generation += 1
@@ -0,0 +1,27 @@
+import base64
+
+def normalize_event(event):
+    """
+    Return an API Gateway REST (v1) shaped event
+
+    HTTP API (payload format 2.0) events are translated so the router only has to
+    understand one shape, and base64 encoded bodies are decoded.
+    """
+    if event.get('version') == '2.0' and 'httpMethod' not in event:
+        http = event.get('requestContext', {}).get('http', {})
+        route_key = event.get('routeKey', '')
+        event = {
+            **event,
+            'httpMethod': http.get('method'),
+            'path': event.get('rawPath') or http.get('path', ''),
+            'resource': route_key.split(' ', 1)[-1] if route_key != '$default' else None,
+        }
+
+    if event.get('isBase64Encoded') and isinstance(event.get('body'), str):
+        event = {
+            **event,
+            'body': base64.b64decode(event['body']).decode('utf-8'),
+            'isBase64Encoded': False,
+        }
+
+    return event
@@ -0,0 +1,140 @@
+import json
+import logging
+import os
+import random
+import sys
+import time
+from contextvars import ContextVar
+
+# Base level for every request, e.g. INFO in production
+LOG_LEVEL = os.environ.get('LOG_LEVEL', 'INFO').upper()
+
+# Fraction of requests (0.0 - 1.0) that also emit DEBUG records
+DEBUG_SAMPLE_RATE = float(os.environ.get('LOG_DEBUG_SAMPLE_RATE', 0.01))
+
+ROOT_LOGGER_NAME = 'bloggs'
+
+_base_level = logging.getLevelName(LOG_LEVEL)
+if not isinstance(_base_level, int):
+    _base_level = logging.INFO
+
+_request_id = ContextVar('request_id', default=None)
+_debug_sampled = ContextVar('debug_sampled', default=False)
+
+# Attributes present on every LogRecord, anything else was passed via `extra`
+_RESERVED_ATTRS = set(vars(logging.makeLogRecord({}))) | {'message', 'asctime'}
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    Format log records as single-line JSON documents for CloudWatch
+    """
+    def format(self, record):
+        entry = {
+            'timestamp': round(record.created * 1000),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+            'request_id': _request_id.get(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RESERVED_ATTRS and not key.startswith('_'):
+                entry[key] = value
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class SampledLogger(logging.LoggerAdapter):
+    """
+    Wraps a standard application logger so calls below the base level return
+    before a record is built unless the current request was sampled
+
+    Records still go through the normal logger, so logging configuration,
+    caplog and SamplingFilter see them as usual.
+    """
+    def __init__(self, logger):
+        super().__init__(logger, {})
+
+    def isEnabledFor(self, level):
+        if level < _base_level and not _debug_sampled.get():
+            return False
+        return self.logger.isEnabledFor(level)
+
+    def process(self, msg, kwargs):
+        # Keep the caller's `extra` rather than replacing it with the adapter's
+        return msg, kwargs
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Drop records below the base level unless the current request was sampled
+    """
+    def __init__(self, base_level):
+        super().__init__()
+        self.base_level = base_level
+
+    def filter(self, record):
+        return record.levelno >= self.base_level or _debug_sampled.get()
+
+
+def _configure_root():
+    root = logging.getLogger(ROOT_LOGGER_NAME)
+    if root.handlers:
+        return root
+
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(JsonFormatter())
+    handler.addFilter(SamplingFilter(_base_level))
+
+    root.addHandler(handler)
+    # Sampled requests need DEBUG through; SamplingFilter drops it for the rest
+    root.setLevel(logging.DEBUG if DEBUG_SAMPLE_RATE > 0 else _base_level)
+    # The Lambda runtime installs its own handler on the root logger
+    root.propagate = False
+    return root
+
+
+def get_logger(name):
+    """
+    Return a structured logger namespaced under the application logger
+
+    Messages should use lazy %-style arguments, e.g.
+    logger.debug('Fetched %s items', count), so formatting only happens
+    for records that are actually emitted.
+    """
+    _configure_root()
+    return SampledLogger(logging.getLogger(f"{ROOT_LOGGER_NAME}.{name}"))
+
+
+def bind_request(context, force_debug=False):
+    """
+    Attach the Lambda request ID to all subsequent log records and decide
+    whether DEBUG records are emitted for this request
+
+    Both are context variables, which executor threads do not inherit; run
+    work submitted to a pool with contextvars.copy_context().run.
+
+    Args:
+        context: The Lambda context object (may be a plain dict when run locally)
+        force_debug (bool): Emit DEBUG records regardless of the sample rate
+
+    Returns:
+        str: The request ID that was bound
+    """
+    request_id = getattr(context, 'aws_request_id', None)
+    if request_id is None and isinstance(context, dict):
+        request_id = context.get('aws_request_id')
+    if request_id is None:
+        request_id = f"local-{int(time.time() * 1000)}-{random.randrange(1 << 16):04x}"
+
+    _request_id.set(request_id)
+    _debug_sampled.set(force_debug or random.random() < DEBUG_SAMPLE_RATE)
+    return request_id
+
+
+def get_request_id():
+    """
+    Return the request ID bound to the current request, if any
+    """
+    return _request_id.get()
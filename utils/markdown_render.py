@@ -0,0 +1,22 @@
+import markdown
+import nh3
+
+# Python-Markdown extensions matching what the front end renders
+MARKDOWN_EXTENSIONS = ['extra', 'sane_lists']
+
+
+def render_markdown(body):
+    """
+    Render a Markdown blog body to sanitised HTML
+
+    Raw HTML in the Markdown is allowed through only if it survives the
+    sanitiser, which strips scripts, event handlers and unsafe URLs.
+
+    Args:
+        body (str): The Markdown source
+
+    Returns:
+        str: HTML that is safe to insert into the page
+    """
+    html = markdown.markdown(body, extensions=MARKDOWN_EXTENSIONS, output_format='html')
+    return nh3.clean(html, link_rel='noopener noreferrer')
@@ -0,0 +1,111 @@
+import cProfile
+import hmac
+import io
+import marshal
+import os
+import pstats
+import random
+import re
+from utils.logger import get_logger, get_request_id
+from utils.s3 import get_s3_client
+
+logger = get_logger(__name__)
+
+# Fraction of requests (0.0 - 1.0) to profile without being asked
+PROFILE_SAMPLE_RATE = float(os.environ.get('PROFILE_SAMPLE_RATE', 0))
+
+# Shared secret that enables profiling for a request via the X-Profile header
+PROFILE_HEADER_TOKEN = os.environ.get('PROFILE_HEADER_TOKEN')
+
+# Number of functions (by cumulative time) included in the logged summary
+PROFILE_TOP_N = int(os.environ.get('PROFILE_TOP_N', 25))
+
+# When set, full pstats dumps are written to s3://<bucket>/<prefix>/<request id>.prof
+PROFILE_S3_PREFIX = os.environ.get('PROFILE_S3_PREFIX')
+
+PROFILE_HEADER = 'x-profile'
+
+
+def should_profile(event):
+    """
+    Decide whether the request described by an API Gateway event is profiled
+
+    Profiling is enabled either by random sampling (PROFILE_SAMPLE_RATE) or by
+    sending an X-Profile header that matches PROFILE_HEADER_TOKEN.
+    """
+    if PROFILE_HEADER_TOKEN:
+        headers = event.get('headers') or {}
+        for name, value in headers.items():
+            if name.lower() == PROFILE_HEADER and isinstance(value, str) and hmac.compare_digest(
+                value.encode('utf-8'), PROFILE_HEADER_TOKEN.encode('utf-8')
+            ):
+                return True
+
+    return PROFILE_SAMPLE_RATE > 0 and random.random() < PROFILE_SAMPLE_RATE
+
+
+def summarise_stats(stats, top_n=PROFILE_TOP_N):
+    """
+    Reduce pstats data to a compact list of the most expensive functions
+
+    Args:
+        stats (pstats.Stats): The collected profile
+        top_n (int): Number of entries to keep
+
+    Returns:
+        list: [function, primitive calls, total calls, own ms, cumulative ms] rows
+              ordered by cumulative time
+    """
+    rows = []
+    for (filename, line, name), (cc, nc, tt, ct, _callers) in stats.stats.items():
+        location = f"{os.path.basename(filename)}:{line}({name})" if line else name
+        rows.append([location, cc, nc, round(tt * 1000, 3), round(ct * 1000, 3)])
+
+    rows.sort(key=lambda row: row[4], reverse=True)
+    return rows[:top_n]
+
+
+def _upload_stats(stats, label):
+    bucket = os.environ.get('PROFILE_S3_BUCKET') or os.environ.get('S3_BUCKET_NAME')
+    if not bucket:
+        logger.warning("PROFILE_S3_PREFIX is set but no bucket is configured")
+        return None
+
+    safe_label = re.sub(r'[^A-Za-z0-9._-]+', '_', label).strip('_')
+    key = f"{PROFILE_S3_PREFIX.rstrip('/')}/{safe_label}/{get_request_id()}.prof"
+    get_s3_client().put_object(
+        Bucket=bucket,
+        Key=key,
+        # Same format as pstats.Stats.dump_stats, loadable with pstats.Stats(path)
+        Body=marshal.dumps(stats.stats)
+    )
+    return f"s3://{bucket}/{key}"
+
+
+def profile_call(func, *args, label='request', **kwargs):
+    """
+    Run a callable under cProfile and report where the time went
+
+    The summary is always logged; a full dump is also written to S3 when
+    PROFILE_S3_PREFIX is set. Reporting failures never affect the result.
+
+    Returns:
+        The return value of func(*args, **kwargs)
+    """
+    profiler = cProfile.Profile()
+    try:
+        return profiler.runcall(func, *args, **kwargs)
+    finally:
+        try:
+            stats = pstats.Stats(profiler, stream=io.StringIO())
+            location = _upload_stats(stats, label) if PROFILE_S3_PREFIX else None
+            logger.info(
+                "Profile for %s", label,
+                extra={
+                    'profile_total_ms': round(stats.total_tt * 1000, 3),
+                    'profile_top': summarise_stats(stats),
+                    'profile_location': location,
+                }
+            )
+        except Exception:
+            logger.exception("Failed to report profile for %s", label)
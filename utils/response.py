@@ -34,3 +34,34 @@ def redirect(status_code, location):
         },
     }
 
+
+def format_xml_response(status_code, body, etag=None, max_age=300):
+    """
+    Format the API Gateway response for cacheable XML documents
+    """
+    headers = {
+        'Content-Type': 'application/xml; charset=utf-8',
+        'Access-Control-Allow-Origin': '*',  # CORS support
+        'Cache-Control': f'public, max-age={max_age}'
+    }
+    if etag:
+        headers['ETag'] = etag
+    return {
+        'statusCode': status_code,
+        'headers': headers,
+        'body': body
+    }
+
+def not_modified(etag, max_age=300):
+    """
+    Format the API Gateway response for a conditional request that matched
+    """
+    return {
+        'statusCode': 304,
+        'headers': {
+            'Access-Control-Allow-Origin': '*',  # CORS support
+            'Cache-Control': f'public, max-age={max_age}',
+            'ETag': etag
+        },
+        'body': ''
+    }
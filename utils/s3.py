@@ -0,0 +1,62 @@
+import os
+import threading
+import boto3
+
+# Point at a local S3 stand-in (e.g. MinIO) when set
+S3_ENDPOINT_URL = os.environ.get('S3_ENDPOINT_URL')
+
+_client = None
+_create_lock = threading.Lock()
+
+# Condition headers for the PutObject call in progress on this thread; this
+# boto3 release has no IfMatch / IfNoneMatch parameters for PutObject yet
+_conditions = threading.local()
+
+def _add_condition_headers(params, **kwargs):
+    params['headers'].update(getattr(_conditions, 'headers', None) or {})
+
+def get_s3_client():
+    """
+    Return an S3 client shared across threads and warm invocations
+    """
+    global _client
+    if _client is None:
+        with _create_lock:
+            if _client is None:
+                client = boto3.client('s3', endpoint_url=S3_ENDPOINT_URL)
+                client.meta.events.register('before-call.s3.PutObject', _add_condition_headers)
+                _client = client
+    return _client
+
+def put_object_conditionally(if_match=None, if_none_match=None, **params):
+    """
+    PutObject that only succeeds while the stored object still has the ETag
+    if_match, or, with if_none_match='*', while no object exists yet
+
+    Raises:
+        ClientError: PreconditionFailed (or ConditionalRequestConflict) when
+                     another writer changed the object first
+    """
+    headers = {}
+    if if_match:
+        headers['If-Match'] = if_match
+    if if_none_match:
+        headers['If-None-Match'] = if_none_match
+    _conditions.headers = headers
+    try:
+        return get_s3_client().put_object(**params)
+    finally:
+        _conditions.headers = None
+
+def is_precondition_failed(error):
+    """
+    Return True if a ClientError means a conditional write lost to another writer
+    """
+    return error.response['Error']['Code'] in ('PreconditionFailed', 'ConditionalRequestConflict', '412')
+
+def reset_clients():
+    """
+    Drop the cached client, e.g. between tests or after changing endpoints
+    """
+    global _client
+    _client = None
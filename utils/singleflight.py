@@ -0,0 +1,105 @@
+import os
+import threading
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Set to 0 to send every call to the backend, e.g. when measuring raw DynamoDB load
+SINGLEFLIGHT_ENABLED = os.environ.get('SINGLEFLIGHT_ENABLED', '1') != '0'
+
+# Every group created in this container, by name, for get_stats
+_groups = {}
+_groups_lock = threading.Lock()
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class Group:
+    """
+    Coalesces concurrent calls that share a key into one backend call
+
+    The first caller for a key (the leader) runs the function; callers that
+    arrive while it is in flight wait and receive the same result, or the same
+    exception. Nothing is cached once the call completes. Results are shared
+    between callers, so they must be treated as read-only.
+    """
+    def __init__(self, name):
+        self.name = name
+        self._calls = {}
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.executed = 0
+        self.deduplicated = 0
+
+    def do(self, key, func, *args, **kwargs):
+        """
+        Run func(*args, **kwargs), or join the in-flight call with the same key
+
+        Args:
+            key: Hashable key of the normalized call parameters
+            func (callable): The backend call
+
+        Returns:
+            The result of the (possibly shared) call
+        """
+        if not SINGLEFLIGHT_ENABLED:
+            return func(*args, **kwargs)
+
+        with self._lock:
+            self.calls += 1
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.executed += 1
+            else:
+                self.deduplicated += 1
+
+        if not leader:
+            logger.debug("Joined in-flight %s call", self.name)
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = func(*args, **kwargs)
+            return call.result
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def stats(self):
+        """
+        Return how many calls were made, executed and served from an in-flight call
+        """
+        with self._lock:
+            return {'calls': self.calls, 'executed': self.executed, 'deduplicated': self.deduplicated}
+
+
+def get_group(name):
+    """
+    Return the group called name, creating it on first use
+    """
+    with _groups_lock:
+        if name not in _groups:
+            _groups[name] = Group(name)
+        return _groups[name]
+
+
+def get_stats():
+    """
+    Return the counters of every group in this container, by group name
+    """
+    with _groups_lock:
+        groups = list(_groups.values())
+    return {group.name: group.stats() for group in groups}
@@ -0,0 +1,63 @@
+import datetime
+import time
+
+# All times are stored as integer milliseconds since the Unix epoch (UTC)
+EPOCH = datetime.datetime(1970, 1, 1, tzinfo=datetime.timezone.utc)
+_ONE_MS = datetime.timedelta(milliseconds=1)
+
+def now_ms():
+    """
+    Return the current time in milliseconds since the epoch
+    """
+    return int(time.time() * 1000)
+
+def _parse_iso(value):
+    dt = datetime.datetime.fromisoformat(value.replace('Z', '+00:00'))
+    return dt if dt.tzinfo else dt.replace(tzinfo=datetime.timezone.utc)
+
+def to_datetime(value):
+    """
+    Convert a stored createdAt value to an aware UTC datetime
+
+    Accepts ISO strings as well as epoch numbers; numbers above 1e11 are
+    treated as milliseconds, smaller ones as seconds (older posts).
+    """
+    if isinstance(value, str):
+        return _parse_iso(value)
+    value = float(value)
+    seconds = value / 1000 if value > 1e11 else value
+    return datetime.datetime.fromtimestamp(seconds, tz=datetime.timezone.utc)
+
+def to_ms(value):
+    """
+    Normalise a stored time (ISO string, epoch seconds or milliseconds) to epoch milliseconds
+    """
+    if isinstance(value, str):
+        return (_parse_iso(value) - EPOCH) // _ONE_MS
+    # Integer arithmetic where possible so Decimal values from DynamoDB stay exact
+    return int(value) if value > 1e11 else int(value * 1000)
+
+def parse_date_bound(value, end_of_day=False):
+    """
+    Convert an ISO date or datetime filter bound to epoch milliseconds
+
+    Args:
+        value (str): e.g. '2024-06-01' or '2024-06-01T12:00:00Z'
+        end_of_day (bool): Make a date-only bound inclusive of the whole day
+
+    Raises:
+        ValueError: If the value is not an ISO date or datetime
+    """
+    if 'T' not in value:
+        date = datetime.date.fromisoformat(value)
+        start = datetime.datetime.combine(date, datetime.time(), tzinfo=datetime.timezone.utc)
+        if end_of_day:
+            return (start - EPOCH) // _ONE_MS + 24 * 60 * 60 * 1000 - 1
+        return (start - EPOCH) // _ONE_MS
+    return to_ms(value)
+
+def to_month(value):
+    """
+    Return the 'YYYY-MM' month a stored createdAt value falls in
+    """
+    return to_datetime(value).strftime('%Y-%m')
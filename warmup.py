@@ -0,0 +1,94 @@
+import os
+import threading
+import time
+import feed_service
+from utils.auth import get_auth
+from utils.dynamodb import get_table
+from utils.logger import get_logger
+from utils.s3 import get_s3_client
+
+logger = get_logger(__name__)
+
+# Run initialise() while the module is imported, i.e. in the Lambda init phase.
+# On by default inside Lambda only, so tests and scripts never touch AWS on import.
+PRELOAD_ON_INIT = os.environ.get(
+    'PRELOAD_ON_INIT', '1' if os.environ.get('AWS_LAMBDA_FUNCTION_NAME') else '0'
+) == '1'
+
+# Payload sent by the scheduled warm-up rule in template.yaml
+WARMUP_KEY = 'warmup'
+
+_state = {'initialised': False, 'duration_ms': None}
+_lock = threading.Lock()
+
+
+def is_warmup_event(event):
+    """
+    Recognise scheduled warm-up invocations, which are not API Gateway requests
+
+    Matches the {"warmup": true} input of the schedule in template.yaml as well
+    as plain EventBridge scheduled events.
+    """
+    if not isinstance(event, dict):
+        return False
+    if event.get(WARMUP_KEY):
+        return True
+    return event.get('source') == 'aws.events' and event.get('detail-type') == 'Scheduled Event'
+
+
+def _create_clients():
+    # DescribeTable also opens the pooled HTTPS connection to DynamoDB
+    get_table().key_schema
+    get_s3_client()
+
+
+def _prefetch_jwks():
+    get_auth().get_jwks()
+
+
+def _preload_feeds():
+    # Only copies already in S3; generating one reads the whole blog listing
+    for kind in ('feed', 'sitemap'):
+        if feed_service.load_stored_document(kind) is None:
+            logger.info("No stored %s to preload", kind)
+
+
+# Steps run in order; each one is optional, so a failure is logged and skipped
+INIT_STEPS = [
+    ('clients', _create_clients),
+    ('jwks', _prefetch_jwks),
+    ('feeds', _preload_feeds),
+]
+
+
+def initialise(force=False):
+    """
+    Do the cold-start work of this container before user requests need it
+
+    Creates the AWS clients, fetches the Cognito signing keys and loads the
+    feed documents already stored in S3. Runs once per container unless forced.
+
+    Returns:
+        dict: {'initialised': bool, 'duration_ms': total, 'steps': {name: ms or 'error'}}
+              where steps is empty if the work had already been done
+    """
+    with _lock:
+        if _state['initialised'] and not force:
+            return {**_state, 'steps': {}}
+
+        started = time.perf_counter()
+        steps = {}
+        for name, step in INIT_STEPS:
+            step_started = time.perf_counter()
+            try:
+                step()
+                steps[name] = round((time.perf_counter() - step_started) * 1000, 2)
+            except Exception:
+                logger.exception("Init step %s failed", name)
+                steps[name] = 'error'
+
+        _state['initialised'] = True
+        _state['duration_ms'] = round((time.perf_counter() - started) * 1000, 2)
+        logger.info("Container initialised in %.2f ms", _state['duration_ms'], extra={'steps': steps})
+        return {**_state, 'steps': steps}
+